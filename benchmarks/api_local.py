@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+class ServidorAPILocal():
+    """
+    Servidor HTTP local que imita a API de resultados da Caixa a partir de um
+    array de sorteios (mesmo formato de core.armazenamento).
+    GET / (ou /megasena) devolve o último concurso e GET /<id> o concurso id.
+
+    Pode simular latência e falhas temporárias (429 com Retry-After) para
+    exercitar o backoff do cliente. Use como context manager:
+
+        with ServidorAPILocal(sorteios) as servidor:
+            Gerador(url_api=servidor.url, ...)
+    """
+
+    def __init__(self, sorteios, latencia=0.0, falhas_a_cada=0, falhas_por_concurso=2):
+        """
+        Args:
+            sorteios: Array de sorteios (campos concurso, data e dezenas)
+            latencia: Atraso artificial de cada resposta, em segundos
+            falhas_a_cada: Concursos múltiplos deste número respondem 429 antes
+                de responder 200 (0 desativa)
+            falhas_por_concurso: Quantas vezes cada um desses concursos falha
+        """
+        self.latencia = latencia
+        self.falhas_a_cada = falhas_a_cada
+        self.falhas_por_concurso = falhas_por_concurso
+        self.falhas = {}
+        self.lock = threading.Lock()
+        self.requisicoes = 0
+
+        # Respostas serializadas uma única vez: o servidor não deve ser o gargalo medido
+        self.respostas = {}
+        for concurso, data, dezenas in zip(sorteios['concurso'].tolist(), sorteios['data'], sorteios['dezenas'].tolist()):
+            ano, mes, dia = str(np.datetime_as_string(data, unit='D')).split('-')
+            self.respostas[concurso] = json.dumps({
+                'numero': concurso,
+                'dataApuracao': f"{dia}/{mes}/{ano}",
+                'listaDezenas': [f"{d:02d}" for d in dezenas],
+            }).encode()
+        self.ultimo = max(self.respostas) if self.respostas else 0
+
+        self.servidor = ThreadingHTTPServer(('127.0.0.1', 0), self.criar_handler())
+        self.servidor.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.servidor.server_address[1]}/"
+        self.thread = None
+
+    def deve_falhar(self, concurso):
+        if not self.falhas_a_cada or concurso % self.falhas_a_cada:
+            return False
+        with self.lock:
+            falhas = self.falhas.get(concurso, 0)
+            if falhas >= self.falhas_por_concurso:
+                return False
+            self.falhas[concurso] = falhas + 1
+            return True
+
+    def criar_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def responder(self, status, corpo=b'', cabecalhos=None):
+                self.send_response(status)
+                for nome, valor in (cabecalhos or {}).items():
+                    self.send_header(nome, valor)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def do_GET(self):
+                with api.lock:
+                    api.requisicoes += 1
+                if api.latencia:
+                    time.sleep(api.latencia)
+
+                final = self.path.rstrip('/').split('/')[-1]
+                concurso = api.ultimo if final in ('', 'megasena') else int(final) if final.isdigit() else None
+                if concurso not in api.respostas:
+                    self.responder(404)
+                elif api.deve_falhar(concurso):
+                    self.responder(429, cabecalhos={'Retry-After': '0'})
+                else:
+                    self.responder(200, api.respostas[concurso])
+
+        return Handler
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.servidor.shutdown()
+        self.servidor.server_close()
@@ -0,0 +1,177 @@
+"""
+Benchmarks das etapas do Gerador com históricos sintéticos.
+
+Mede tempo (melhor de N repetições) e pico de memória (tracemalloc, em uma
+execução separada para não distorcer o tempo) de cada etapa:
+sincronização com a API (servidor local), carga e contagem das frequências,
+geração heurística, filtro de repetições, busca exaustiva, índice de
+co-ocorrência e gráfico.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark
+    python -m benchmarks.benchmark --tamanhos 3000 100000 1000000 --json resultado.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.api_local import ServidorAPILocal
+from core.armazenamento import ARQUIVO_SORTEIOS, DTYPE_SORTEIO, salvar_sorteios
+from core.coocorrencia import IndiceCoocorrencia
+from core.gerador import Gerador
+from core.grafico import obter_modelo
+from core.mascaras import ConjuntoMascaras, para_mascara
+from core.monte_carlo import sortear
+
+# Data do primeiro concurso da Mega Sena; os sintéticos seguem de 3 em 3 dias
+DATA_INICIAL = np.datetime64('1996-03-11', 'D')
+
+
+def gerar_historico(tamanho, semente=0):
+    """
+    Histórico sintético com `tamanho` sorteios uniformes (mesmo formato do
+    armazenamento), reproduzível pela semente.
+    """
+    rng = np.random.default_rng(semente)
+    sorteios = np.zeros(tamanho, dtype=DTYPE_SORTEIO)
+    sorteios['concurso'] = np.arange(1, tamanho + 1)
+    sorteios['data'] = DATA_INICIAL + 3 * np.arange(tamanho)
+    sorteios['dezenas'] = np.sort(sortear(rng, tamanho), axis=1) + 1
+    return sorteios
+
+
+def medir(funcao, repeticoes):
+    """
+    Retorna (melhor tempo em segundos, pico de memória em bytes) de `funcao`.
+    A saída padrão da função é descartada.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(tempos), pico
+
+
+def etapas_analise(gerador, quantidade_jogos, candidatos, semente):
+    """
+    Etapas que dependem apenas do armazenamento de sorteios já salvo.
+    Retorna a lista (nome, função).
+    """
+    estatisticas = gerador.carregar_estatisticas()
+    numeros_ouro = estatisticas.numeros_ouro()
+    score_minimo = estatisticas.score_minimo(0.90)
+    dezenas = np.load(ARQUIVO_SORTEIOS)['dezenas']
+
+    rng = np.random.default_rng(semente)
+    jogos = (np.sort(sortear(rng, candidatos), axis=1) + 1).tolist()
+
+    def filtrar_repeticoes():
+        aceitos = ConjuntoMascaras()
+        for jogo in jogos:
+            if gerador.check_repetitions(jogo, aceitos, max_repetitions=3):
+                aceitos.adicionar(para_mascara(jogo))
+
+    return [
+        ('estatisticas', gerador.carregar_estatisticas),
+        ('heuristica', lambda: gerador.gerar_jogos_heuristica(
+            estatisticas, numeros_ouro, quantidade_jogos, score_minimo)),
+        ('check_repetitions', filtrar_repeticoes),
+        ('exaustiva', lambda: gerador.gerar_jogos_exaustiva(estatisticas, quantidade_jogos, score_minimo)),
+        ('coocorrencia', lambda: IndiceCoocorrencia(dezenas)),
+        ('grafico', lambda: obter_modelo().renderizar(estatisticas, numeros_ouro, 'grafico.png')),
+    ]
+
+
+def executar(args):
+    resultados = []
+    diretorio_original = os.getcwd()
+    diretorio = tempfile.mkdtemp(prefix='benchmark_mega_sena_')
+    try:
+        # Tudo roda em um diretório temporário: o sorteios.npy e o gráfico do usuário não são tocados
+        os.chdir(diretorio)
+
+        if args.concursos_api > 0:
+            historico = gerar_historico(args.concursos_api, args.semente)
+            with ServidorAPILocal(historico, latencia=args.latencia_api / 1000,
+                                  falhas_a_cada=args.falhas_a_cada) as servidor:
+                for engine in args.engines:
+                    def sincronizar():
+                        if os.path.exists(ARQUIVO_SORTEIOS):
+                            os.remove(ARQUIVO_SORTEIOS)
+                        Gerador(url_api=servidor.url, atualizacao_completa=True, engine=engine,
+                                requisicoes_por_segundo=0, usar_cache=False, executar=False).sincronizar()
+
+                    segundos, pico = medir(sincronizar, args.repeticoes)
+                    resultados.append({'etapa': f'sincronizacao_{engine}', 'sorteios': args.concursos_api,
+                                       'segundos': segundos, 'pico_memoria': pico})
+
+        for tamanho in args.tamanhos:
+            salvar_sorteios(gerar_historico(tamanho, args.semente), ARQUIVO_SORTEIOS)
+            gerador = Gerador(usar_cache=False, executar=False)
+            for nome, funcao in etapas_analise(gerador, args.quantidade_jogos, args.candidatos, args.semente):
+                if nome in args.pular:
+                    continue
+                segundos, pico = medir(funcao, args.repeticoes)
+                resultados.append({'etapa': nome, 'sorteios': tamanho, 'segundos': segundos, 'pico_memoria': pico})
+    finally:
+        os.chdir(diretorio_original)
+        shutil.rmtree(diretorio, ignore_errors=True)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks das etapas do gerador da Mega Sena")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[3000, 100000],
+                        help="Tamanhos dos históricos sintéticos, em sorteios (padrão: 3000 100000)")
+    parser.add_argument("--repeticoes", type=int, default=3,
+                        help="Repetições de cada etapa; vale o menor tempo (padrão: 3)")
+    parser.add_argument("--quantidade-jogos", type=int, default=30,
+                        help="Jogos gerados nas etapas de geração (padrão: 30)")
+    parser.add_argument("--candidatos", type=int, default=20000,
+                        help="Jogos aleatórios filtrados na etapa check_repetitions (padrão: 20000)")
+    parser.add_argument("--concursos-api", type=int, default=500,
+                        help="Concursos servidos pela API local na sincronização (0 pula a etapa)")
+    parser.add_argument("--engines", nargs="+", choices=["threads", "async"], default=["threads"],
+                        help="Motores de download medidos na sincronização (padrão: threads)")
+    parser.add_argument("--latencia-api", type=float, default=0.0,
+                        help="Latência artificial de cada resposta da API local, em ms")
+    parser.add_argument("--falhas-a-cada", type=int, default=0,
+                        help="Concursos múltiplos de N respondem 429 duas vezes (0 desativa)")
+    parser.add_argument("--pular", nargs="*", default=[],
+                        help="Etapas a pular (ex.: exaustiva grafico)")
+    parser.add_argument("--semente", type=int, default=0, help="Semente dos históricos sintéticos")
+    parser.add_argument("--json", default=None, help="Também grava os resultados neste arquivo JSON")
+    args = parser.parse_args()
+
+    resultados = executar(args)
+
+    print(f"{'Etapa':<24} {'Sorteios':>10} {'Tempo (s)':>12} {'Pico (MB)':>12}")
+    for resultado in resultados:
+        print(f"{resultado['etapa']:<24} {resultado['sorteios']:>10} {resultado['segundos']:>12.4f} "
+              f"{resultado['pico_memoria'] / 2**20:>12.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
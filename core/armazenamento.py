@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+
+ARQUIVO_SORTEIOS = 'sorteios.npy'
+
+# Um registro por concurso: 4 + 8 + 6 = 18 bytes (o histórico inteiro cabe em poucas dezenas de KB)
+DTYPE_SORTEIO = np.dtype([
+    ('concurso', '<u4'),
+    ('data', '<M8[D]'),
+    ('dezenas', 'u1', (6,)),
+])
+
+
+def converter_data(data_apuracao):
+    """
+    Converte a data da API ('dd/mm/aaaa') para datetime64[D].
+    Retorna NaT se a data estiver ausente ou em outro formato.
+    """
+    try:
+        dia, mes, ano = data_apuracao.split('/')
+        return np.datetime64(f"{int(ano):04d}-{int(mes):02d}-{int(dia):02d}", 'D')
+    except (AttributeError, ValueError):
+        return np.datetime64('NaT', 'D')
+
+
+def converter_respostas(responses):
+    """
+    Converte as respostas da API ({id: dados}) no array compacto de sorteios,
+    ordenado por concurso. Concursos sem 'listaDezenas' são ignorados (e
+    voltam a ser baixados na próxima sincronização).
+    """
+    registros = []
+    for id, item in responses.items():
+        if 'listaDezenas' not in item:
+            print(f'O item com ID {id} não possui "listaDezenas".')
+            continue
+        dezenas = sorted(int(d) for d in item['listaDezenas'])
+        registros.append((int(id), converter_data(item.get('dataApuracao')), dezenas))
+
+    sorteios = np.array(registros, dtype=DTYPE_SORTEIO)
+    return np.sort(sorteios, order='concurso')
+
+
+def mesclar_sorteios(existentes, novos):
+    """
+    Junta dois arrays de sorteios. Se um concurso aparecer nos dois, vale o
+    registro de `novos`. O resultado fica ordenado por concurso.
+    """
+    if len(existentes) == 0:
+        return np.sort(novos, order='concurso')
+
+    mantidos = existentes[~np.isin(existentes['concurso'], novos['concurso'])]
+    return np.sort(np.concatenate([mantidos, novos]), order='concurso')
+
+
+def salvar_sorteios(sorteios, arquivo=ARQUIVO_SORTEIOS):
+    """
+    Salva o array de sorteios de forma atômica (arquivo temporário + os.replace).
+    """
+    arquivo_temporario = arquivo + '.tmp'
+    with open(arquivo_temporario, 'wb') as f:
+        np.save(f, np.ascontiguousarray(sorteios, dtype=DTYPE_SORTEIO))
+    os.replace(arquivo_temporario, arquivo)
+
+
+def carregar_sorteios(arquivo=ARQUIVO_SORTEIOS):
+    """
+    Abre o array de sorteios por memory mapping (somente leitura).
+    Colunas: sorteios['concurso'], sorteios['data'] e sorteios['dezenas'] (n x 6).
+    """
+    try:
+        return np.load(arquivo, mmap_mode='r')
+    except ValueError:
+        # Arquivo sem nenhum sorteio: não há o que mapear
+        return np.load(arquivo)
@@ -0,0 +1,189 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+
+import numpy as np
+
+from core.coocorrencia import IndiceCoocorrencia
+from core.estatisticas import HistoricoFrequencias
+from core.mascaras import contar_bits, para_mascara, para_mascaras
+
+# Faixas de premiação da Mega Sena (acertos, nome)
+PREMIOS = ((4, 'Quadra'), (5, 'Quina'), (6, 'Sena'))
+
+# Com poucos sorteios as frequências empatam demais: a busca exaustiva fica
+# lenta e as estatísticas não dizem nada
+INICIO_MINIMO = 50
+
+
+def probabilidade_acertos(acertos):
+    """
+    Probabilidade de um jogo de 6 números acertar exatamente `acertos` dezenas
+    de um sorteio (distribuição hipergeométrica).
+    """
+    return comb(6, acertos) * comb(54, 6 - acertos) / comb(60, 6)
+
+
+class Backtest():
+    """
+    Avaliação histórica das estratégias de geração.
+
+    Para cada concurso t (a partir de `inicio`), calcula as frequências apenas
+    com os sorteios anteriores a t, gera os jogos com cada estratégia e conta
+    quantas dezenas cada jogo acertou no sorteio t.
+
+    Os concursos são divididos em trechos contíguos. Cada trecho monta o
+    estado (HistoricoFrequencias e, se preciso, IndiceCoocorrencia) uma vez e
+    o atualiza sorteio a sorteio com adicionar() (e remover(), no índice com
+    janela), então nenhum concurso reprocessa o histórico. Com processos > 1 os trechos rodam em paralelo.
+    """
+
+    def __init__(self, gerador, dezenas, estrategias=('heuristica',), quantidade_jogos=10, max_repeticoes=3,
+                 inicio=100, janela=None, meia_vida=None, processos=1):
+        """
+        Args:
+            gerador: Gerador cujas estratégias serão avaliadas
+            dezenas: Array (n x 6) com as dezenas sorteadas, em ordem de concurso
+            estrategias: Estratégias avaliadas ('exaustiva', 'heuristica', 'afinidade')
+            quantidade_jogos: Jogos gerados por concurso e estratégia
+            max_repeticoes: Máximo de números em comum entre dois jogos gerados
+            inicio: Primeiro concurso avaliado (quantidade de sorteios já conhecidos)
+            janela: Usa apenas os últimos `janela` sorteios antes de cada concurso
+            meia_vida: Pondera os sorteios anteriores por decaimento exponencial
+            processos: Processos usados para avaliar os trechos de concursos
+        """
+        self.gerador = gerador
+        self.dezenas = np.asarray(dezenas)
+        self.estrategias = tuple(estrategias)
+        self.quantidade_jogos = quantidade_jogos
+        self.max_repeticoes = max_repeticoes
+        self.inicio = max(inicio, INICIO_MINIMO)
+        self.janela = janela
+        self.meia_vida = meia_vida
+        self.processos = processos
+
+    def parametros(self):
+        """
+        Configuração do backtest (exceto o gerador e os sorteios), para
+        recriá-lo nos processos do pool.
+        """
+        return {
+            'estrategias': self.estrategias,
+            'quantidade_jogos': self.quantidade_jogos,
+            'max_repeticoes': self.max_repeticoes,
+            'inicio': self.inicio,
+            'janela': self.janela,
+            'meia_vida': self.meia_vida,
+        }
+
+    def trechos(self):
+        """
+        Divide os concursos avaliados em trechos (inicio, fim): alguns por
+        processo, para equilibrar a carga entre eles.
+        """
+        total = len(self.dezenas)
+        if self.inicio >= total:
+            return []
+        quantidade = min(total - self.inicio, max(1, self.processos * 4))
+        limites = np.linspace(self.inicio, total, quantidade + 1).astype(int)
+        return list(zip(limites[:-1].tolist(), limites[1:].tolist()))
+
+    def gerar_jogos(self, estrategia, estatisticas, coocorrencia):
+        score_minimo = estatisticas.score_minimo(0.90)
+        if estrategia == 'exaustiva':
+            jogos = self.gerador.gerar_jogos_exaustiva(
+                estatisticas, self.quantidade_jogos, score_minimo, self.max_repeticoes
+            )
+        else:
+            numeros_ouro = estatisticas.numeros_ouro()
+            jogos = self.gerador.gerar_jogos_heuristica(
+                estatisticas, numeros_ouro, self.quantidade_jogos, score_minimo, self.max_repeticoes,
+                coocorrencia=coocorrencia if estrategia == 'afinidade' else None
+            )
+        return [jogo for jogo, _ in jogos[:self.quantidade_jogos]]
+
+    def avaliar_trecho(self, inicio, fim):
+        """
+        Avalia os concursos de `inicio` a `fim` (exclusivo). Retorna o array
+        (estratégias x 7) com quantos jogos acertaram 0 a 6 dezenas.
+        """
+        historico = HistoricoFrequencias(self.dezenas[:inicio], meia_vida=self.meia_vida)
+        coocorrencia = None
+        if 'afinidade' in self.estrategias:
+            # Mesma janela da análise (como no Gerador e no servidor): o índice
+            # desliza, retirando o sorteio que sai da janela a cada concurso
+            primeiro = 0 if self.janela is None else max(0, inicio - self.janela)
+            coocorrencia = IndiceCoocorrencia(self.dezenas[primeiro:inicio])
+
+        acertos = np.zeros((len(self.estrategias), 7), dtype=np.int64)
+        for t in range(inicio, fim):
+            estatisticas = historico.estatisticas(janela=self.janela, decaimento=self.meia_vida is not None)
+            sorteio = np.uint64(para_mascara(self.dezenas[t]))
+            for i, estrategia in enumerate(self.estrategias):
+                jogos = self.gerar_jogos(estrategia, estatisticas, coocorrencia)
+                if jogos:
+                    acertos[i] += np.bincount(contar_bits(para_mascaras(jogos) & sorteio), minlength=7)
+
+            historico.adicionar(self.dezenas[t])
+            if coocorrencia is not None:
+                coocorrencia.adicionar(self.dezenas[t])
+                if self.janela is not None and t >= self.janela:
+                    coocorrencia.remover(self.dezenas[t - self.janela])
+        return acertos
+
+    def executar(self):
+        """
+        Roda o backtest e retorna um dicionário com:
+            concursos, segundos, concursos_por_segundo: volume e vazão
+            estrategias: {estrategia: {'jogos': total, 'acertos': [0..6 dezenas]}}
+        """
+        trechos = self.trechos()
+        inicio = time.perf_counter()
+        if self.processos > 1 and len(trechos) > 1:
+            # Os processos recebem só dados serializáveis e montam o próprio
+            # Gerador: o deste processo guarda locks (Metricas), que o início
+            # por spawn (Windows, macOS) não consegue serializar
+            with ProcessPoolExecutor(max_workers=self.processos, initializer=_iniciar_processo,
+                                     initargs=(self.dezenas, self.parametros())) as executor:
+                resultados = []
+                for acertos, contadores in executor.map(_avaliar_trecho, trechos):
+                    resultados.append(acertos)
+                    self.gerador.metricas.mesclar(contadores)
+        else:
+            resultados = [self.avaliar_trecho(a, b) for a, b in trechos]
+        segundos = time.perf_counter() - inicio
+
+        acertos = sum(resultados, np.zeros((len(self.estrategias), 7), dtype=np.int64))
+        concursos = sum(b - a for a, b in trechos)
+        return {
+            'concursos': concursos,
+            'segundos': segundos,
+            'concursos_por_segundo': concursos / segundos if segundos > 0 else 0.0,
+            'estrategias': {
+                estrategia: {'jogos': int(linha.sum()), 'acertos': linha.tolist()}
+                for estrategia, linha in zip(self.estrategias, acertos)
+            },
+        }
+
+
+# Backtest de cada processo do pool (preenchido por _iniciar_processo)
+_processo = {}
+
+
+def _iniciar_processo(dezenas, parametros):
+    # Importado só aqui: core.gerador importa este módulo
+    from core.gerador import Gerador
+
+    _processo['backtest'] = Backtest(Gerador(usar_cache=False, executar=False), dezenas, **parametros)
+
+
+def _avaliar_trecho(trecho):
+    """
+    Avalia um trecho e devolve também os contadores de métricas acumulados
+    nele, para o processo principal somá-los às suas métricas.
+    """
+    backtest = _processo['backtest']
+    acertos = backtest.avaliar_trecho(*trecho)
+    metricas = backtest.gerador.metricas
+    contadores, metricas.contadores = metricas.contadores, {}
+    return acertos, contadores
@@ -0,0 +1,430 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, combinations
+from math import comb
+from multiprocessing import shared_memory
+
+import numpy as np
+
+TOTAL_COMBINACOES = 50063860
+
+# Combinações enumeradas (em todas as faixas) antes de a busca desistir: com
+# poucas repetições permitidas quase todas as combinações conflitam com os
+# jogos aceitos e as faixas seguintes raramente rendem um jogo novo
+LIMITE_COMBINACOES = 10000000
+
+# Tabela de binomiais C(n, k) para o sistema numérico combinatório
+_BINOMIAIS = np.array([[comb(n, k) for k in range(7)] for n in range(61)], dtype=np.int64)
+
+# Tabela das quadras (não depende das frequências), montada na primeira busca
+_QUADRAS = None
+
+
+def quadras_lexicograficas():
+    """
+    Todas as C(60, 4) quadras de índices 0 a 59 em ordem lexicográfica.
+    Retorna (quadras, colunas, limites): o array (n x 4) uint8, as 4 colunas
+    como arrays contíguos de índices (para somar os valores sem reordenar
+    memória) e os limites de cada grupo de mesmo primeiro índice.
+
+    A tabela é a mesma para qualquer vetor de frequências, então é gerada uma
+    vez por processo e compartilhada por todas as buscas (o backtest cria uma
+    busca por concurso).
+    """
+    global _QUADRAS
+    if _QUADRAS is None:
+        quadras = np.fromiter(chain.from_iterable(combinations(range(60), 4)),
+                              dtype=np.uint8, count=comb(60, 4) * 4).reshape(-1, 4)
+        colunas = tuple(np.ascontiguousarray(quadras[:, i], dtype=np.intp) for i in range(4))
+        limites = np.searchsorted(quadras[:, 0], np.arange(61))
+        _QUADRAS = quadras, colunas, limites
+    return _QUADRAS
+
+
+class SubconjuntosBloqueados():
+    """
+    Índice dos subconjuntos de tamanho `tamanho` já usados pelos jogos aceitos.
+    Dois jogos têm mais de `tamanho - 1` números em comum exatamente quando
+    compartilham algum subconjunto de `tamanho` números, então checar um
+    candidato é olhar C(6, tamanho) posições de um vetor booleano indexado
+    pelo rank combinatório de cada subconjunto.
+    """
+
+    def __init__(self, tamanho, buffer=None):
+        """
+        Args:
+            tamanho: Tamanho dos subconjuntos (máximo de repetições + 1)
+            buffer: Memória onde guardar o vetor de bloqueados (ex.: memória
+                compartilhada entre processos). Se None, aloca um vetor próprio.
+        """
+        self.tamanho = tamanho
+        self.bloqueados = np.ndarray(comb(60, tamanho), dtype=bool, buffer=buffer)
+        if buffer is None:
+            self.bloqueados[:] = False
+        self.total_bloqueados = 0
+        self.posicoes = np.array(list(combinations(range(6), tamanho)), dtype=np.intp)
+
+    def ranks(self, jogos):
+        """
+        Rank combinatório (B x C(6, tamanho)) dos subconjuntos de cada jogo.
+        `jogos` é um array (B x 6) de números ordenados.
+        """
+        jogos = np.asarray(jogos, dtype=np.intp) - 1
+        ranks = np.zeros((len(jogos), len(self.posicoes)), dtype=np.int32)
+        # Uma tabela 1-D por posição do subconjunto: C(número, posição + 1)
+        for posicao in range(self.tamanho):
+            tabela = _BINOMIAIS[:, posicao + 1].astype(np.int32)
+            ranks += tabela[jogos[:, self.posicoes[:, posicao]]]
+        return ranks
+
+    def livres(self, ranks):
+        """
+        Máscara booleana dos jogos que não usam nenhum subconjunto bloqueado.
+        """
+        return ~self.bloqueados[ranks].any(axis=-1)
+
+    def bloquear(self, ranks):
+        # Os subconjuntos de um jogo aceito estavam todos livres
+        self.bloqueados[ranks] = True
+        self.total_bloqueados += len(ranks)
+
+    def esgotado(self):
+        """
+        True quando sobram menos subconjuntos livres do que um jogo usa:
+        nenhum outro jogo pode ser aceito.
+        """
+        return len(self.bloqueados) - self.total_bloqueados < len(self.posicoes)
+
+
+class BuscaExaustiva():
+    """
+    Busca exata dos jogos de maior score (soma das frequências históricas)
+    entre todas as 50.063.860 combinações, respeitando o limite de números em
+    comum entre os jogos escolhidos.
+
+    As combinações são percorridas em faixas de score decrescente. Dentro de
+    cada faixa a enumeração é feita por branch-and-bound sobre os números
+    ordenados por frequência: os dois primeiros números são escolhidos em
+    Python (com poda pelo limite superior do score) e os quatro restantes vêm
+    de grupos pré-calculados, ordenados por soma, recortados com busca binária.
+    Assim só são materializadas as combinações que caem na faixa.
+
+    A seleção é gulosa e determinística: em ordem de score (empates pela menor
+    combinação) um jogo é aceito se tiver no máximo `max_repeticoes` números
+    em comum com todos os jogos já aceitos. Essa checagem usa o índice de
+    subconjuntos bloqueados, primeiro em lote para a faixa inteira e depois
+    jogo a jogo apenas para os candidatos que sobraram.
+
+    A busca para antes do score mínimo quando nenhum jogo novo é possível
+    (subconjuntos livres esgotados ou, sem repetições, menos de 6 números
+    livres) e desiste, marcando `interrompida`, depois de enumerar
+    `limite_combinacoes` combinações.
+    """
+
+    def __init__(self, frequencias, max_repeticoes=3, tamanho_faixa=200000, processos=1,
+                 limite_combinacoes=LIMITE_COMBINACOES):
+        """
+        Args:
+            frequencias: Vetor com 60 posições (frequência de cada número de 1 a 60)
+            max_repeticoes: Máximo de números em comum entre dois jogos escolhidos
+            tamanho_faixa: Quantidade aproximada de combinações por faixa de score
+            processos: Quantidade de processos que enumeram cada faixa em paralelo
+            limite_combinacoes: Combinações enumeradas antes de a busca desistir
+                (None = sem limite)
+        """
+        frequencias = np.asarray(frequencias)
+        self.frequencias = frequencias
+        self.max_repeticoes = max_repeticoes
+        self.tamanho_faixa = tamanho_faixa
+        self.processos = processos
+        self.limite_combinacoes = limite_combinacoes
+        # Candidatos já decididos (aceitos ou rejeitados pelo limite de
+        # repetições, inclusive no filtro em lote das faixas) e os rejeitados
+        self.candidatos = 0
+        self.rejeitados_repeticao = 0
+        # Combinações enumeradas nas faixas (antes do filtro de repetições)
+        self.enumeradas = 0
+        self.interrompida = False
+
+        # Números em ordem decrescente de frequência (empates pelo menor número)
+        self.numeros = (np.argsort(-frequencias, kind='stable') + 1).astype(np.uint8)
+        self.valores = frequencias[self.numeros - 1]
+
+        # Grupos de quadras (índices na ordem acima) separados pelo primeiro índice
+        # e ordenados por soma decrescente dentro de cada grupo. Só as somas e a
+        # ordenação dependem das frequências; a tabela de quadras é reaproveitada
+        quadras, colunas, limites = quadras_lexicograficas()
+        valores = self.valores
+        somas = valores[colunas[0]] + valores[colunas[1]] + valores[colunas[2]] + valores[colunas[3]]
+        self.quadras = []
+        self.somas_quadras = []
+        for primeiro in range(60):
+            trecho = slice(limites[primeiro], limites[primeiro + 1])
+            # A ordem entre quadras de mesma soma não importa: cada faixa é
+            # reordenada em ordenar(), com o desempate pela menor combinação
+            ordem = np.argsort(-somas[trecho])
+            self.quadras.append(quadras[trecho][ordem])
+            # Negado para ficar em ordem crescente (exigência do searchsorted)
+            self.somas_quadras.append(-somas[trecho][ordem])
+
+    def score_ideal(self):
+        return self.valores[:6].sum()
+
+    def teto(self, indice):
+        """
+        Maior score que um jogo ainda aceito pode ter. Sem repetições
+        (subconjuntos de 1 número) é a soma dos 6 maiores números livres;
+        com subconjuntos maiores, o score ideal.
+        """
+        if indice is None or indice.tamanho > 1:
+            return self.score_ideal()
+        livres = self.valores[~indice.bloqueados[self.numeros.astype(np.intp) - 1]]
+        return livres[:6].sum() if len(livres) >= 6 else -np.inf
+
+    def recortes(self, minimo, maximo, parte=0, partes=1):
+        """
+        Gera (a, b, c, inicio, fim): as combinações com score em [minimo, maximo)
+        que começam pelos índices a < b < c são as quadras
+        self.quadras[c][inicio:fim] precedidas de a e b.
+
+        Com partes > 1, gera apenas os prefixos (a, b) desta parte (divisão
+        intercalada, para equilibrar o trabalho entre processos).
+        """
+        valores = self.valores
+        for a in range(55):
+            # Maior score possível começando por a
+            if valores[a:a + 6].sum() < minimo:
+                break
+            for b in range(a + 1, 56):
+                s2 = valores[a] + valores[b]
+                if s2 + valores[b + 1:b + 5].sum() < minimo:
+                    break
+                if (a * 60 + b) % partes != parte:
+                    continue
+                for c in range(b + 1, 57):
+                    grupo = self.somas_quadras[c]
+                    # A maior quadra do grupo c já não alcança a faixa: nenhum c maior alcança
+                    if s2 - grupo[0] < minimo:
+                        break
+                    # somas das quadras em [minimo - s2, maximo - s2), negadas e crescentes
+                    inicio = np.searchsorted(grupo, s2 - maximo, side='right')
+                    fim = np.searchsorted(grupo, s2 - minimo, side='right')
+                    if inicio < fim:
+                        yield a, b, c, inicio, fim
+
+    def contar_faixa(self, minimo, maximo):
+        return sum(fim - inicio for _, _, _, inicio, fim in self.recortes(minimo, maximo))
+
+    def enumerar_faixa(self, minimo, maximo, parte=0, partes=1):
+        """
+        Retorna (combinações, scores) de todas as combinações com score em
+        [minimo, maximo). As combinações são índices na ordem de self.numeros.
+        """
+        blocos = []
+        somas = []
+        for a, b, c, inicio, fim in self.recortes(minimo, maximo, parte, partes):
+            bloco = np.empty((fim - inicio, 6), dtype=np.uint8)
+            bloco[:, 0] = a
+            bloco[:, 1] = b
+            bloco[:, 2:] = self.quadras[c][inicio:fim]
+            blocos.append(bloco)
+            somas.append(self.valores[a] + self.valores[b] - self.somas_quadras[c][inicio:fim])
+
+        if not blocos:
+            return np.zeros((0, 6), dtype=np.uint8), np.zeros(0, dtype=self.valores.dtype)
+        return np.concatenate(blocos), np.concatenate(somas)
+
+    def proxima_faixa(self, maximo, score_minimo, largura):
+        """
+        Escolhe o limite inferior da próxima faixa abaixo de `maximo` de modo
+        que ela tenha no máximo ~2 * tamanho_faixa combinações (a contagem usa
+        só busca binária, sem materializar nada). Retorna (minimo, largura).
+        """
+        topo = self.score_ideal() if maximo == np.inf else maximo
+        while True:
+            minimo = max(topo - largura, score_minimo)
+            # Empates no mesmo score não podem ser divididos: a largura tem um piso
+            if largura <= 1e-9 * max(abs(topo), 1) or self.contar_faixa(minimo, maximo) <= self.tamanho_faixa * 2:
+                return minimo, largura
+            largura /= 2
+
+    def ordenar(self, combinacoes, scores):
+        """
+        Converte índices em jogos (números ordenados) e ordena por score
+        decrescente, desempatando pela menor combinação.
+        """
+        jogos = np.sort(self.numeros[combinacoes], axis=1)
+        chaves = [jogos[:, i] for i in range(5, -1, -1)] + [-scores]
+        ordem = np.lexsort(chaves)
+        return jogos[ordem], scores[ordem]
+
+    def preparar_faixa(self, minimo, maximo, indice, parte=0, partes=1):
+        """
+        Enumera a faixa (ou a parte dela), ordena os jogos e descarta os que
+        já conflitam com os jogos aceitos. Retorna (jogos, scores, ranks,
+        descartados), com ranks None quando não há limite de repetições.
+        """
+        combinacoes, scores = self.enumerar_faixa(minimo, maximo, parte, partes)
+        jogos, scores = self.ordenar(combinacoes, scores)
+        if indice is None:
+            return jogos, scores, None, 0
+
+        ranks = indice.ranks(jogos)
+        livres = indice.livres(ranks)
+        return jogos[livres], scores[livres], ranks[livres], len(jogos) - int(livres.sum())
+
+    def preparar_faixa_paralela(self, executor, minimo, maximo, indice):
+        """
+        Divide a faixa entre os processos e junta os pedaços já filtrados,
+        reordenando o resultado (a ordem final é a mesma da versão sequencial).
+        """
+        pedacos = list(executor.map(
+            _preparar_parte,
+            [(minimo, maximo, parte, self.processos) for parte in range(self.processos)],
+        ))
+        jogos = np.concatenate([p[0] for p in pedacos])
+        scores = np.concatenate([p[1] for p in pedacos])
+        chaves = [jogos[:, i] for i in range(5, -1, -1)] + [-scores]
+        ordem = np.lexsort(chaves)
+        ranks = None if indice is None else np.concatenate([p[2] for p in pedacos])[ordem]
+        return jogos[ordem], scores[ordem], ranks, sum(p[3] for p in pedacos)
+
+    def iterar(self, score_minimo=None):
+        """
+        Gera (jogo, score) em ordem decrescente de score, apenas para os jogos
+        aceitos pelo limite de repetições. Para quando o score fica abaixo de
+        score_minimo (ou quando as combinações acabam).
+
+        Com processos > 1, a enumeração de cada faixa é dividida entre um
+        ProcessPoolExecutor. O vetor de frequências e o índice de subconjuntos
+        bloqueados ficam em memória compartilhada; a seleção gulosa continua
+        no processo principal, então o limite de repetições vale para o
+        conjunto inteiro de jogos.
+        """
+        if score_minimo is None:
+            score_minimo = self.valores[-6:].sum()
+
+        tamanho = self.max_repeticoes + 1
+        memorias = []
+        executor = None
+        try:
+            if self.processos > 1:
+                memoria_freq = shared_memory.SharedMemory(create=True, size=self.frequencias.nbytes)
+                memorias.append(memoria_freq)
+                np.ndarray(self.frequencias.shape, self.frequencias.dtype, buffer=memoria_freq.buf)[:] = self.frequencias
+                memoria_bloq = None
+                if tamanho < 6:
+                    memoria_bloq = shared_memory.SharedMemory(create=True, size=comb(60, tamanho))
+                    memorias.append(memoria_bloq)
+                executor = ProcessPoolExecutor(
+                    max_workers=self.processos,
+                    initializer=_iniciar_processo,
+                    initargs=(memoria_freq.name, str(self.frequencias.dtype), memoria_bloq and memoria_bloq.name,
+                              self.max_repeticoes, self.tamanho_faixa),
+                )
+                indice = SubconjuntosBloqueados(tamanho, memoria_bloq.buf) if memoria_bloq else None
+                if indice is not None:
+                    indice.bloqueados[:] = False
+            else:
+                indice = SubconjuntosBloqueados(tamanho) if tamanho < 6 else None
+
+            yield from self.selecionar(score_minimo, indice, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            indice = None
+            for memoria in memorias:
+                memoria.close()
+                memoria.unlink()
+
+    def selecionar(self, score_minimo, indice, executor=None):
+        tamanho_lote = 1024
+        maximo = np.inf
+        # Largura inicial da faixa: estimada pela densidade média de combinações
+        largura = max((self.score_ideal() - self.valores[-6:].sum()) * self.tamanho_faixa / TOTAL_COMBINACOES, 1)
+
+        while maximo > score_minimo:
+            if indice is not None:
+                if indice.esgotado():
+                    return
+                teto = self.teto(indice)
+                if teto < score_minimo:
+                    return
+                # Faixas acima do teto não têm jogos aceitáveis: começa logo abaixo dele
+                maximo = min(maximo, np.nextafter(teto, np.inf))
+            if self.limite_combinacoes is not None and self.enumeradas >= self.limite_combinacoes:
+                self.interrompida = True
+                return
+
+            minimo, largura = self.proxima_faixa(maximo, score_minimo, largura)
+            self.enumeradas += self.contar_faixa(minimo, maximo)
+            if executor is None:
+                jogos, scores, ranks, descartados = self.preparar_faixa(minimo, maximo, indice)
+            else:
+                jogos, scores, ranks, descartados = self.preparar_faixa_paralela(executor, minimo, maximo, indice)
+            maximo = minimo
+
+            # Faixa com poucas combinações: a próxima pode ser mais larga
+            if len(jogos) < self.tamanho_faixa // 2:
+                largura *= 2
+            # Só entram nas contagens os candidatos decididos: os descartados
+            # em lote e, abaixo, os aceitos ou rejeitados um a um (os que
+            # sobram quando o consumidor para de pedir jogos não contam)
+            self.candidatos += descartados
+            self.rejeitados_repeticao += descartados
+
+            if indice is None:
+                # Com 6 ou mais repetições permitidas, qualquer jogo distinto é aceito
+                for jogo, score in zip(jogos.tolist(), scores.tolist()):
+                    self.candidatos += 1
+                    yield tuple(jogo), score
+                continue
+
+            # Seleção gulosa em lotes: cada lote é conferido jogo a jogo e o
+            # restante da faixa é filtrado de novo, em lote, contra os aceitos
+            livres = np.arange(len(jogos))
+            while len(livres):
+                for i in livres[:tamanho_lote].tolist():
+                    self.candidatos += 1
+                    if not indice.bloqueados[ranks[i]].any():
+                        indice.bloquear(ranks[i])
+                        yield tuple(jogos[i].tolist()), scores[i].item()
+                    else:
+                        self.rejeitados_repeticao += 1
+                livres = livres[tamanho_lote:]
+                restantes = len(livres)
+                livres = livres[indice.livres(ranks[livres])]
+                self.candidatos += restantes - len(livres)
+                self.rejeitados_repeticao += restantes - len(livres)
+
+    def buscar(self, quantidade, score_minimo=None):
+        """
+        Retorna a lista com os `quantidade` melhores jogos (jogo, score).
+        """
+        jogos = []
+        for jogo in self.iterar(score_minimo):
+            jogos.append(jogo)
+            if len(jogos) >= quantidade:
+                break
+        return jogos
+
+
+# Estado de cada processo do pool (preenchido por _iniciar_processo)
+_processo = {}
+
+
+def _iniciar_processo(nome_freq, dtype_freq, nome_bloq, max_repeticoes, tamanho_faixa):
+    memoria_freq = shared_memory.SharedMemory(name=nome_freq)
+    frequencias = np.ndarray(60, dtype=dtype_freq, buffer=memoria_freq.buf).copy()
+    memoria_freq.close()
+
+    _processo['busca'] = BuscaExaustiva(frequencias, max_repeticoes, tamanho_faixa)
+    _processo['indice'] = None
+    if nome_bloq is not None:
+        # Mantém a referência à memória: o índice lê os bloqueados atualizados pelo processo principal
+        _processo['memoria_bloq'] = shared_memory.SharedMemory(name=nome_bloq)
+        _processo['indice'] = SubconjuntosBloqueados(max_repeticoes + 1, _processo['memoria_bloq'].buf)
+
+
+def _preparar_parte(argumentos):
+    minimo, maximo, parte, partes = argumentos
+    return _processo['busca'].preparar_faixa(minimo, maximo, _processo['indice'], parte, partes)
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+
+DIRETORIO_CACHE = '.cache_analise'
+
+
+def versao_dados(arquivo):
+    """
+    Identifica a versão do armazenamento de sorteios pelo conteúdo do arquivo
+    (hash SHA-256). Qualquer concurso novo ou corrigido muda a versão.
+    """
+    sha = hashlib.sha256()
+    with open(arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+class CacheAnalise():
+    """
+    Cache em disco dos resultados da análise (estatísticas e jogos gerados).
+    Cada entrada é um arquivo JSON cujo nome é o hash da versão dos dados e
+    dos parâmetros usados. O horário de modificação marca o último uso: ao
+    passar de `max_entradas`, as entradas usadas há mais tempo são removidas (LRU).
+    """
+
+    def __init__(self, diretorio=DIRETORIO_CACHE, max_entradas=64):
+        self.diretorio = diretorio
+        self.max_entradas = max_entradas
+
+    def chave(self, tipo, versao, **parametros):
+        conteudo = json.dumps({'tipo': tipo, 'versao': versao, 'parametros': parametros}, sort_keys=True)
+        return hashlib.sha256(conteudo.encode()).hexdigest()
+
+    def caminho(self, chave):
+        return os.path.join(self.diretorio, chave + '.json')
+
+    def obter(self, chave):
+        """
+        Retorna o valor guardado para a chave, ou None se não houver.
+        """
+        caminho = self.caminho(chave)
+        try:
+            with open(caminho, 'r') as f:
+                valor = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Marca a entrada como usada agora (ordem do LRU)
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+        return valor
+
+    def guardar(self, chave, valor):
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self.caminho(chave)
+        arquivo_temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(arquivo_temporario, 'w') as f:
+            json.dump(valor, f)
+        os.replace(arquivo_temporario, caminho)
+        self.remover_antigas()
+
+    def remover_antigas(self):
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            if nome.endswith('.json'):
+                caminho = os.path.join(self.diretorio, nome)
+                try:
+                    entradas.append((os.path.getmtime(caminho), caminho))
+                except OSError:
+                    continue
+
+        entradas.sort()
+        for _, caminho in entradas[:max(0, len(entradas) - self.max_entradas)]:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import aiohttp
+
+from core.cliente_http import (STATUS_RETENTAVEIS, URL_API, LimitadorTaxa,
+                               calcular_espera, ler_retry_after)
+from core.metricas import Metricas
+
+
+class ClienteHTTPAsync():
+    """
+    Versão asyncio do ClienteHTTP. Usa poucas conexões keep-alive e mantém no
+    máximo `concorrencia` requisições em voo, com o mesmo limitador de taxa,
+    a mesma política de retentativas e o mesmo formato de resultado do
+    cliente com threads.
+    """
+
+    def __init__(self, url_base=URL_API, concorrencia=8, requisicoes_por_segundo=10.0,
+                 timeout=(5, 30), backoff_base=0.5, backoff_maximo=30.0, verificar_ssl=False, metricas=None):
+        self.url_base = url_base if url_base.endswith('/') else url_base + '/'
+        self.concorrencia = concorrencia
+        self.timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+        self.verificar_ssl = verificar_ssl
+        self.metricas = metricas if metricas is not None else Metricas()
+        self.limitador = LimitadorTaxa(requisicoes_por_segundo)
+
+    async def get_json(self, sessao, semaforo, caminho='', max_retries=20):
+        """
+        Mesma semântica de ClienteHTTP.get_json: retorna o JSON da resposta ou
+        None após esgotar as tentativas (ou diante de um erro definitivo).
+        """
+        url = self.url_base + str(caminho)
+        for tentativa in range(max_retries):
+            espera = self.limitador.reservar()
+            if espera > 0:
+                await asyncio.sleep(espera)
+
+            retry_after = None
+            try:
+                async with semaforo:
+                    async with sessao.get(url) as response:
+                        corpo = await response.read()
+                        status = response.status
+                        retry_after = ler_retry_after(response.headers.get('Retry-After'))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                self.metricas.incrementar('http_erros_conexao_total', tipo=e.__class__.__name__)
+                print(f"Erro na requisição {url}: {e.__class__.__name__}. Tentando novamente...")
+            else:
+                self.metricas.incrementar('http_requisicoes_total', status=status)
+                self.metricas.incrementar('http_bytes_total', len(corpo))
+                if status == 200:
+                    try:
+                        return json.loads(corpo)
+                    except ValueError:
+                        # 200 com corpo que não é JSON (ex.: página de manutenção): falha temporária
+                        self.metricas.incrementar('http_respostas_invalidas_total')
+                        print(f"Resposta inválida (não é JSON) em {url}. Tentando novamente...")
+                elif status not in STATUS_RETENTAVEIS:
+                    print(f"Erro definitivo na requisição {url}: {status}.")
+                    return None
+                else:
+                    print(f"Erro na requisição {url}: {status}. Tentando novamente...")
+
+            if tentativa + 1 < max_retries:
+                self.metricas.incrementar('http_retentativas_total')
+                await asyncio.sleep(calcular_espera(tentativa, self.backoff_base, self.backoff_maximo, retry_after))
+
+        self.metricas.incrementar('http_falhas_total')
+        print(f"Falha após {max_retries} tentativas.")
+        return None
+
+    async def _baixar(self, ids, max_retries):
+        semaforo = asyncio.Semaphore(self.concorrencia)
+        conector = aiohttp.TCPConnector(limit=self.concorrencia, ssl=None if self.verificar_ssl else False)
+        async with aiohttp.ClientSession(connector=conector, timeout=self.timeout) as sessao:
+            async def baixar_um(id):
+                data = await self.get_json(sessao, semaforo, id, max_retries=max_retries)
+                if data is None:
+                    return None
+                return id, data
+
+            tarefas = [asyncio.ensure_future(baixar_um(id)) for id in ids]
+            resultados = {}
+            for tarefa in asyncio.as_completed(tarefas):
+                data = await tarefa
+                if data is not None:
+                    resultados[data[0]] = data[1]
+            return resultados
+
+    def baixar(self, ids, max_retries=20):
+        """
+        Baixa todos os IDs em um único loop de eventos.
+        Retorna um dicionário {id: dados} apenas com os IDs baixados com sucesso.
+        """
+        return asyncio.run(self._baixar(list(ids), max_retries))
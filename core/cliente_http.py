@@ -0,0 +1,174 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from core.metricas import Metricas
+
+# A API da Caixa é acessada sem validar o certificado (verify=False)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+URL_API = "https://servicebus2.caixa.gov.br/portaldeloterias/api/megasena/"
+
+# Status que indicam falha temporária (vale a pena tentar novamente)
+STATUS_RETENTAVEIS = {408, 425, 429, 500, 502, 503, 504}
+
+# Maior Retry-After respeitado, em segundos: protege contra valores absurdos
+# (ou datas mal configuradas) que travariam a sincronização por horas
+RETRY_AFTER_MAXIMO = 600.0
+
+
+class LimitadorTaxa():
+    """
+    Limitador de taxa no modelo token bucket.
+    O balde comporta até `capacidade` fichas e é reabastecido a `taxa` fichas
+    por segundo. Cada requisição consome uma ficha.
+    """
+
+    def __init__(self, taxa, capacidade=None):
+        self.taxa = float(taxa)
+        self.capacidade = float(capacidade if capacidade is not None else max(1.0, taxa))
+        self.fichas = self.capacidade
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reservar(self):
+        """
+        Reserva uma ficha e retorna quantos segundos é preciso esperar antes
+        de usá-la. Não dorme: quem chama decide como esperar (time.sleep ou
+        asyncio.sleep).
+        """
+        if self.taxa <= 0:
+            return 0.0
+
+        with self.lock:
+            agora = time.monotonic()
+            self.fichas = min(self.capacidade, self.fichas + (agora - self.ultimo) * self.taxa)
+            self.ultimo = agora
+            self.fichas -= 1
+            if self.fichas >= 0:
+                return 0.0
+            # Saldo negativo: a ficha só estará disponível após o reabastecimento
+            return -self.fichas / self.taxa
+
+    def aguardar(self):
+        espera = self.reservar()
+        if espera > 0:
+            time.sleep(espera)
+
+
+def ler_retry_after(valor):
+    """
+    Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos.
+    Retorna None se o cabeçalho estiver ausente ou for inválido.
+    """
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, data.timestamp() - time.time())
+
+
+def calcular_espera(tentativa, base=0.5, maximo=30.0, retry_after=None, retry_after_maximo=RETRY_AFTER_MAXIMO):
+    """
+    Backoff exponencial com jitter completo: espera aleatória entre 0 e
+    base * 2^tentativa (limitada a `maximo`). Se o servidor informou
+    Retry-After, a espera nunca é menor que o valor pedido; esse valor só é
+    limitado por `retry_after_maximo`, não pelo teto do backoff.
+    """
+    espera = random.uniform(0, min(maximo, base * (2 ** tentativa)))
+    if retry_after is not None:
+        espera = max(espera, min(retry_after, retry_after_maximo))
+    return espera
+
+
+class ClienteHTTP():
+    """
+    Cliente HTTP compartilhado para a API da Caixa.
+    Reaproveita conexões (pool de keep-alive), limita a concorrência e a taxa
+    de requisições e refaz requisições com falha usando backoff exponencial.
+    """
+
+    def __init__(self, url_base=URL_API, concorrencia=8, requisicoes_por_segundo=10.0,
+                 timeout=(5, 30), backoff_base=0.5, backoff_maximo=30.0, verificar_ssl=False, metricas=None):
+        """
+        Args:
+            url_base: URL base da API (pode apontar para um servidor local de testes)
+            concorrencia: Número máximo de requisições simultâneas
+            requisicoes_por_segundo: Taxa máxima de requisições (0 desativa o limite)
+            timeout: Timeout por requisição em segundos (conexão, leitura)
+            backoff_base: Espera base do backoff exponencial em segundos
+            backoff_maximo: Espera máxima entre tentativas em segundos
+            verificar_ssl: Se True, valida o certificado do servidor
+            metricas: Metricas onde são contadas requisições, status, retentativas e bytes
+        """
+        self.url_base = url_base if url_base.endswith('/') else url_base + '/'
+        self.concorrencia = concorrencia
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+        self.verificar_ssl = verificar_ssl
+        self.metricas = metricas if metricas is not None else Metricas()
+        self.limitador = LimitadorTaxa(requisicoes_por_segundo)
+        self.semaforo = threading.BoundedSemaphore(concorrencia)
+
+        # Uma única sessão com pool do tamanho da concorrência: as threads
+        # reaproveitam as conexões em vez de abrir um handshake TLS por requisição
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=concorrencia, max_retries=0)
+        self.sessao.mount('http://', adaptador)
+        self.sessao.mount('https://', adaptador)
+
+    def get_json(self, caminho='', max_retries=20):
+        """
+        Faz um GET em url_base + caminho e retorna o JSON da resposta.
+        Retorna None se todas as tentativas falharem ou se o servidor responder
+        com um erro definitivo (4xx diferente de 408/425/429).
+        """
+        url = self.url_base + str(caminho)
+        for tentativa in range(max_retries):
+            self.limitador.aguardar()
+            retry_after = None
+            try:
+                with self.semaforo:
+                    response = self.sessao.get(url, timeout=self.timeout, verify=self.verificar_ssl)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.metricas.incrementar('http_erros_conexao_total', tipo=e.__class__.__name__)
+                print(f"Erro na requisição {url}: {e.__class__.__name__}. Tentando novamente...")
+            else:
+                self.metricas.incrementar('http_requisicoes_total', status=response.status_code)
+                self.metricas.incrementar('http_bytes_total', len(response.content))
+                if response.status_code == 200:
+                    try:
+                        return response.json()
+                    except ValueError:
+                        # 200 com corpo que não é JSON (ex.: página de manutenção): falha temporária
+                        self.metricas.incrementar('http_respostas_invalidas_total')
+                        print(f"Resposta inválida (não é JSON) em {url}. Tentando novamente...")
+                elif response.status_code not in STATUS_RETENTAVEIS:
+                    print(f"Erro definitivo na requisição {url}: {response.status_code}.")
+                    return None
+                else:
+                    retry_after = ler_retry_after(response.headers.get('Retry-After'))
+                    print(f"Erro na requisição {url}: {response.status_code}. Tentando novamente...")
+
+            if tentativa + 1 < max_retries:
+                self.metricas.incrementar('http_retentativas_total')
+                time.sleep(calcular_espera(tentativa, self.backoff_base, self.backoff_maximo, retry_after))
+
+        self.metricas.incrementar('http_falhas_total')
+        print(f"Falha após {max_retries} tentativas.")
+        return None
+
+    def close(self):
+        self.sessao.close()
@@ -0,0 +1,127 @@
+from itertools import combinations
+
+import numpy as np
+
+# Posições dos 15 pares e dos 20 trios dentro de um sorteio (6 dezenas ordenadas)
+_PARES = np.array(list(combinations(range(6), 2))).T
+_TRIOS = np.array(list(combinations(range(6), 3))).T
+
+
+def codigos_pares(dezenas):
+    """
+    Código a * 60 + b (a < b, de 0 a 59) de cada par de cada jogo: array (n x 15).
+    `dezenas` é um jogo ou um array (n x 6) com números de 1 a 60.
+    """
+    dezenas = np.sort(np.asarray(dezenas, dtype=np.intp).reshape(-1, 6), axis=1) - 1
+    return dezenas[:, _PARES[0]] * 60 + dezenas[:, _PARES[1]]
+
+
+def codigos_trios(dezenas):
+    """
+    Código a * 3600 + b * 60 + c (a < b < c, de 0 a 59) de cada trio de cada
+    jogo: array (n x 20).
+    """
+    dezenas = np.sort(np.asarray(dezenas, dtype=np.intp).reshape(-1, 6), axis=1) - 1
+    return dezenas[:, _TRIOS[0]] * 3600 + dezenas[:, _TRIOS[1]] * 60 + dezenas[:, _TRIOS[2]]
+
+
+class IndiceCoocorrencia():
+    """
+    Índice de co-ocorrência de pares e trios no histórico de sorteios.
+
+    Os pares ficam numa matriz 60 x 60 simétrica (a diagonal é a frequência
+    de cada número) e os trios numa tabela esparsa: códigos ordenados dos
+    trios que já saíram e as suas contagens. Tudo é montado com bincount
+    sobre os códigos dos 15 pares / 20 trios de cada sorteio, e um sorteio
+    novo atualiza o índice sem reprocessar o histórico.
+    """
+
+    def __init__(self, dezenas=None):
+        """
+        Args:
+            dezenas: Array (n x 6) com as dezenas sorteadas
+        """
+        dezenas = np.zeros((0, 6), dtype=np.uint8) if dezenas is None else np.asarray(dezenas)
+        self.total_sorteios = len(dezenas)
+
+        pares = np.bincount(codigos_pares(dezenas).ravel(), minlength=3600).reshape(60, 60)
+        self.pares = pares + pares.T
+        frequencias = np.bincount(dezenas.ravel().astype(np.intp), minlength=61)[1:61]
+        self.pares[np.diag_indices(60)] = frequencias
+
+        # Só C(60, 3) = 34.220 trios são possíveis, então o bincount denso é
+        # barato; a tabela guarda apenas os trios que já saíram
+        trios = np.bincount(codigos_trios(dezenas).ravel(), minlength=216000)
+        self.trios = np.flatnonzero(trios)
+        self.contagens_trios = trios[self.trios]
+
+    def adicionar(self, dezenas):
+        """
+        Acrescenta um sorteio (6 dezenas) ao índice.
+        """
+        indices = np.asarray(dezenas, dtype=np.intp) - 1
+        self.pares[np.ix_(indices, indices)] += 1
+        self.total_sorteios += 1
+
+        codigos = codigos_trios(dezenas)[0]
+        posicoes = np.searchsorted(self.trios, codigos)
+        existentes = np.isin(codigos, self.trios)
+        self.contagens_trios[posicoes[existentes]] += 1
+        if not existentes.all():
+            novos = ~existentes
+            self.trios = np.insert(self.trios, posicoes[novos], codigos[novos])
+            self.contagens_trios = np.insert(self.contagens_trios, posicoes[novos], 1)
+
+    def remover(self, dezenas):
+        """
+        Retira um sorteio (6 dezenas) já contado no índice. Junto com
+        adicionar(), mantém o índice de uma janela deslizante de sorteios.
+        """
+        indices = np.asarray(dezenas, dtype=np.intp) - 1
+        self.pares[np.ix_(indices, indices)] -= 1
+        self.total_sorteios -= 1
+
+        posicoes = np.searchsorted(self.trios, codigos_trios(dezenas)[0])
+        self.contagens_trios[posicoes] -= 1
+        # A tabela guarda apenas os trios que ainda aparecem na janela
+        zerados = posicoes[self.contagens_trios[posicoes] == 0]
+        if len(zerados):
+            self.trios = np.delete(self.trios, zerados)
+            self.contagens_trios = np.delete(self.contagens_trios, zerados)
+
+    def par(self, a, b):
+        return self.pares[a - 1, b - 1].item()
+
+    def trio(self, a, b, c):
+        a, b, c = sorted((a, b, c))
+        codigo = (a - 1) * 3600 + (b - 1) * 60 + (c - 1)
+        posicao = np.searchsorted(self.trios, codigo)
+        if posicao < len(self.trios) and self.trios[posicao] == codigo:
+            return self.contagens_trios[posicao].item()
+        return 0
+
+    def pares_mais_frequentes(self, n=10):
+        """
+        Lista (a, b, contagem) dos n pares que mais saíram juntos.
+        """
+        superiores = np.triu(self.pares, 1).ravel()
+        ordem = np.argsort(-superiores, kind='stable')[:n]
+        return [(int(c // 60) + 1, int(c % 60) + 1, superiores[c].item()) for c in ordem]
+
+    def trios_mais_frequentes(self, n=10):
+        """
+        Lista (a, b, c, contagem) dos n trios que mais saíram juntos.
+        """
+        ordem = np.argsort(-self.contagens_trios, kind='stable')[:n]
+        return [
+            (int(c // 3600) + 1, int(c // 60 % 60) + 1, int(c % 60) + 1, self.contagens_trios[i].item())
+            for i, c in zip(ordem, self.trios[ordem])
+        ]
+
+    def afinidades(self, jogos):
+        """
+        Afinidade (soma das contagens dos 15 pares) de cada jogo, em lote.
+        `jogos` pode ser um único jogo ou uma sequência/array (n x 6).
+        """
+        afinidades = self.pares.ravel()[codigos_pares(jogos)].sum(axis=-1)
+        return afinidades if np.ndim(jogos) > 1 else afinidades[0]
@@ -0,0 +1,293 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, combinations
+from math import comb, exp
+
+import numpy as np
+
+from core.mascaras import contar_bits
+
+# Tamanhos de grupo aceitos: com mais de 30 números a matriz de incidência
+# (C(k, 6) jogos x C(6, garantia) alvos) passa de centenas de MB
+TAMANHO_MINIMO = 7
+TAMANHO_MAXIMO = 30
+
+# Temperatura do recozimento na busca local: uma troca que descobre 1 alvo
+# a mais do que cobre é aceita com probabilidade exp(-1 / 0.25) ~ 2%
+TEMPERATURA = 0.25
+
+# C(n, r) para n <= TAMANHO_MAXIMO e r <= 6, usado no cálculo dos postos
+_BINOMIAIS = np.array([[comb(n, r) for r in range(7)] for n in range(TAMANHO_MAXIMO + 1)], dtype=np.int64)
+
+
+def combinacoes(k, r):
+    """
+    Todas as combinações de r posições entre 0 e k-1, em ordem lexicográfica,
+    como um array (C(k, r) x r).
+    """
+    return np.fromiter(
+        chain.from_iterable(combinations(range(k), r)), dtype=np.int8, count=comb(k, r) * r
+    ).reshape(-1, r)
+
+
+def postos(subconjuntos):
+    """
+    Posto colexicográfico de cada subconjunto ordenado (última dimensão):
+    C(x1, 1) + C(x2, 2) + ... Os subconjuntos de r elementos de 0..k-1 recebem
+    exatamente os postos 0..C(k, r)-1, sem precisar de dicionário.
+    """
+    subconjuntos = np.asarray(subconjuntos, dtype=np.int64)
+    return _BINOMIAIS[subconjuntos, np.arange(1, subconjuntos.shape[-1] + 1)].sum(axis=-1)
+
+
+def para_mascaras_posicoes(posicoes):
+    """
+    Máscaras uint32 de um array (n x r) de posições no grupo (0 a k-1).
+    """
+    posicoes = np.asarray(posicoes, dtype=np.uint32)
+    return np.bitwise_or.reduce(np.left_shift(np.uint32(1), posicoes), axis=-1)
+
+
+def limite_schonheim(k, garantia):
+    """
+    Limite inferior de Schönheim para a quantidade de jogos de 6 números que
+    cobre todos os subconjuntos de `garantia` números de um grupo de k.
+    """
+    limite = 1
+    for i in range(garantia - 1, -1, -1):
+        limite = -(-(k - i) * limite // (6 - i))
+    return limite
+
+
+class Desdobramento():
+    """
+    Desdobramento (fechamento) de um grupo de k números: o menor conjunto de
+    jogos de 6 números que garante `garantia` acertos em pelo menos um jogo
+    sempre que `garantia` das dezenas sorteadas estiverem no grupo. É o
+    problema de cobertura C(k, 6, garantia).
+
+    Os C(k, 6) jogos candidatos e os C(k, garantia) alvos são identificados
+    pelo posto colexicográfico (o índice de cada um nas tabelas), com duas
+    tabelas de incidência em arrays: alvos[j] (os C(6, garantia) alvos que o
+    jogo j cobre) e inverso[a] (os jogos que contêm o alvo a). Assim:
+
+    - o guloso escolhe sempre um jogo de maior ganho (alvos ainda descobertos)
+      e atualiza o ganho apenas dos jogos que contêm os alvos recém-cobertos;
+    - a poda retira jogos redundantes (todos os seus alvos cobertos por outros);
+    - a busca local retira mais um jogo e, com a quantidade de jogos fixa,
+      troca uma dezena de cada vez até voltar a cobrir todos os alvos.
+
+    Cada tentativa usa a sua semente (SeedSequence.spawn) e desempata o
+    guloso ao acaso; as tentativas rodam em paralelo e vence a menor.
+    """
+
+    def __init__(self, numeros, garantia=4, tentativas=8, iteracoes=2000, processos=1, semente=None):
+        """
+        Args:
+            numeros: Números do grupo (1 a 60), de 7 a 30 números distintos
+            garantia: Acertos garantidos em pelo menos um jogo (4 = quadra, 5 = quina)
+            tentativas: Execuções independentes (guloso + busca local); vence a menor
+            iteracoes: Trocas de dezena da busca local em cada tentativa
+            processos: Processos usados para rodar as tentativas
+            semente: Semente do gerador aleatório (None = aleatória, registrada no resultado)
+        """
+        self.numeros = sorted({int(n) for n in numeros})
+        self.k = len(self.numeros)
+        if not TAMANHO_MINIMO <= self.k <= TAMANHO_MAXIMO:
+            raise ValueError(f"O desdobramento precisa de {TAMANHO_MINIMO} a {TAMANHO_MAXIMO} números "
+                             f"distintos (recebeu {self.k}).")
+        if not 2 <= garantia <= 5:
+            raise ValueError(f"Garantia inválida: {garantia} (use de 2 a 5 acertos).")
+        self.garantia = garantia
+        self.tentativas = max(1, tentativas)
+        self.iteracoes = iteracoes
+        self.processos = processos
+        self.sementes = np.random.SeedSequence(semente)
+        self.total_alvos = comb(self.k, garantia)
+
+        # Tabelas de incidência, montadas no processo que as usa (preparar)
+        self.jogos = None
+        self.alvos = None
+        self.inverso = None
+        self.mascaras = None
+        self.posicoes_alvos = None
+        self.mascaras_alvos = None
+
+    def preparar(self):
+        if self.alvos is not None:
+            return
+        # Em ordem de posto: o índice de um jogo é o seu posto
+        jogos = combinacoes(self.k, 6)
+        self.jogos = jogos[np.argsort(postos(jogos))]
+        alvos = combinacoes(self.k, self.garantia)
+        self.posicoes_alvos = alvos[np.argsort(postos(alvos))]
+        self.mascaras_alvos = para_mascaras_posicoes(self.posicoes_alvos)
+
+        subconjuntos = np.array(list(combinations(range(6), self.garantia)), dtype=np.intp)
+        self.alvos = postos(self.jogos[:, subconjuntos]).astype(np.int32)
+        # Cada alvo está em exatamente C(k - garantia, 6 - garantia) jogos
+        ordem = np.argsort(self.alvos.ravel(), kind='stable')
+        self.inverso = (ordem // self.alvos.shape[1]).astype(np.int32).reshape(self.total_alvos, -1)
+        self.mascaras = para_mascaras_posicoes(self.jogos)
+
+    def completar(self, rng, escolhidos, cobertura):
+        """
+        Guloso: acrescenta a `escolhidos` jogos de maior ganho até que todos os
+        alvos estejam cobertos. `cobertura` (jogos que cobrem cada alvo) é
+        atualizada no lugar.
+        """
+        descobertos = np.flatnonzero(cobertura == 0)
+        restantes = len(descobertos)
+        if restantes == 0:
+            return
+        ganho = np.bincount(self.inverso[descobertos].ravel(), minlength=len(self.jogos)).astype(np.int32)
+        while restantes > 0:
+            opcoes = np.flatnonzero(ganho == ganho.max())
+            jogo = opcoes[rng.integers(len(opcoes))]
+            alvos = self.alvos[jogo]
+            novos = alvos[cobertura[alvos] == 0]
+            cobertura[alvos] += 1
+            # Só os jogos que contêm um alvo recém-coberto perdem ganho
+            np.subtract.at(ganho, self.inverso[novos].ravel(), 1)
+            escolhidos.append(jogo)
+            restantes -= len(novos)
+
+    def podar(self, rng, escolhidos, cobertura):
+        """
+        Retira, um a um e em ordem aleatória, os jogos cujos alvos estão todos
+        cobertos por outros jogos.
+        """
+        while escolhidos:
+            redundantes = np.flatnonzero(cobertura[self.alvos[escolhidos]].min(axis=1) >= 2)
+            if len(redundantes) == 0:
+                return
+            jogo = escolhidos.pop(redundantes[rng.integers(len(redundantes))])
+            cobertura[self.alvos[jogo]] -= 1
+
+    def trocar(self, rng, jogos, mascaras, cobertura, alvo):
+        """
+        Um passo do recozimento, focado no alvo descoberto `alvo`: entre os
+        jogos com mais números em comum com ele, sorteia um e troca uma dezena
+        que não está no alvo por uma que falta. A troca é aceita se não
+        descobrir mais alvos do que cobre ou, se descobrir, com probabilidade
+        exp(-diferença / TEMPERATURA).
+        """
+        mascara_alvo = int(self.mascaras_alvos[alvo])
+        comuns = contar_bits(mascaras & np.uint32(mascara_alvo))
+        candidatos = np.flatnonzero(comuns == comuns.max())
+        i = candidatos[rng.integers(len(candidatos))]
+        mascara = int(mascaras[i])
+
+        faltam = [p for p in self.posicoes_alvos[alvo].tolist() if not mascara >> p & 1]
+        trocaveis = [p for p in self.jogos[jogos[i]].tolist() if not mascara_alvo >> p & 1]
+        entra = faltam[rng.integers(len(faltam))]
+        sai = trocaveis[rng.integers(len(trocaveis))]
+        novo = int(postos(sorted(p for p in self.jogos[jogos[i]].tolist() + [entra] if p != sai)))
+
+        antigos = self.alvos[jogos[i]]
+        novos = self.alvos[novo]
+        perdidos = np.count_nonzero((cobertura[antigos] == 1) & ~np.isin(antigos, novos))
+        ganhos = np.count_nonzero(cobertura[novos] == 0)
+        diferenca = perdidos - ganhos
+        if diferenca <= 0 or rng.random() < exp(-diferenca / TEMPERATURA):
+            cobertura[antigos] -= 1
+            cobertura[novos] += 1
+            jogos[i] = novo
+            mascaras[i] = self.mascaras[novo]
+
+    def busca_local(self, rng, escolhidos, cobertura):
+        """
+        Tenta reduzir a cobertura um jogo de cada vez: retira o jogo que cobre
+        sozinho menos alvos e aplica trocas até cobrir de novo todos os alvos.
+        Para quando as `iteracoes` trocas da tentativa se esgotam. Retorna o
+        array com a menor cobertura completa encontrada.
+        """
+        melhor = np.array(escolhidos)
+        jogos = melhor.copy()
+        cobertura = cobertura.copy()
+        restantes = self.iteracoes
+        while restantes > 0 and len(jogos) > 1:
+            unicos = np.count_nonzero(cobertura[self.alvos[jogos]] == 1, axis=1)
+            i = int(np.argmin(unicos))
+            cobertura[self.alvos[jogos[i]]] -= 1
+            jogos = np.delete(jogos, i)
+            mascaras = self.mascaras[jogos]
+
+            while restantes > 0:
+                descobertos = np.flatnonzero(cobertura == 0)
+                if len(descobertos) == 0:
+                    melhor = jogos.copy()
+                    break
+                self.trocar(rng, jogos, mascaras, cobertura, descobertos[rng.integers(len(descobertos))])
+                restantes -= 1
+        return melhor
+
+    def resolver(self, semente):
+        """
+        Uma tentativa completa. Retorna o array (n x 6) com as posições no
+        grupo dos números de cada jogo.
+        """
+        self.preparar()
+        rng = np.random.default_rng(semente)
+        escolhidos = []
+        cobertura = np.zeros(self.total_alvos, dtype=np.int32)
+        self.completar(rng, escolhidos, cobertura)
+        self.podar(rng, escolhidos, cobertura)
+        melhor = self.busca_local(rng, escolhidos, cobertura)
+        return self.jogos[np.sort(melhor)]
+
+    def verificar(self, posicoes, tamanho_bloco=2048):
+        """
+        Confere a garantia sem as tabelas de incidência: cada subconjunto de
+        `garantia` números do grupo precisa estar contido (AND das máscaras)
+        em pelo menos um jogo.
+        """
+        jogos = para_mascaras_posicoes(posicoes)
+        alvos = para_mascaras_posicoes(combinacoes(self.k, self.garantia))
+        for i in range(0, len(alvos), tamanho_bloco):
+            bloco = alvos[i:i + tamanho_bloco, None]
+            if not ((bloco & jogos[None, :]) == bloco).any(axis=1).all():
+                return False
+        return True
+
+    def executar(self):
+        """
+        Roda as tentativas e retorna um dicionário com:
+            jogos: lista dos jogos (números de 1 a 60) da menor cobertura
+            tamanhos: quantidade de jogos de cada tentativa
+            limite_inferior: limite de Schönheim (nenhuma cobertura é menor)
+            garantia_verificada: resultado de verificar() para a menor cobertura
+            segundos, semente
+        """
+        sementes = self.sementes.spawn(self.tentativas)
+        inicio = time.perf_counter()
+        if self.processos > 1 and self.tentativas > 1:
+            with ProcessPoolExecutor(max_workers=self.processos, initializer=_iniciar_processo,
+                                     initargs=(self,)) as executor:
+                resultados = list(executor.map(_resolver, sementes))
+        else:
+            resultados = [self.resolver(semente) for semente in sementes]
+        segundos = time.perf_counter() - inicio
+
+        melhor = min(resultados, key=len)
+        numeros = np.array(self.numeros)
+        return {
+            'jogos': numeros[melhor].tolist(),
+            'tamanhos': [len(resultado) for resultado in resultados],
+            'limite_inferior': limite_schonheim(self.k, self.garantia),
+            'garantia_verificada': self.verificar(melhor),
+            'segundos': segundos,
+            'semente': self.sementes.entropy,
+        }
+
+
+# Desdobramento de cada processo do pool (preenchido por _iniciar_processo)
+_processo = {}
+
+
+def _iniciar_processo(desdobramento):
+    _processo['desdobramento'] = desdobramento
+
+
+def _resolver(semente):
+    return _processo['desdobramento'].resolver(semente)
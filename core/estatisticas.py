@@ -0,0 +1,241 @@
+import numpy as np
+
+# Faixa (em relação à frequência esperada) que separa números de ouro, comuns e ruins
+FAIXA_OURO = 0.2
+
+
+def pesos_decaimento(total_sorteios, meia_vida):
+    """
+    Peso 0.5^(idade / meia_vida) de cada sorteio, em ordem de concurso
+    (o mais recente tem idade 0 e peso 1).
+    """
+    if not meia_vida > 0:
+        raise ValueError(f"A meia-vida deve ser maior que zero (recebeu {meia_vida}).")
+    idades = np.arange(total_sorteios - 1, -1, -1)
+    return 0.5 ** (idades / meia_vida)
+
+
+class EstatisticasFrequencia():
+    """
+    Núcleo estatístico baseado em NumPy.
+    Guarda o vetor de frequências dos 60 números (posição 0 = número 1) e
+    calcula de uma só vez frequência esperada, diferenças, classificação em
+    ouro/comuns/ruins e o teste qui-quadrado.
+    """
+
+    def __init__(self, frequencias, total_sorteios):
+        """
+        Args:
+            frequencias: Vetor com 60 posições (frequência de cada número de 1 a 60)
+            total_sorteios: Quantidade de sorteios que gerou as frequências
+        """
+        self.frequencias = np.asarray(frequencias)
+        self.total_sorteios = total_sorteios
+
+        # Frequência esperada por número (6 números por sorteio)
+        self.freq_esperada = (6 * total_sorteios) / 60
+        self.diferencas = self.frequencias - self.freq_esperada
+        if total_sorteios > 0:
+            self.percentuais = self.frequencias / total_sorteios * 100
+        else:
+            self.percentuais = np.zeros(60)
+
+        # Números ordenados da maior para a menor frequência (empates pelo menor número)
+        self.ordem = np.argsort(-self.frequencias, kind='stable') + 1
+
+        limite = self.freq_esperada * FAIXA_OURO
+        self.mascara_ouro = self.diferencas > limite
+        self.mascara_ruins = self.diferencas < -limite
+        self.mascara_comuns = ~(self.mascara_ouro | self.mascara_ruins)
+
+        # Resultado do qui-quadrado, calculado sob demanda (ou vindo do cache)
+        self.resultado_qui_quadrado = None
+
+    @classmethod
+    def de_dezenas(cls, dezenas):
+        """
+        Cria as estatísticas a partir do array (n x 6) de dezenas sorteadas.
+        """
+        dezenas = np.asarray(dezenas)
+        frequencias = np.bincount(dezenas.ravel(), minlength=61)[1:61]
+        return cls(frequencias, len(dezenas))
+
+    def frequencia(self, numero):
+        return self.frequencias[numero - 1]
+
+    def mais_comuns(self, n=None):
+        """
+        Retorna os n números mais frequentes (todos, se n for None).
+        """
+        return self.ordem[:n].tolist()
+
+    def scores(self, jogos):
+        """
+        Score (soma das frequências históricas) de cada jogo, calculado em lote.
+        `jogos` pode ser um único jogo ou uma sequência/array (n x 6).
+        """
+        jogos = np.asarray(jogos)
+        return self.frequencias[jogos - 1].sum(axis=-1)
+
+    def score_ideal(self):
+        """
+        Score teórico máximo: soma das frequências dos 6 números mais frequentes.
+        """
+        return self.frequencias[self.ordem[:6] - 1].sum()
+
+    def score_minimo(self, fracao=0.90):
+        """
+        Score mínimo aceito: `fracao` do score ideal (inteiro quando as
+        frequências são contagens, fracionário com decaimento).
+        """
+        score_ideal = self.score_ideal().item()
+        if isinstance(score_ideal, int):
+            return int(score_ideal * fracao)
+        return score_ideal * fracao
+
+    def classificar(self, mascara):
+        numeros = np.flatnonzero(mascara) + 1
+        return [
+            (int(num), self.frequencias[num - 1].item(), float(self.percentuais[num - 1]),
+             float(self.diferencas[num - 1]))
+            for num in numeros
+        ]
+
+    def numeros_ouro(self):
+        """
+        Lista (num, freq, percentual, diferença) dos números 20% acima da média,
+        do mais para o menos frequente.
+        """
+        numeros_ouro = self.classificar(self.mascara_ouro)
+        numeros_ouro.sort(key=lambda x: x[1], reverse=True)
+        return numeros_ouro
+
+    def numeros_comuns(self):
+        return self.classificar(self.mascara_comuns)
+
+    def numeros_ruins(self):
+        """
+        Lista (num, freq, percentual, diferença) dos números 20% abaixo da média,
+        do menos para o mais frequente.
+        """
+        numeros_ruins = self.classificar(self.mascara_ruins)
+        numeros_ruins.sort(key=lambda x: x[1])
+        return numeros_ruins
+
+    def qui_quadrado(self):
+        """
+        Teste qui-quadrado de uniformidade contra a frequência esperada.
+        Retorna (estatística, p-value, graus de liberdade).
+        """
+        if self.resultado_qui_quadrado is not None:
+            return self.resultado_qui_quadrado
+        if self.freq_esperada <= 0:
+            return 0.0, 1.0, 59
+        # Importado só aqui: scipy.special é bem mais leve que scipy.stats
+        from scipy.special import chdtrc
+
+        chi2_stat = float((self.diferencas ** 2 / self.freq_esperada).sum())
+        p_value = float(chdtrc(59, chi2_stat))
+        self.resultado_qui_quadrado = (chi2_stat, p_value, 59)
+        return self.resultado_qui_quadrado
+
+
+class HistoricoFrequencias():
+    """
+    Frequências do histórico por janela e com decaimento exponencial.
+
+    Guarda as contagens acumuladas (soma de prefixos) por sorteio: a linha t
+    tem quantas vezes cada número saiu nos t primeiros sorteios. Assim a
+    frequência de qualquer janela é a diferença entre duas linhas (O(60)), e
+    um sorteio novo acrescenta uma linha sem reprocessar o histórico.
+    """
+
+    def __init__(self, dezenas=None, meia_vida=None):
+        """
+        Args:
+            dezenas: Array (n x 6) com as dezenas sorteadas, em ordem de concurso
+            meia_vida: Meia-vida (em sorteios) do decaimento exponencial mantido
+                de forma incremental. None desativa o decaimento.
+        """
+        if meia_vida is not None and not meia_vida > 0:
+            raise ValueError(f"A meia-vida deve ser maior que zero (recebeu {meia_vida}).")
+        dezenas = np.zeros((0, 6), dtype=np.uint8) if dezenas is None else np.asarray(dezenas)
+        n = len(dezenas)
+
+        # Contagens acumuladas com folga para novos sorteios (capacidade dobra quando enche)
+        self.acumuladas = np.zeros((max(2 * n, 64) + 1, 60), dtype=np.int32)
+        indicadores = np.zeros((n, 60), dtype=np.int32)
+        indicadores[np.arange(n)[:, None], dezenas.astype(np.intp) - 1] = 1
+        np.cumsum(indicadores, axis=0, out=self.acumuladas[1:n + 1])
+        self.total_sorteios = n
+
+        self.meia_vida = meia_vida
+        self.decaidas = None
+        if meia_vida is not None:
+            self.decaidas = self.frequencias_decaidas(meia_vida, dezenas)
+
+    def adicionar(self, dezenas):
+        """
+        Acrescenta um sorteio (6 dezenas) ao histórico, atualizando as contagens
+        acumuladas e as frequências com decaimento.
+        """
+        if self.total_sorteios + 1 >= len(self.acumuladas):
+            maiores = np.zeros((2 * len(self.acumuladas), 60), dtype=np.int32)
+            maiores[:len(self.acumuladas)] = self.acumuladas
+            self.acumuladas = maiores
+
+        indicador = np.zeros(60, dtype=np.int32)
+        indicador[np.asarray(dezenas, dtype=np.intp) - 1] = 1
+        n = self.total_sorteios
+        self.acumuladas[n + 1] = self.acumuladas[n] + indicador
+        self.total_sorteios = n + 1
+
+        if self.decaidas is not None:
+            self.decaidas = self.decaidas * 0.5 ** (1 / self.meia_vida) + indicador
+
+    def janela(self, tamanho=None, fim=None):
+        """
+        Frequências dos `tamanho` sorteios que terminam no sorteio `fim`
+        (exclusivo; None = último). tamanho None usa o histórico inteiro até `fim`.
+        """
+        if tamanho is not None and tamanho < 1:
+            raise ValueError(f"A janela deve ter pelo menos 1 sorteio (recebeu {tamanho}).")
+        fim = self.total_sorteios if fim is None else fim
+        inicio = 0 if tamanho is None else max(0, fim - tamanho)
+        return self.acumuladas[fim] - self.acumuladas[inicio]
+
+    def janelas(self, tamanhos, fim=None):
+        """
+        Frequências de várias janelas de uma vez: array (len(tamanhos) x 60).
+        """
+        tamanhos = np.asarray(tamanhos)
+        if (tamanhos < 1).any():
+            raise ValueError(f"As janelas devem ter pelo menos 1 sorteio (recebeu {tamanhos.min()}).")
+        fim = self.total_sorteios if fim is None else fim
+        inicios = np.maximum(0, fim - tamanhos)
+        return self.acumuladas[fim] - self.acumuladas[inicios]
+
+    def frequencias_decaidas(self, meia_vida, dezenas):
+        """
+        Frequências com peso 0.5^(idade / meia_vida) para cada sorteio
+        (o mais recente tem peso 1), calculadas em lote com bincount.
+        """
+        dezenas = np.asarray(dezenas)
+        if len(dezenas) == 0:
+            return np.zeros(60)
+        pesos = np.repeat(pesos_decaimento(len(dezenas), meia_vida), 6)
+        return np.bincount(dezenas.ravel().astype(np.intp) - 1, weights=pesos, minlength=60)
+
+    def estatisticas(self, janela=None, decaimento=False):
+        """
+        EstatisticasFrequencia da janela pedida ou, com decaimento=True, das
+        frequências decaídas. No decaimento o total de sorteios é o total
+        efetivo (soma dos pesos), então o qui-quadrado é apenas aproximado.
+        """
+        if decaimento:
+            fator = 0.5 ** (1 / self.meia_vida)
+            total_efetivo = (1 - fator ** self.total_sorteios) / (1 - fator)
+            return EstatisticasFrequencia(self.decaidas, total_efetivo)
+
+        total = self.total_sorteios if janela is None else min(janela, self.total_sorteios)
+        return EstatisticasFrequencia(self.janela(janela), total)
@@ -1,83 +1,195 @@
 import json
 import os
-import time
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Counter
+from itertools import islice
+from math import comb
 
-import matplotlib.pyplot as plt
 import numpy as np
-import requests
-import urllib3
-from scipy import stats
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from core.armazenamento import (ARQUIVO_SORTEIOS, carregar_sorteios,
+                                converter_respostas, mesclar_sorteios,
+                                salvar_sorteios)
+from core.backtest import PREMIOS, Backtest, probabilidade_acertos
+from core.busca import BuscaExaustiva
+from core.cache import CacheAnalise, versao_dados
+from core.coocorrencia import IndiceCoocorrencia
+from core.desdobramento import Desdobramento
+from core.estatisticas import EstatisticasFrequencia, HistoricoFrequencias, pesos_decaimento
+from core.mascaras import ConjuntoMascaras, para_mascara
+from core.metricas import Metricas
+from core.monte_carlo import SimuladorMonteCarlo
+from core.saida import FORMATOS_STREAMING, EscritorJogos
+
+# Acima disso a saída em streaming não guarda os jogos no cache (a memória fica constante)
+LIMITE_JOGOS_CACHE = 10000
+
+
+def formatar_valor(valor, largura=0):
+    """
+    Formata frequências e scores: inteiros como estão, valores com decaimento
+    exponencial (float) com uma casa decimal.
+    """
+    if isinstance(valor, (float, np.floating)):
+        return f"{valor:{largura + 2}.1f}"
+    return f"{valor:{largura}d}"
+
 
 class Gerador():
     # Função para fazer uma solicitação GET ao endpoint e salvar a resposta
     def get_json(self, id, max_retries=20):
-        url = f"https://servicebus2.caixa.gov.br/portaldeloterias/api/megasena/{id}"
-        retries = 0
-        while retries < max_retries:
-            response = requests.get(url, verify=False)
-            # Verificar se a requisição foi bem-sucedida
-            if response.status_code == 200:
-                data = response.json()
-                print(f"Sucesso na requisição para o ID {id}.")
-                return id, data
-            else:
-                print(f"Erro na requisição do ID {id}: {response.status_code}. Tentando novamente...")
-                retries += 1
-                time.sleep(1)  # Pausa antes de tentar novamente
-        print(f"Falha após {max_retries} tentativas.")
-        return None
+        data = self.cliente.get_json(id, max_retries=max_retries)
+        if data is None:
+            return None
+        return id, data
 
     def check_repetitions(self, conjunto, conjuntos_frequentes, max_repetitions=2):
         """
         Verifica se um conjunto tem no máximo max_repetitions números em comum
         com qualquer conjunto já existente na lista.
+
+        `conjuntos_frequentes` pode ser uma lista de jogos ou um ConjuntoMascaras;
+        neste caso a comparação com todos os jogos é feita de uma só vez (popcount
+        sobre máscaras de 64 bits).
         """
+        mascara = para_mascara(conjunto)
+        if isinstance(conjuntos_frequentes, ConjuntoMascaras):
+            return conjuntos_frequentes.aceita(mascara, max_repetitions)
+
         for conjunto_frequente in conjuntos_frequentes:
             # Conta quantos números são comuns entre os dois conjuntos
-            numeros_comuns = len(set(conjunto) & set(conjunto_frequente))
+            numeros_comuns = (mascara & para_mascara(conjunto_frequente)).bit_count()
             if numeros_comuns > max_repetitions:
                 return False
         return True
 
-    def get_all_data(self):
+    def carregar_respostas(self):
+        """
+        Carrega as respostas já salvas em output.json.
+        Retorna um dicionário {id: dados} com os IDs convertidos para int.
+        """
+        if not os.path.exists('output.json'):
+            return {}
+
+        with open('output.json', 'r') as f:
+            return {int(id): item for id, item in json.load(f).items()}
+
+    def salvar_respostas(self, responses):
+        """
+        Salva as respostas brutas da API em output.json (arquivo opcional) de
+        forma atômica: escreve em um arquivo temporário e só então substitui o
+        arquivo original, para que uma interrupção no meio da escrita não
+        corrompa o histórico.
+        """
+        arquivo_temporario = 'output.json.tmp'
+        with open(arquivo_temporario, 'w') as f:
+            json.dump(responses, f)
+        os.replace(arquivo_temporario, 'output.json')
+
+    def carregar_existentes(self):
+        """
+        Retorna os sorteios já salvos: o armazenamento binário, se existir, ou
+        então o conteúdo de output.json convertido (migração de instalações antigas).
+        """
+        if os.path.exists(ARQUIVO_SORTEIOS):
+            return np.array(carregar_sorteios(ARQUIVO_SORTEIOS))
+        return converter_respostas(self.carregar_respostas())
+
+    def get_all_data(self, incremental=True):
+        """
+        Sincroniza os sorteios com a API e atualiza o armazenamento binário (sorteios.npy).
+
+        Args:
+            incremental: Se True, reaproveita os concursos já salvos e baixa apenas
+                os que faltam (novos concursos e lacunas deixadas por falhas
+                anteriores). Se False, baixa todo o histórico novamente.
+
+        O download usa o motor definido em self.engine: 'threads' (pool de threads
+        chamando get_json) ou 'async' (loop asyncio com conexões keep-alive).
+        Se self.manter_json for True, as respostas completas da API também são
+        arquivadas em output.json.
+        """
         # Crie uma lista para armazenar todos os threads
         self.threads = []
 
-        # Crie um dicionário para armazenar as respostas
+        # Reaproveita os sorteios já salvos (modo incremental)
+        existentes = self.carregar_existentes() if incremental else converter_respostas({})
+        ultimo_salvo = int(existentes['concurso'].max()) if len(existentes) else 0
+        ids_salvos = set(existentes['concurso'].tolist())
+
+        # Com o arquivo JSON ativo, concursos ausentes do arquivo também são baixados
+        arquivo_json = self.carregar_respostas() if incremental and self.manter_json else {}
+        if self.manter_json:
+            ids_salvos &= {id for id, item in arquivo_json.items() if 'listaDezenas' in item}
+
+        # Crie um dicionário para armazenar as respostas novas
         self.responses = {}
 
         # Obter o último id
-        url = "https://servicebus2.caixa.gov.br/portaldeloterias/api/megasena/"
-        data = requests.get(url, verify=False).json()
+        data = self.cliente.get_json('')
+        if data is None:
+            raise RuntimeError("Não foi possível obter o último concurso da API.")
         self.last_id = data['numero']
         self.responses[self.last_id] = data
 
-        # Crie um pool de threads e faça cada thread executar a função get_json
-        with ThreadPoolExecutor() as executor:
-            future_to_id = {executor.submit(self.get_json, id): id for id in range(1, self.last_id)}
-            for future in as_completed(future_to_id):
-                data = future.result()
-                if data is not None:
-                    self.responses[data[0]] = data[1]
+        # Concursos que ainda não estão salvos
+        ids_faltantes = [id for id in range(1, self.last_id) if id not in ids_salvos]
+
+        if incremental:
+            print(f"Sincronização incremental: último concurso salvo {ultimo_salvo}, "
+                  f"último disponível {self.last_id}, {len(ids_faltantes)} concursos a baixar.")
+
+        with self.metricas.etapa('download'):
+            self.baixar(ids_faltantes)
+        if ids_faltantes:
+            baixados = len(self.responses) - 1
+            print(f"Download concluído: {baixados} de {len(ids_faltantes)} concursos baixados.")
 
-        # Ordenar as respostas por ID
-        self.responses = dict(sorted(self.responses.items()))
+        # Junta os sorteios novos aos já salvos e grava o armazenamento binário
+        with self.metricas.etapa('armazenamento'):
+            sorteios = mesclar_sorteios(existentes, converter_respostas(self.responses))
+            salvar_sorteios(sorteios, ARQUIVO_SORTEIOS)
 
-        # Salve as respostas em um arquivo JSON
-        with open('output.json', 'w') as f:
-            json.dump(self.responses, f, indent=4)  # Adicionado indentação aqui
+        # Arquivo opcional com as respostas completas da API
+        if self.manter_json:
+            arquivo_json.update(self.responses)
+            self.salvar_respostas(dict(sorted(arquivo_json.items())))
 
-    def gerar_combinacao_otimizada(self, numeros, counter, quantidade=5):
+    def baixar(self, ids_faltantes):
+        """
+        Baixa os concursos faltantes com o motor configurado e guarda as
+        respostas em self.responses.
+        """
+        if ids_faltantes and self.engine == 'async':
+            # Importado só aqui: aiohttp é necessário apenas para o motor asyncio
+            from core.cliente_async import ClienteHTTPAsync
+
+            cliente_async = ClienteHTTPAsync(
+                url_base=self.cliente.url_base,
+                concorrencia=self.cliente.concorrencia,
+                requisicoes_por_segundo=self.cliente.limitador.taxa,
+                timeout=self.cliente.timeout,
+                metricas=self.metricas,
+            )
+            self.responses.update(cliente_async.baixar(ids_faltantes))
+
+        # Crie um pool de threads e faça cada thread executar a função get_json
+        elif ids_faltantes:
+            with ThreadPoolExecutor(max_workers=self.cliente.concorrencia) as executor:
+                future_to_id = {executor.submit(self.get_json, id): id for id in ids_faltantes}
+                for future in as_completed(future_to_id):
+                    data = future.result()
+                    if data is not None:
+                        self.responses[data[0]] = data[1]
+
+    def gerar_combinacao_otimizada(self, numeros, estatisticas, quantidade=5):
         """
         Gera combinações otimizadas usando estratégia baseada em frequências.
         Prioriza números com maior frequência histórica.
         """
         conjuntos = []
-        numeros_ordenados = sorted(numeros, key=lambda x: counter[x], reverse=True)
+        mascaras = ConjuntoMascaras()
+        numeros_ordenados = sorted(numeros, key=estatisticas.frequencia, reverse=True)
 
         # Estratégia simplificada para evitar loops infinitos
         max_tentativas = min(quantidade * 2, 30)  # Limita tentativas
@@ -122,96 +234,99 @@ class Gerador():
 
             # Verifica se é válido e diversificado (com restrição mais flexível)
             max_repetitions = 4 if len(conjuntos) > quantidade // 2 else 3
-            if len(conjunto) == 6 and self.check_repetitions(conjunto, conjuntos, max_repetitions=max_repetitions):
+            if len(conjunto) == 6 and self.check_repetitions(conjunto, mascaras, max_repetitions=max_repetitions):
                 conjuntos.append(tuple(conjunto))
+                mascaras.adicionar(para_mascara(conjunto))
+
+        return conjuntos
+
+    def gerar_combinacao_afinidade(self, numeros, estatisticas, coocorrencia, quantidade=5):
+        """
+        Gera combinações pela afinidade entre os números: parte dos pares de
+        `numeros` que mais saíram juntos e completa cada jogo, um número por vez,
+        com o que mais saiu junto dos já escolhidos (empates pela frequência).
+        """
+        numeros = np.array(sorted(numeros, key=estatisticas.frequencia, reverse=True))
+        if len(numeros) < 6:
+            return []
+        indices = numeros - 1
+        pares = coocorrencia.pares[np.ix_(indices, indices)].astype(np.float64)
+        # Desempate pela frequência: sempre menor que uma co-ocorrência
+        frequencias = estatisticas.frequencias[indices]
+        desempate = frequencias / (estatisticas.frequencias.max() + 1)
+
+        conjuntos = []
+        mascaras = ConjuntoMascaras()
+        primeiros, segundos = np.triu_indices(len(numeros), 1)
+        ordem = np.argsort(-pares[primeiros, segundos], kind='stable')
+        max_tentativas = quantidade * 4
+
+        for k in ordem[:max_tentativas].tolist():
+            if len(conjuntos) >= quantidade:
+                break
+
+            # A diagonal (frequência) dos escolhidos é descartada com -inf
+            escolhidos = [primeiros[k], segundos[k]]
+            ganho = pares[escolhidos].sum(axis=0) + desempate
+            ganho[escolhidos] = -np.inf
+            while len(escolhidos) < 6:
+                proximo = int(np.argmax(ganho))
+                escolhidos.append(proximo)
+                ganho += pares[proximo]
+                ganho[proximo] = -np.inf
+
+            conjunto = tuple(sorted(numeros[escolhidos].tolist()))
+            max_repetitions = 4 if len(conjuntos) > quantidade // 2 else 3
+            if self.check_repetitions(conjunto, mascaras, max_repetitions=max_repetitions):
+                conjuntos.append(conjunto)
+                mascaras.adicionar(para_mascara(conjunto))
 
         return conjuntos
 
-    def gerar_grafico_frequencias(self, counter, total_sorteios, freq_esperada, numeros_ouro):
+    def gerar_grafico_frequencias(self, estatisticas, numeros_ouro, arquivo=None, titulo=None):
         """
         Gera um gráfico de barras mostrando a frequência de cada número.
+        Usa o modelo reutilizável de core.grafico e não renderiza de novo se
+        o gráfico salvo já corresponde às mesmas frequências.
         """
-        # Preparar dados
-        numeros = list(range(1, 61))
-        frequencias = [counter.get(num, 0) for num in numeros]
-
-        # Identificar números de ouro
-        nums_ouro = {num for num, _, _, _ in numeros_ouro}
-
-        # Criar figura com tamanho maior
-        plt.figure(figsize=(16, 8))
-
-        # Criar cores: dourado para números de ouro, azul para os demais
-        cores = ['#FFD700' if num in nums_ouro else '#4A90E2' for num in numeros]
-
-        # Criar gráfico de barras
-        bars = plt.bar(numeros, frequencias, color=cores, alpha=0.8, edgecolor='black', linewidth=0.5)
-
-        # Adicionar linha da média esperada
-        plt.axhline(y=freq_esperada, color='red', linestyle='--', linewidth=2,
-                   label=f'Média Esperada ({freq_esperada:.1f})', alpha=0.7)
-
-        # Personalizar gráfico
-        plt.xlabel('Números (1-60)', fontsize=12, fontweight='bold')
-        plt.ylabel('Frequência (Quantas vezes apareceu)', fontsize=12, fontweight='bold')
-        plt.title(f'Frequência de Aparição dos Números na Mega Sena\n'
-                 f'({total_sorteios} sorteios analisados)',
-                 fontsize=14, fontweight='bold', pad=20)
-        plt.grid(axis='y', alpha=0.3, linestyle=':')
-
-        # Ajustar eixos
-        plt.xlim(0, 61)
-        plt.xticks(range(1, 61, 2), rotation=45, ha='right')  # Mostrar números ímpares para não ficar muito cheio
-
-        # Adicionar anotações para os top números
-        top_5 = counter.most_common(5)
-        for num, freq in top_5:
-            plt.annotate(f'{freq}',
-                        xy=(num, freq),
-                        xytext=(num, freq + max(frequencias) * 0.02),
-                        ha='center', va='bottom',
-                        fontsize=8, fontweight='bold',
-                        bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7))
-
-        # Adicionar legenda de cores
-        from matplotlib.patches import Patch
-        from matplotlib.lines import Line2D
-        legend_elements = [
-            Patch(facecolor='#FFD700', edgecolor='black', label='Números de Ouro'),
-            Patch(facecolor='#4A90E2', edgecolor='black', label='Outros Números'),
-            Line2D([0], [0], color='red', linestyle='--', linewidth=2, label=f'Média Esperada ({freq_esperada:.1f})')
-        ]
-        plt.legend(handles=legend_elements, loc='upper right', fontsize=10)
-
-        # Ajustar layout
-        plt.tight_layout()
-
-        # Salvar gráfico
-        nome_arquivo = 'grafico_frequencias_mega_sena.png'
-        plt.savefig(nome_arquivo, dpi=300, bbox_inches='tight')
+        from core.grafico import ARQUIVO_GRAFICO, grafico_atualizado, impressao_digital, obter_modelo
+
+        nome_arquivo = arquivo or f"{ARQUIVO_GRAFICO}.{self.formato_grafico}"
+        # Conferido antes de obter_modelo(): com o gráfico em dia o matplotlib nem é carregado
+        digital = impressao_digital(estatisticas, numeros_ouro, titulo, self.dpi_grafico, self.formato_grafico)
+        if grafico_atualizado(nome_arquivo, digital):
+            print(f"\n📊 Gráfico já atualizado: {nome_arquivo}")
+            return
+
+        obter_modelo().renderizar(
+            estatisticas, numeros_ouro, nome_arquivo, dpi=self.dpi_grafico, formato=self.formato_grafico,
+            titulo=titulo
+        )
         print(f"\n📊 Gráfico salvo como: {nome_arquivo}")
 
-        # Mostrar gráfico (opcional - pode comentar se não quiser abrir automaticamente)
-        # plt.show()
-        plt.close()
+    def gerar_graficos_janelas(self, janelas):
+        """
+        Gera em lote um gráfico por janela (últimos N sorteios), reaproveitando
+        o mesmo modelo de figura e as contagens acumuladas do histórico.
+        """
+        from core.grafico import ARQUIVO_GRAFICO
+
+        historico = HistoricoFrequencias(carregar_sorteios(ARQUIVO_SORTEIOS)['dezenas'])
+        for tamanho in janelas:
+            estatisticas = historico.estatisticas(janela=tamanho)
+            self.gerar_grafico_frequencias(
+                estatisticas, estatisticas.numeros_ouro(),
+                arquivo=f"{ARQUIVO_GRAFICO}_janela_{tamanho}.{self.formato_grafico}",
+                titulo=f"Frequência de Aparição dos Números na Mega Sena\n"
+                       f"(últimos {estatisticas.total_sorteios} sorteios)",
+            )
 
-    def teste_uniformidade_qui_quadrado(self, counter, total_sorteios):
+    def teste_uniformidade_qui_quadrado(self, estatisticas):
         """
         Realiza teste qui-quadrado para verificar se a distribuição é uniforme.
         Retorna estatística do teste, p-value e conclusão.
         """
-        # Frequência esperada por número
-        freq_esperada = (6 * total_sorteios) / 60
-
-        # Frequências observadas para todos os números (1-60)
-        frequencias_observadas = [counter.get(num, 0) for num in range(1, 61)]
-        frequencias_esperadas = [freq_esperada] * 60
-
-        # Teste qui-quadrado
-        chi2_stat, p_value = stats.chisquare(frequencias_observadas, frequencias_esperadas)
-
-        # Graus de liberdade (60 números - 1)
-        df = 59
+        chi2_stat, p_value, df = estatisticas.qui_quadrado()
 
         # Interpretação
         alpha = 0.05  # Nível de significância de 5%
@@ -223,39 +338,348 @@ class Gerador():
             conclusao = "NÃO REJEITA uniformidade"
             interpretacao = "As diferenças podem ser explicadas por variação aleatória (p >= 0.05)."
 
-        return chi2_stat, p_value, df, conclusao, interpretacao, freq_esperada
+        return chi2_stat, p_value, df, conclusao, interpretacao, estatisticas.freq_esperada
 
-    def analisar_numeros_ouro(self, counter, total_sorteios):
+    def analisar_numeros_ouro(self, estatisticas):
         """
         Identifica os 'números de ouro' - números que aparecem com frequência
         significativamente acima da média esperada.
         """
-        # Frequência esperada por número (6 números por sorteio)
-        freq_esperada = (6 * total_sorteios) / 60
+        return (
+            estatisticas.numeros_ouro(),
+            estatisticas.numeros_comuns(),
+            estatisticas.numeros_ruins(),
+            estatisticas.freq_esperada,
+        )
+
+    def gerar_jogos_heuristica(self, estatisticas, numeros_ouro, quantidade_jogos, score_minimo,
+                               max_repeticoes=3, coocorrencia=None):
+        """
+        Estratégia heurística: gera candidatos com gerar_combinacao_otimizada a
+        partir dos números de ouro e dos top 25/30 e filtra por score e repetição.
+        Retorna a lista (jogo, score) ordenada por score.
+
+        Se `coocorrencia` for informado, os candidatos vêm de
+        gerar_combinacao_afinidade (pares que mais saíram juntos).
+        """
+        if coocorrencia is None:
+            gerar_combinacao = self.gerar_combinacao_otimizada
+        else:
+            def gerar_combinacao(numeros, estatisticas, quantidade):
+                return self.gerar_combinacao_afinidade(numeros, estatisticas, coocorrencia, quantidade)
+
+        # GERA COMBINAÇÕES (sem mostrar logs intermediários)
+        gerados = []
+
+        if numeros_ouro:
+            # Pegar os top números de ouro (ou top 20 se houver menos)
+            nums_ouro = [num for num, _, _, _ in numeros_ouro[:20]]
+            if len(nums_ouro) < 20:
+                # Completar com os mais frequentes em geral
+                mais_freq_geral = estatisticas.mais_comuns(20)
+                for num in mais_freq_geral:
+                    if num not in nums_ouro and len(nums_ouro) < 20:
+                        nums_ouro.append(num)
+
+            # Gera combinações com números de ouro
+            # Gera muito mais jogos para garantir que após os filtros tenhamos quantidade_jogos
+            # Multiplica por 4 para ter margem após filtros de qualidade (90%) e repetição
+            conjuntos_ouro = gerar_combinacao(
+                nums_ouro, estatisticas, quantidade=quantidade_jogos * 4
+            )
+            gerados.extend([sorted(c) for c in conjuntos_ouro])
+
+        # Gera combinações adicionais usando apenas números de alta frequência
+        # Usa top 25 números para garantir alta qualidade
+        mais_frequentes_nums = estatisticas.mais_comuns(25)
+        conjuntos_mais_freq = gerar_combinacao(
+            mais_frequentes_nums, estatisticas, quantidade=quantidade_jogos * 2
+        )
+        gerados.extend([sorted(c) for c in conjuntos_mais_freq])
+
+        # Combinações usando top números (sem misturar com menos frequentes)
+        # Foca apenas em números de alta qualidade
+        top_numeros = estatisticas.mais_comuns(30)
+        conjuntos_top = gerar_combinacao(
+            top_numeros, estatisticas, quantidade=quantidade_jogos * 2
+        )
+        gerados.extend([sorted(c) for c in conjuntos_top])
+
+        possivel_jogo = ConjuntoMascaras()
+        jogos_com_score = []
+        # Candidatos gerados e rejeitados (por score e por repetição), para as métricas
+        candidatos = len(gerados)
+        rejeitados_score = rejeitados_repeticao = 0
+
+        # Scores de todos os candidatos calculados em lote
+        scores = estatisticas.scores(gerados).tolist() if gerados else []
+        for conj, score in zip(gerados, scores):
+            # Só aceita jogos com score >= 90% do ideal
+            if score >= score_minimo:
+                if self.check_repetitions(conj, possivel_jogo, max_repetitions=max_repeticoes):
+                    possivel_jogo.adicionar(para_mascara(conj))
+                    jogos_com_score.append((conj, score))
+                else:
+                    rejeitados_repeticao += 1
+            else:
+                rejeitados_score += 1
+
+        # Se não temos jogos suficientes, gera mais usando apenas números de alta qualidade
+        if len(jogos_com_score) < quantidade_jogos:
+            # Usa apenas os top 30 números mais frequentes para garantir alta qualidade
+            numeros_alta_qualidade = estatisticas.mais_comuns(30)
+            tentativas_extra = 0
+            max_tentativas_extra = 20
+
+            while len(jogos_com_score) < quantidade_jogos and tentativas_extra < max_tentativas_extra:
+                # Gera mais combinações usando apenas números de alta qualidade
+                conjuntos_extra = gerar_combinacao(
+                    numeros_alta_qualidade, estatisticas, quantidade=(quantidade_jogos - len(jogos_com_score)) * 3
+                )
+
+                scores_extra = estatisticas.scores(conjuntos_extra).tolist() if conjuntos_extra else []
+                for conj, score in zip(conjuntos_extra, scores_extra):
+                    if len(jogos_com_score) >= quantidade_jogos:
+                        break
+                    candidatos += 1
+                    # Mantém o padrão de 90% do ideal
+                    if score >= score_minimo:
+                        if self.check_repetitions(conj, possivel_jogo, max_repetitions=max_repeticoes):
+                            possivel_jogo.adicionar(para_mascara(conj))
+                            jogos_com_score.append((conj, score))
+                        else:
+                            rejeitados_repeticao += 1
+                    else:
+                        rejeitados_score += 1
+
+                tentativas_extra += 1
+
+        estrategia = 'heuristica' if coocorrencia is None else 'afinidade'
+        self.metricas.incrementar('candidatos_gerados_total', candidatos, estrategia=estrategia)
+        self.metricas.incrementar('candidatos_rejeitados_total', rejeitados_score, estrategia=estrategia, motivo='score')
+        self.metricas.incrementar('candidatos_rejeitados_total', rejeitados_repeticao, estrategia=estrategia,
+                                  motivo='repeticao')
+
+        # Ordena por score (maior primeiro)
+        jogos_com_score.sort(key=lambda x: x[1], reverse=True)
+
+        return jogos_com_score
+
+    def gerar_jogos_exaustiva(self, estatisticas, quantidade_jogos, score_minimo,
+                              max_repeticoes=3, processos=1):
+        """
+        Estratégia exaustiva: os `quantidade_jogos` jogos de maior score entre
+        todas as combinações possíveis, com no máximo `max_repeticoes` números em
+        comum entre si e score >= score_minimo. Com processos > 1 a enumeração é
+        dividida entre vários processos. Retorna a lista (jogo, score) ordenada por score.
+        """
+        return list(self.iterar_jogos_exaustiva(
+            estatisticas, quantidade_jogos, score_minimo, max_repeticoes, processos
+        ))
+
+    def iterar_jogos_exaustiva(self, estatisticas, quantidade_jogos, score_minimo,
+                               max_repeticoes=3, processos=1):
+        """
+        Versão geradora de gerar_jogos_exaustiva: entrega cada (jogo, score)
+        assim que ele é aceito, sem acumular a lista.
+        """
+        busca = BuscaExaustiva(estatisticas.frequencias, max_repeticoes=max_repeticoes, processos=processos)
+        try:
+            for jogo, score in islice(busca.iterar(score_minimo), quantidade_jogos):
+                yield list(jogo), score
+            if busca.interrompida:
+                print(f"\n⚠️  Busca exaustiva interrompida após {busca.enumeradas:,} combinações: com no máximo "
+                      f"{max_repeticoes} números em comum quase todas conflitam com os jogos já escolhidos.")
+        finally:
+            # Na busca exaustiva nenhum candidato abaixo do score mínimo chega a ser gerado
+            self.metricas.incrementar('candidatos_gerados_total', busca.candidatos, estrategia='exaustiva')
+            self.metricas.incrementar('candidatos_rejeitados_total', busca.rejeitados_repeticao,
+                                      estrategia='exaustiva', motivo='repeticao')
+
+    def obter_cache(self, chave):
+        if self.cache is None or not chave:
+            return None
+        return self.cache.obter(chave)
+
+    def guardar_cache(self, chave, valor):
+        if self.cache is not None and chave:
+            self.cache.guardar(chave, valor)
+
+    def obter_jogos_cache(self, chave):
+        """
+        Jogos (jogo, score) guardados no cache, ordenados por score (maior
+        primeiro), ou None. O relatório e a saída em streaming compartilham a
+        mesma entrada, então a ordem não depende de quem a guardou.
+        """
+        jogos = self.obter_cache(chave)
+        if jogos is None:
+            return None
+        return sorted(((jogo, score) for jogo, score in jogos), key=lambda x: x[1], reverse=True)
+
+    def carregar_estatisticas(self, versao=None, janela=None, meia_vida=None):
+        """
+        Retorna as estatísticas de frequência do histórico salvo, usando o cache
+        quando a versão dos dados já foi analisada. Retorna None se não houver sorteios.
+
+        Args:
+            versao: Versão dos dados (chave do cache; None não usa o cache)
+            janela: Se informado, considera apenas os últimos `janela` sorteios
+            meia_vida: Se informado, pondera os sorteios por decaimento exponencial
+                com essa meia-vida (em sorteios); o mais recente tem peso 1
+        """
+        # Sem a versão, uma entrada do cache não teria como ser invalidada
+        chave = self.cache and versao and self.cache.chave('estatisticas', versao, janela=janela,
+                                                            meia_vida=meia_vida)
+        dados = self.obter_cache(chave)
+        if dados is not None:
+            estatisticas = EstatisticasFrequencia(dados['frequencias'], dados['total_sorteios'])
+            estatisticas.resultado_qui_quadrado = tuple(dados['qui_quadrado'])
+            return estatisticas
+
+        # Abrir o armazenamento binário (memory mapping, sem parsing)
+        sorteios = carregar_sorteios(ARQUIVO_SORTEIOS)
+        if len(sorteios) == 0:
+            return None
+
+        if janela is None and meia_vida is None:
+            # Contar as ocorrências dos números (bincount sobre o array n x 6)
+            estatisticas = EstatisticasFrequencia.de_dezenas(sorteios['dezenas'])
+        else:
+            historico = HistoricoFrequencias(sorteios['dezenas'], meia_vida=meia_vida)
+            estatisticas = historico.estatisticas(janela=janela, decaimento=meia_vida is not None)
+        self.guardar_cache(chave, {
+            'frequencias': estatisticas.frequencias.tolist(),
+            'total_sorteios': estatisticas.total_sorteios,
+            'qui_quadrado': list(estatisticas.qui_quadrado()),
+        })
+        return estatisticas
+
+    def carregar_coocorrencia(self, janela=None):
+        """
+        Índice de co-ocorrência de pares e trios dos sorteios salvos (ou dos
+        últimos `janela` sorteios).
+        """
+        dezenas = carregar_sorteios(ARQUIVO_SORTEIOS)['dezenas']
+        if janela is not None:
+            dezenas = dezenas[-janela:]
+        return IndiceCoocorrencia(dezenas)
+
+    def mostrar_jogos(self, estatisticas, numeros_ouro, quantidade_jogos, score_ideal, score_minimo,
+                      estrategia, max_repeticoes, processos, chave_jogos=None, coocorrencia=None):
+        """
+        Relatório legível: gera todos os jogos, ordena por score e imprime.
+        Com `coocorrencia`, mostra também a afinidade (pares) de cada jogo.
+        """
+        jogos_com_score = self.obter_jogos_cache(chave_jogos)
+        if jogos_com_score is None:
+            if estrategia in ('heuristica', 'afinidade'):
+                jogos_com_score = self.gerar_jogos_heuristica(
+                    estatisticas, numeros_ouro, quantidade_jogos, score_minimo, max_repeticoes,
+                    coocorrencia=coocorrencia
+                )
+            else:
+                jogos_com_score = self.gerar_jogos_exaustiva(
+                    estatisticas, quantidade_jogos, score_minimo, max_repeticoes, processos
+                )
+            self.guardar_cache(chave_jogos, jogos_com_score[:quantidade_jogos])
+
+        # Mostra até a quantidade desejada
+        jogos_para_mostrar = min(len(jogos_com_score), quantidade_jogos)
 
-        numeros_ouro = []
-        numeros_comuns = []
-        numeros_ruins = []
+        if jogos_com_score:
+            for i, (conjunto, score) in enumerate(jogos_com_score[:jogos_para_mostrar], 1):
+                percentual_ideal = (score / score_ideal * 100) if score_ideal > 0 else 0
+                linha = f"Jogo {i:2d}: {sorted(conjunto)} | Score: {formatar_valor(score)} ({percentual_ideal:.1f}% do ideal)"
+                if coocorrencia is not None:
+                    linha += f" | Afinidade: {coocorrencia.afinidades(conjunto)}"
+                print(linha)
 
-        for num in range(1, 61):  # Mega Sena vai de 1 a 60
-            freq_real = counter.get(num, 0)
-            diferenca = freq_real - freq_esperada
-            percentual = (freq_real / total_sorteios * 100) if total_sorteios > 0 else 0
+            if len(jogos_com_score) < quantidade_jogos:
+                print(f"\n⚠️  Apenas {len(jogos_com_score)} jogos com score >= 90% foram gerados")
+                print(f"   (requisito: score >= {score_minimo}). Tente reduzir a quantidade solicitada.")
+        else:
+            print(f"Nenhum jogo gerado com score >= {score_minimo} (90% do ideal) após filtragem.")
 
-            if diferenca > freq_esperada * 0.2:  # 20% acima da média
-                numeros_ouro.append((num, freq_real, percentual, diferenca))
-            elif diferenca < -freq_esperada * 0.2:  # 20% abaixo da média
-                numeros_ruins.append((num, freq_real, percentual, diferenca))
+    def escrever_jogos(self, estatisticas, numeros_ouro, quantidade_jogos, score_ideal, score_minimo,
+                       estrategia, max_repeticoes, processos, formato_saida, arquivo_saida, chave_jogos=None,
+                       coocorrencia=None):
+        """
+        Saída em streaming: na estratégia exaustiva, cada jogo é escrito em
+        JSONL/CSV assim que passa nos filtros de score e repetição, sem acumular
+        a lista de jogos. Na heurística e na afinidade os candidatos são gerados
+        antes e os `quantidade_jogos` de maior score são escritos em seguida,
+        para que a saída tenha os mesmos jogos do relatório.
+        Pedidos de até LIMITE_JOGOS_CACHE jogos também são guardados no cache.
+        """
+        em_cache = self.obter_jogos_cache(chave_jogos)
+        coletados = [] if chave_jogos and quantidade_jogos <= LIMITE_JOGOS_CACHE else None
+
+        with EscritorJogos(formato_saida, arquivo_saida) as escritor:
+            def ao_aceitar(jogo, score):
+                escritor.escrever(jogo, score, score_ideal)
+                if coletados is not None:
+                    coletados.append((jogo, score))
+
+            if em_cache is not None:
+                coletados = None
+                for jogo, score in em_cache:
+                    ao_aceitar(jogo, score)
+            elif estrategia in ('heuristica', 'afinidade'):
+                # Só depois de gerar todos os candidatos se sabe quais são os de maior score
+                for jogo, score in self.gerar_jogos_heuristica(
+                    estatisticas, numeros_ouro, quantidade_jogos, score_minimo, max_repeticoes,
+                    coocorrencia=coocorrencia
+                )[:quantidade_jogos]:
+                    ao_aceitar(jogo, score)
             else:
-                numeros_comuns.append((num, freq_real, percentual, diferenca))
+                for jogo, score in self.iterar_jogos_exaustiva(
+                    estatisticas, quantidade_jogos, score_minimo, max_repeticoes, processos
+                ):
+                    ao_aceitar(jogo, score)
+
+        if coletados is not None:
+            self.guardar_cache(chave_jogos, coletados)
 
-        # Ordenar por frequência
-        numeros_ouro.sort(key=lambda x: x[1], reverse=True)
-        numeros_ruins.sort(key=lambda x: x[1])
+        print(f"{escritor.total} jogos escritos em formato {formato_saida}.")
+        if escritor.total < quantidade_jogos:
+            print(f"\n⚠️  Apenas {escritor.total} jogos com score >= 90% foram gerados")
+            print(f"   (requisito: score >= {score_minimo}). Tente reduzir a quantidade solicitada.")
 
-        return numeros_ouro, numeros_comuns, numeros_ruins, freq_esperada
+    def testar_monte_carlo(self, versao=None, simulacoes=10000, janela=None, meia_vida=None, processos=1,
+                           semente=None):
+        """
+        Testes de significância por Monte Carlo (qui-quadrado, números e pares
+        extremos) sobre os mesmos sorteios e pesos da análise. O resultado vai
+        para o cache junto com a semente, para ser reproduzível.
 
-    def run_generator(self, quantidade_jogos=10):
+        Args:
+            versao: Versão dos dados (chave do cache; None não usa o cache)
+            simulacoes: Quantidade de históricos simulados
+            janela: Considera apenas os últimos `janela` sorteios
+            meia_vida: Pondera os sorteios por decaimento exponencial
+            processos: Processos usados na simulação
+            semente: Semente do gerador aleatório
+        """
+        chave = self.cache and versao and self.cache.chave(
+            'monte_carlo', versao, simulacoes=simulacoes, janela=janela, meia_vida=meia_vida, semente=semente
+        )
+        resultado = self.obter_cache(chave)
+        if resultado is not None:
+            return resultado
+
+        dezenas = carregar_sorteios(ARQUIVO_SORTEIOS)['dezenas']
+        if janela is not None:
+            dezenas = dezenas[-janela:]
+        pesos = pesos_decaimento(len(dezenas), meia_vida) if meia_vida is not None else None
+
+        simulador = SimuladorMonteCarlo(dezenas, pesos, simulacoes, processos, semente)
+        resultado = simulador.executar()
+        self.guardar_cache(chave, resultado)
+        return resultado
+
+    def run_generator(self, quantidade_jogos=10, estrategia='exaustiva', max_repeticoes=3, processos=1,
+                      formato_saida='relatorio', arquivo_saida=None, grafico='agora', janela=None,
+                      meia_vida=None, monte_carlo=0, semente=None):
         """
         IMPORTANTE SOBRE PROBABILIDADE:
 
@@ -272,35 +696,56 @@ class Gerador():
 
         Cada combinação de 6 números tem exatamente a mesma probabilidade:
         1 em 50.063.860 (independente de quais números você escolher).
+
+        Args:
+            quantidade_jogos: Quantidade de jogos a serem gerados
+            estrategia: 'exaustiva' (melhores jogos entre todas as combinações),
+                'heuristica' (combinações geradas por gerar_combinacao_otimizada) ou
+                'afinidade' (combinações geradas por gerar_combinacao_afinidade)
+            max_repeticoes: Máximo de números em comum entre dois jogos gerados
+            processos: Processos usados pela estratégia exaustiva (lotes grandes de jogos)
+            formato_saida: 'relatorio' (texto legível ao final) ou 'jsonl'/'csv'
+                (cada jogo escrito assim que é aceito)
+            arquivo_saida: Destino da saída em streaming (caminho, arquivo aberto
+                ou None para a saída padrão)
+            grafico: 'agora' (gera o gráfico ao final), 'depois' (gera em segundo
+                plano, sem atrasar a exibição dos jogos) ou 'nunca'
+            janela: Analisa apenas os últimos `janela` sorteios (None = histórico inteiro)
+            meia_vida: Pondera os sorteios por decaimento exponencial com esta
+                meia-vida, em sorteios (None = todos com o mesmo peso)
+            monte_carlo: Quantidade de históricos simulados para os p-values
+                empíricos (0 = apenas o qui-quadrado assintótico)
+            semente: Semente da simulação de Monte Carlo
         """
-        # Carregar o arquivo JSON
-        with open('output.json', 'r') as f:
-            data = json.load(f)
-
-        # Contar as ocorrências dos números
-        counter = Counter()
-        for id, item in data.items():
-            if 'listaDezenas' in item:
-                # Converter strings para inteiros
-                dezenas = [int(d) for d in item['listaDezenas']]
-                counter.update(dezenas)
-            else:
-                print(f'O item com ID {id} não possui "listaDezenas".')
+        # Versão dos dados: as entradas do cache só valem para este histórico
+        versao = versao_dados(ARQUIVO_SORTEIOS) if self.cache is not None else None
 
-        if not counter:
+        with self.metricas.etapa('estatisticas'):
+            estatisticas = self.carregar_estatisticas(versao, janela, meia_vida)
+        if estatisticas is None:
             print("Erro: Nenhum dado encontrado para análise.")
             return
 
-        total_sorteios = len(data)
+        total_sorteios = estatisticas.total_sorteios
+        # 'top_jogos': as entradas antigas ('jogos') da saída em streaming podiam
+        # ter os primeiros jogos aceitos em vez dos de maior score
+        chave_jogos = self.cache and self.cache.chave(
+            'top_jogos', versao,
+            janela=janela,
+            meia_vida=meia_vida,
+            quantidade_jogos=quantidade_jogos,
+            estrategia=estrategia,
+            max_repeticoes=max_repeticoes,
+        )
 
         # Análise dos números de ouro
         numeros_ouro, numeros_comuns, numeros_ruins, freq_esperada = self.analisar_numeros_ouro(
-            counter, total_sorteios
+            estatisticas
         )
 
         # ANÁLISE ESTATÍSTICA RIGOROSA (resumida)
         chi2_stat, p_value, df, conclusao, interpretacao, _ = self.teste_uniformidade_qui_quadrado(
-            counter, total_sorteios
+            estatisticas
         )
 
         print("\n" + "="*70)
@@ -313,6 +758,17 @@ class Gerador():
         else:
             print("✅ Sem viés detectado. Diferenças podem ser apenas aleatórias.")
 
+        p_acima = None
+        if monte_carlo > 0:
+            with self.metricas.etapa('monte_carlo'):
+                resultado = self.testar_monte_carlo(versao, monte_carlo, janela, meia_vida, processos, semente)
+            p_acima = resultado['p_acima']
+            conclusao_mc = "REJEITA uniformidade" if resultado['p_qui_quadrado'] < 0.05 else "NÃO REJEITA uniformidade"
+            print(f"Monte Carlo ({resultado['simulacoes']} simulações, semente {resultado['semente']}): "
+                  f"P-value empírico: {resultado['p_qui_quadrado']:.6f} | {conclusao_mc}")
+            a, b, contagem, p_par = resultado['pares'][0]
+            print(f"Par mais frequente: {a:2d} e {b:2d} ({formatar_valor(contagem)} vezes) | P-value empírico: {p_par:.4f}")
+
         # Vetor de gerados
         gerados = []
 
@@ -320,138 +776,312 @@ class Gerador():
         print("\n" + "="*70)
         print("🌟 NÚMEROS DE OURO")
         print("="*70)
-        print(f"Total de sorteios analisados: {total_sorteios}")
+        if janela is not None:
+            print(f"Janela: últimos {janela} sorteios")
+        elif meia_vida is not None:
+            print(f"Decaimento exponencial: meia-vida de {meia_vida} sorteios")
+        print(f"Total de sorteios analisados: {formatar_valor(total_sorteios)}")
 
         if numeros_ouro:
             print(f"\nTop 10 números mais frequentes:")
             for num, freq, percent, diff in numeros_ouro[:10]:
-                print(f"  {num:2d}: {freq:3d} vezes ({percent:5.2f}%) | +{diff:+.1f} acima da média")
+                linha = f"  {num:2d}: {formatar_valor(freq, 3)} vezes ({percent:5.2f}%) | +{diff:+.1f} acima da média"
+                if p_acima is not None:
+                    linha += f" | p = {p_acima[num - 1]:.4f}"
+                print(linha)
         else:
             # Se não há números de ouro, mostra os top frequentes
-            top_freq = counter.most_common(10)
+            top_freq = [(num, estatisticas.frequencia(num)) for num in estatisticas.mais_comuns(10)]
             print(f"\nTop 10 números mais frequentes:")
             for num, freq in top_freq:
                 percent = (freq / total_sorteios * 100) if total_sorteios > 0 else 0
                 diff = freq - freq_esperada
-                print(f"  {num:2d}: {freq:3d} vezes ({percent:5.2f}%) | {diff:+.1f} vs esperado")
-
-        # GERA COMBINAÇÕES (sem mostrar logs intermediários)
-        gerados = []
-
-        if numeros_ouro:
-            # Pegar os top números de ouro (ou top 20 se houver menos)
-            nums_ouro = [num for num, _, _, _ in numeros_ouro[:20]]
-            if len(nums_ouro) < 20:
-                # Completar com os mais frequentes em geral
-                mais_freq_geral = [num for num, _ in counter.most_common(20)]
-                for num in mais_freq_geral:
-                    if num not in nums_ouro and len(nums_ouro) < 20:
-                        nums_ouro.append(num)
-
-            # Gera combinações com números de ouro
-            # Gera muito mais jogos para garantir que após os filtros tenhamos quantidade_jogos
-            # Multiplica por 4 para ter margem após filtros de qualidade (90%) e repetição
-            conjuntos_ouro = self.gerar_combinacao_otimizada(
-                nums_ouro, counter, quantidade=quantidade_jogos * 4
-            )
-            gerados.extend([sorted(c) for c in conjuntos_ouro])
-
-        # Gera combinações adicionais usando apenas números de alta frequência
-        # Usa top 25 números para garantir alta qualidade
-        mais_frequentes_nums = [num for num, _ in counter.most_common(25)]
-        conjuntos_mais_freq = self.gerar_combinacao_otimizada(
-            mais_frequentes_nums, counter, quantidade=quantidade_jogos * 2
-        )
-        gerados.extend([sorted(c) for c in conjuntos_mais_freq])
-
-        # Combinações usando top números (sem misturar com menos frequentes)
-        # Foca apenas em números de alta qualidade
-        top_numeros = [num for num, _ in counter.most_common(30)]
-        conjuntos_top = self.gerar_combinacao_otimizada(
-            top_numeros, counter, quantidade=quantidade_jogos * 2
-        )
-        gerados.extend([sorted(c) for c in conjuntos_top])
+                linha = f"  {num:2d}: {formatar_valor(freq, 3)} vezes ({percent:5.2f}%) | {diff:+.1f} vs esperado"
+                if p_acima is not None:
+                    linha += f" | p = {p_acima[num - 1]:.4f}"
+                print(linha)
+
+        coocorrencia = None
+        if estrategia == 'afinidade':
+            with self.metricas.etapa('coocorrencia'):
+                coocorrencia = self.carregar_coocorrencia(janela)
+            print(f"\nPares que mais saíram juntos:")
+            for a, b, contagem in coocorrencia.pares_mais_frequentes(5):
+                print(f"  {a:2d} e {b:2d}: {contagem:3d} vezes")
+            print(f"\nTrios que mais saíram juntos:")
+            for a, b, c, contagem in coocorrencia.trios_mais_frequentes(5):
+                print(f"  {a:2d}, {b:2d} e {c:2d}: {contagem:3d} vezes")
 
         # Calcular score ideal teórico (soma dos 6 números mais frequentes)
-        top_6_numeros = [num for num, _ in counter.most_common(6)]
-        score_ideal = sum(counter.get(n, 0) for n in top_6_numeros)
-        score_minimo = int(score_ideal * 0.90)  # Sempre 90% do ideal - apenas alta qualidade
+        score_ideal = estatisticas.score_ideal().item()
+        score_minimo = estatisticas.score_minimo(0.90)  # Sempre 90% do ideal - apenas alta qualidade
 
         # Filtrar jogos finais com menos repetição e calcular scores
         print("\n" + "="*70)
         print("🎯 JOGOS FINAIS RECOMENDADOS")
         print("="*70)
-        print(f"(Score = soma das frequências históricas | Ideal: {score_ideal} | Mínimo: {score_minimo} (90%))\n")
-
-        possivel_jogo = []
-        jogos_com_score = []
-
-        for conj in gerados:
-            score = sum(counter.get(n, 0) for n in conj)
-            # Só aceita jogos com score >= 90% do ideal
-            if score >= score_minimo:
-                if self.check_repetitions(conj, possivel_jogo, max_repetitions=3):
-                    possivel_jogo.append(conj)
-                    jogos_com_score.append((conj, score))
-
-        # Se não temos jogos suficientes, gera mais usando apenas números de alta qualidade
-        if len(jogos_com_score) < quantidade_jogos:
-            # Usa apenas os top 30 números mais frequentes para garantir alta qualidade
-            numeros_alta_qualidade = [num for num, _ in counter.most_common(30)]
-            tentativas_extra = 0
-            max_tentativas_extra = 20
-
-            while len(jogos_com_score) < quantidade_jogos and tentativas_extra < max_tentativas_extra:
-                # Gera mais combinações usando apenas números de alta qualidade
-                conjuntos_extra = self.gerar_combinacao_otimizada(
-                    numeros_alta_qualidade, counter, quantidade=(quantidade_jogos - len(jogos_com_score)) * 3
+        print(f"(Score = soma das frequências históricas | Ideal: {formatar_valor(score_ideal)} | Mínimo: {formatar_valor(score_minimo)} (90%))\n")
+
+        with self.metricas.etapa('geracao'):
+            if formato_saida in FORMATOS_STREAMING:
+                self.escrever_jogos(
+                    estatisticas, numeros_ouro, quantidade_jogos, score_ideal, score_minimo,
+                    estrategia, max_repeticoes, processos, formato_saida, arquivo_saida, chave_jogos,
+                    coocorrencia
+                )
+            else:
+                self.mostrar_jogos(
+                    estatisticas, numeros_ouro, quantidade_jogos, score_ideal, score_minimo,
+                    estrategia, max_repeticoes, processos, chave_jogos, coocorrencia
                 )
 
-                for conj in conjuntos_extra:
-                    if len(jogos_com_score) >= quantidade_jogos:
-                        break
-                    score = sum(counter.get(n, 0) for n in conj)
-                    # Mantém o padrão de 90% do ideal
-                    if score >= score_minimo:
-                        if self.check_repetitions(conj, possivel_jogo, max_repetitions=3):
-                            possivel_jogo.append(conj)
-                            jogos_com_score.append((conj, score))
+        # Gerar gráfico de frequências (silencioso)
+        if grafico == 'depois':
+            # Renderiza em segundo plano: os jogos já foram exibidos e o processo
+            # só termina quando o gráfico estiver salvo
+            self.thread_grafico = threading.Thread(
+                target=self.gerar_grafico_silencioso, args=(estatisticas, numeros_ouro)
+            )
+            self.thread_grafico.start()
+        elif grafico == 'agora':
+            self.gerar_grafico_silencioso(estatisticas, numeros_ouro)
 
-                tentativas_extra += 1
+    def executar_backtest(self, estrategias=None, inicio=100):
+        """
+        Avalia as estratégias nos concursos passados (cada concurso só conhece
+        os sorteios anteriores a ele) e imprime a tabela de acertos.
 
-        # Ordena por score (maior primeiro)
-        jogos_com_score.sort(key=lambda x: x[1], reverse=True)
+        Args:
+            estrategias: Estratégias comparadas (None = a estratégia configurada)
+            inicio: Primeiro concurso avaliado (quantidade de sorteios já conhecidos)
+        """
+        dezenas = carregar_sorteios(ARQUIVO_SORTEIOS)['dezenas']
+        backtest = Backtest(
+            self, dezenas,
+            estrategias=estrategias or (self.estrategia,),
+            quantidade_jogos=self.quantidade_jogos,
+            max_repeticoes=self.max_repeticoes,
+            inicio=inicio,
+            janela=self.janela,
+            meia_vida=self.meia_vida,
+            processos=self.processos,
+        )
+        with self.metricas.etapa('backtest'):
+            resultado = backtest.executar()
+        self.metricas.incrementar('backtest_concursos_total', resultado['concursos'])
 
-        # Mostra até a quantidade desejada
-        jogos_para_mostrar = min(len(jogos_com_score), quantidade_jogos)
+        print("\n" + "="*70)
+        print("📈 BACKTEST")
+        print("="*70)
+        print(f"Concursos avaliados: {resultado['concursos']} (a partir do sorteio {backtest.inicio + 1}) | "
+              f"{self.quantidade_jogos} jogos por concurso")
+        print(f"Tempo: {resultado['segundos']:.2f}s | {resultado['concursos_por_segundo']:.1f} concursos/s\n")
+
+        print(f"{'Estratégia':<12} {'Jogos':>8} " + " ".join(f"{nome:>12}" for _, nome in PREMIOS))
+        for estrategia, dados in resultado['estrategias'].items():
+            colunas = " ".join(f"{dados['acertos'][acertos]:>12}" for acertos, _ in PREMIOS)
+            print(f"{estrategia:<12} {dados['jogos']:>8} {colunas}")
+
+        # Referência: acertos esperados para jogos escolhidos ao acaso
+        jogos = max(dados['jogos'] for dados in resultado['estrategias'].values()) if resultado['estrategias'] else 0
+        colunas = " ".join(f"{jogos * probabilidade_acertos(acertos):>12.2f}" for acertos, _ in PREMIOS)
+        print(f"{'ao acaso':<12} {jogos:>8} {colunas}")
+        return resultado
+
+    def executar_desdobramento(self, tamanho, garantia=4, tentativas=8, iteracoes=20000):
+        """
+        Desdobramento dos `tamanho` números mais frequentes: o menor conjunto de
+        jogos encontrado que garante `garantia` acertos em algum jogo sempre que
+        `garantia` das dezenas sorteadas estiverem no grupo.
 
-        if jogos_com_score:
-            for i, (conjunto, score) in enumerate(jogos_com_score[:jogos_para_mostrar], 1):
-                percentual_ideal = (score / score_ideal * 100) if score_ideal > 0 else 0
-                print(f"Jogo {i:2d}: {sorted(conjunto)} | Score: {score} ({percentual_ideal:.1f}% do ideal)")
+        Args:
+            tamanho: Quantidade de números do grupo (7 a 30)
+            garantia: Acertos garantidos (4 = quadra, 5 = quina)
+            tentativas: Execuções independentes (guloso + busca local); vence a menor
+            iteracoes: Trocas da busca local em cada tentativa
+        """
+        versao = versao_dados(ARQUIVO_SORTEIOS) if self.cache is not None else None
+        estatisticas = self.carregar_estatisticas(versao, self.janela, self.meia_vida)
+        if estatisticas is None:
+            print("Nenhum sorteio disponível para montar o desdobramento.")
+            return None
+
+        # Os números de ouro são os primeiros da ordem de frequência, então o
+        # grupo começa por eles e é completado com os mais frequentes
+        grupo = estatisticas.mais_comuns(tamanho)
+        desdobramento = Desdobramento(
+            grupo, garantia=garantia, tentativas=tentativas, iteracoes=iteracoes,
+            processos=self.processos, semente=self.semente
+        )
+        with self.metricas.etapa('desdobramento'):
+            resultado = desdobramento.executar()
+        jogos = resultado['jogos']
+        self.metricas.incrementar('desdobramento_jogos_total', len(jogos))
 
-            if len(jogos_com_score) < quantidade_jogos:
-                print(f"\n⚠️  Apenas {len(jogos_com_score)} jogos com score >= 90% foram gerados")
-                print(f"   (requisito: score >= {score_minimo}). Tente reduzir a quantidade solicitada.")
+        print("\n" + "="*70)
+        print("🎯 DESDOBRAMENTO")
+        print("="*70)
+        print(f"Grupo ({len(grupo)} números mais frequentes): {sorted(grupo)}")
+        print(f"Garantia: {dict(PREMIOS)[garantia].lower()} em pelo menos um jogo se {garantia} das 6 dezenas "
+              f"sorteadas estiverem no grupo"
+              f"{' (verificada)' if resultado['garantia_verificada'] else ' (NÃO verificada)'}")
+        print(f"Jogos: {len(jogos)} (limite inferior de Schönheim: {resultado['limite_inferior']} | "
+              f"todas as combinações: {comb(len(grupo), 6)})")
+        print(f"Tentativas: {resultado['tamanhos']} em {resultado['segundos']:.2f}s | "
+              f"semente {resultado['semente']}\n")
+
+        score_ideal = estatisticas.score_ideal().item()
+        scores = estatisticas.scores(jogos).tolist() if jogos else []
+        if self.formato_saida in FORMATOS_STREAMING:
+            with EscritorJogos(self.formato_saida, self.arquivo_saida) as escritor:
+                for jogo, score in zip(jogos, scores):
+                    escritor.escrever(jogo, score, score_ideal)
+            print(f"{escritor.total} jogos escritos em formato {self.formato_saida}.")
         else:
-            print(f"Nenhum jogo gerado com score >= {score_minimo} (90% do ideal) após filtragem.")
+            for i, (jogo, score) in enumerate(zip(jogos, scores), 1):
+                print(f"Jogo {i:4d}: {jogo} | Score: {formatar_valor(score)}")
+        return resultado
 
-
-        # Gerar gráfico de frequências (silencioso)
+    def gerar_grafico_silencioso(self, estatisticas, numeros_ouro):
         try:
-            self.gerar_grafico_frequencias(counter, total_sorteios, freq_esperada, numeros_ouro)
+            with self.metricas.etapa('grafico'):
+                self.gerar_grafico_frequencias(estatisticas, numeros_ouro)
+                if self.graficos_janelas:
+                    self.gerar_graficos_janelas(self.graficos_janelas)
         except Exception:
             pass  # Falha silenciosamente
 
-    def __init__(self, force_get_data=False, quantidade_jogos=10):
+    def __init__(self, force_get_data=False, quantidade_jogos=10, atualizacao_completa=False,
+                 url_api=None, concorrencia=8, requisicoes_por_segundo=10.0, timeout=30.0,
+                 engine='threads', manter_json=False, estrategia='exaustiva', max_repeticoes=3,
+                 processos=1, formato_saida='relatorio', arquivo_saida=None, grafico='agora',
+                 usar_cache=True, janela=None, meia_vida=None, monte_carlo=0, semente=None, dpi_grafico=300,
+                 formato_grafico='png', graficos_janelas=None, executar=True):
         """
         Inicializa o gerador de números da Mega Sena.
 
         Args:
-            force_get_data: Se True, força o download dos dados da API
+            force_get_data: Se True, sincroniza os dados com a API (apenas os concursos faltantes)
             quantidade_jogos: Quantidade de jogos a serem gerados (padrão: 10)
+            atualizacao_completa: Se True, baixa novamente todo o histórico em vez de
+                sincronizar apenas os concursos faltantes
+            url_api: URL base da API de resultados (None usa a API da Caixa)
+            concorrencia: Número máximo de requisições simultâneas à API
+            requisicoes_por_segundo: Taxa máxima de requisições à API (0 desativa o limite)
+            timeout: Timeout de leitura de cada requisição, em segundos
+            engine: Motor de download do histórico: 'threads' ou 'async'
+            manter_json: Se True, também arquiva as respostas completas da API em output.json
+            estrategia: Estratégia de geração dos jogos: 'exaustiva', 'heuristica' ou 'afinidade'
+            max_repeticoes: Máximo de números em comum entre dois jogos gerados
+            processos: Quantidade de processos para gerar lotes grandes de jogos
+            formato_saida: 'relatorio', 'jsonl' ou 'csv'
+            arquivo_saida: Destino da saída jsonl/csv (caminho, arquivo aberto ou None para stdout)
+            grafico: 'agora', 'depois' (em segundo plano) ou 'nunca'
+            usar_cache: Se True, reaproveita análises e jogos já calculados para a
+                mesma versão dos dados e os mesmos parâmetros (cache em disco)
+            janela: Analisa apenas os últimos `janela` sorteios
+            meia_vida: Meia-vida (em sorteios) do decaimento exponencial das frequências
+            monte_carlo: Quantidade de simulações de Monte Carlo (0 desativa)
+            semente: Semente da simulação de Monte Carlo
+            dpi_grafico: Resolução dos gráficos (formatos rasterizados)
+            formato_grafico: Formato dos gráficos: 'png', 'svg' ou 'pdf'
+            graficos_janelas: Tamanhos de janela para gerar também um gráfico por janela
+            executar: Se True, sincroniza os dados e gera os jogos imediatamente.
+                Se False, apenas guarda a configuração (sem I/O); use executar() depois.
         """
-        if not os.path.exists('output.json') or force_get_data:
-            self.get_all_data()
+        self.force_get_data = force_get_data
+        self.quantidade_jogos = quantidade_jogos
+        self.atualizacao_completa = atualizacao_completa
+        self.url_api = url_api
+        self.concorrencia = concorrencia
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.timeout = timeout
+        self.engine = engine
+        self.manter_json = manter_json
+        self.estrategia = estrategia
+        self.max_repeticoes = max_repeticoes
+        self.processos = processos
+        self.formato_saida = formato_saida
+        self.arquivo_saida = arquivo_saida
+        self.grafico = grafico
+        self.janela = janela
+        self.meia_vida = meia_vida
+        self.monte_carlo = monte_carlo
+        self.semente = semente
+        self.dpi_grafico = dpi_grafico
+        self.formato_grafico = formato_grafico
+        self.graficos_janelas = graficos_janelas
+        self.thread_grafico = None
+        self.cache = CacheAnalise() if usar_cache else None
+        self.metricas = Metricas()
+
+        if executar:
+            self.executar()
+
+    def exportar_metricas(self, arquivo, formato='json'):
+        """
+        Grava as métricas da execução (tempos por etapa e contadores) em
+        `arquivo`, no formato 'json' ou 'prometheus'. Espera o gráfico em
+        segundo plano terminar, para que a etapa dele entre no relatório.
+        """
+        if self.thread_grafico is not None:
+            self.thread_grafico.join()
+        self.metricas.exportar(arquivo, formato)
+
+    def criar_cliente(self):
+        """
+        Cliente HTTP da API de resultados conforme a configuração.
+        """
+        # Importado só aqui: requests/urllib3 são necessários apenas para baixar dados
+        from core.cliente_http import ClienteHTTP
+
+        opcoes_url = {'url_base': self.url_api} if self.url_api else {}
+        return ClienteHTTP(
+            concorrencia=self.concorrencia,
+            requisicoes_por_segundo=self.requisicoes_por_segundo,
+            timeout=(5, self.timeout),
+            metricas=self.metricas,
+            **opcoes_url,
+        )
+
+    def sincronizar(self, forcar=False):
+        """
+        Garante que o armazenamento de sorteios exista e esteja atualizado
+        conforme a configuração (migração de output.json, sincronização com a API).
 
-        self.run_generator(quantidade_jogos=quantidade_jogos)
\ No newline at end of file
+        Args:
+            forcar: Se True, sincroniza com a API mesmo sem --force-update
+                (usado pelo modo servidor ao detectar um concurso novo)
+        """
+        force_get_data = forcar or self.force_get_data or self.atualizacao_completa
+
+        # Instalações antigas: converte o output.json existente sem baixar nada
+        if not os.path.exists(ARQUIVO_SORTEIOS) and os.path.exists('output.json') and not force_get_data:
+            salvar_sorteios(converter_respostas(self.carregar_respostas()), ARQUIVO_SORTEIOS)
+
+        if not os.path.exists(ARQUIVO_SORTEIOS) or force_get_data:
+            self.cliente = self.criar_cliente()
+            try:
+                self.get_all_data(incremental=not self.atualizacao_completa)
+            finally:
+                self.cliente.close()
+
+    def executar(self):
+        """
+        Sincroniza os dados (se necessário) e gera os jogos.
+        """
+        with self.metricas.etapa('sincronizacao'):
+            self.sincronizar()
+        self.run_generator(
+            quantidade_jogos=self.quantidade_jogos,
+            estrategia=self.estrategia,
+            max_repeticoes=self.max_repeticoes,
+            processos=self.processos,
+            formato_saida=self.formato_saida,
+            arquivo_saida=self.arquivo_saida,
+            grafico=self.grafico,
+            janela=self.janela,
+            meia_vida=self.meia_vida,
+            monte_carlo=self.monte_carlo,
+            semente=self.semente,
+        )
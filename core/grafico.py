@@ -0,0 +1,146 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+COR_OURO = '#FFD700'
+COR_OUTROS = '#4A90E2'
+ARQUIVO_GRAFICO = 'grafico_frequencias_mega_sena'
+FORMATOS_GRAFICO = ('png', 'svg', 'pdf')
+
+
+def impressao_digital(estatisticas, numeros_ouro, titulo, dpi, formato):
+    """
+    Hash de tudo o que muda a imagem: se for igual ao do último gráfico salvo,
+    não é preciso renderizar de novo.
+    """
+    sha = hashlib.sha256()
+    sha.update(np.asarray(estatisticas.frequencias, dtype=np.float64).tobytes())
+    sha.update(repr((sorted(num for num, _, _, _ in numeros_ouro), float(estatisticas.total_sorteios),
+                     titulo, dpi, formato)).encode())
+    return sha.hexdigest()
+
+
+def grafico_atualizado(arquivo, digital):
+    """
+    True se `arquivo` existe e foi gerado com a mesma impressão digital (hash
+    guardado em `arquivo`.hash). Não depende do matplotlib: deve ser chamada
+    antes de obter_modelo() para não carregá-lo sem necessidade.
+    """
+    if not os.path.exists(arquivo):
+        return False
+    try:
+        with open(arquivo + '.hash', 'r') as f:
+            return f.read().strip() == digital
+    except OSError:
+        return False
+
+
+class GraficoFrequencias():
+    """
+    Modelo reutilizável do gráfico de frequências, na API orientada a objetos
+    do Matplotlib (Figure + FigureCanvasAgg, sem o estado global do pyplot).
+
+    A figura, os eixos, as 60 barras, a linha da média, a legenda e as
+    anotações são criados uma única vez; cada gráfico só atualiza alturas,
+    cores e textos antes de salvar. As margens são fixas (sem
+    bbox_inches='tight', que exigiria renderizar duas vezes).
+    """
+
+    def __init__(self):
+        # Importado só aqui: o matplotlib é a dependência mais lenta de carregar
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.lines import Line2D
+        from matplotlib.patches import Patch
+
+        self.lock = threading.Lock()
+        self.figura = Figure(figsize=(16, 8))
+        FigureCanvasAgg(self.figura)
+        self.figura.subplots_adjust(left=0.06, right=0.985, bottom=0.09, top=0.89)
+        eixos = self.eixos = self.figura.add_subplot()
+
+        numeros = np.arange(1, 61)
+        self.barras = eixos.bar(numeros, np.zeros(60), color=COR_OUTROS, alpha=0.8, edgecolor='black', linewidth=0.5)
+        self.linha_media = eixos.axhline(y=0, color='red', linestyle='--', linewidth=2, alpha=0.7)
+
+        eixos.set_xlabel('Números (1-60)', fontsize=12, fontweight='bold')
+        eixos.set_ylabel('Frequência (Quantas vezes apareceu)', fontsize=12, fontweight='bold')
+        self.titulo = eixos.set_title('', fontsize=14, fontweight='bold', pad=20)
+        eixos.grid(axis='y', alpha=0.3, linestyle=':')
+        eixos.set_xlim(0, 61)
+        # Mostrar números ímpares para não ficar muito cheio
+        eixos.set_xticks(range(1, 61, 2))
+        for rotulo in eixos.get_xticklabels():
+            rotulo.set_rotation(45)
+            rotulo.set_horizontalalignment('right')
+
+        # Anotações dos 5 números mais frequentes (reposicionadas a cada gráfico)
+        self.anotacoes = [
+            eixos.annotate('', xy=(0, 0), xytext=(0, 0), ha='center', va='bottom', fontsize=8, fontweight='bold',
+                           bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7))
+            for _ in range(5)
+        ]
+
+        self.elemento_media = Line2D([0], [0], color='red', linestyle='--', linewidth=2)
+        self.legenda = eixos.legend(handles=[
+            Patch(facecolor=COR_OURO, edgecolor='black', label='Números de Ouro'),
+            Patch(facecolor=COR_OUTROS, edgecolor='black', label='Outros Números'),
+            self.elemento_media,
+        ], labels=['Números de Ouro', 'Outros Números', ''], loc='upper right', fontsize=10)
+
+    def atualizar(self, estatisticas, numeros_ouro, titulo=None):
+        frequencias = np.asarray(estatisticas.frequencias, dtype=np.float64)
+        freq_esperada = estatisticas.freq_esperada
+        nums_ouro = {num for num, _, _, _ in numeros_ouro}
+
+        for num, (barra, altura) in enumerate(zip(self.barras, frequencias), 1):
+            barra.set_height(altura)
+            barra.set_facecolor(COR_OURO if num in nums_ouro else COR_OUTROS)
+
+        self.linha_media.set_ydata([freq_esperada, freq_esperada])
+        self.legenda.get_texts()[2].set_text(f'Média Esperada ({freq_esperada:.1f})')
+
+        maximo = max(frequencias.max(), freq_esperada, 1)
+        for anotacao, num in zip(self.anotacoes, estatisticas.mais_comuns(5)):
+            freq = estatisticas.frequencia(num).item()
+            anotacao.set_text(f'{freq:.1f}' if isinstance(freq, float) else f'{freq}')
+            anotacao.xy = (num, freq)
+            anotacao.set_position((num, freq + maximo * 0.02))
+        # Espaço acima da barra mais alta para a anotação
+        self.eixos.set_ylim(0, maximo * 1.1)
+
+        total = estatisticas.total_sorteios
+        total = f'{total:.1f}' if isinstance(total, float) else f'{total}'
+        self.titulo.set_text(titulo or f'Frequência de Aparição dos Números na Mega Sena\n'
+                                       f'({total} sorteios analisados)')
+
+    def salvar(self, arquivo, dpi=300, formato=None):
+        self.figura.savefig(arquivo, dpi=dpi, format=formato)
+
+    def renderizar(self, estatisticas, numeros_ouro, arquivo, dpi=300, formato='png', titulo=None):
+        """
+        Atualiza o modelo e salva o gráfico em `arquivo`, guardando a
+        impressão digital em `arquivo`.hash (veja grafico_atualizado).
+        """
+        with self.lock:
+            self.atualizar(estatisticas, numeros_ouro, titulo)
+            arquivo_temporario = f"{arquivo}.{os.getpid()}.tmp"
+            self.salvar(arquivo_temporario, dpi, formato)
+            os.replace(arquivo_temporario, arquivo)
+        with open(arquivo + '.hash', 'w') as f:
+            f.write(impressao_digital(estatisticas, numeros_ouro, titulo, dpi, formato) + '\n')
+
+
+# Modelo compartilhado, criado no primeiro gráfico
+_modelo = None
+_lock_modelo = threading.Lock()
+
+
+def obter_modelo():
+    global _modelo
+    with _lock_modelo:
+        if _modelo is None:
+            _modelo = GraficoFrequencias()
+        return _modelo
@@ -0,0 +1,104 @@
+import numpy as np
+
+# Tabela de popcount por byte, usada quando o NumPy não tem np.bitwise_count (< 2.0)
+_BITS_POR_BYTE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def para_mascara(jogo):
+    """
+    Converte um jogo (números de 1 a 60) em uma máscara de 64 bits:
+    o bit n-1 fica ligado se o número n estiver no jogo.
+    """
+    mascara = 0
+    for numero in jogo:
+        mascara |= 1 << (int(numero) - 1)
+    return mascara
+
+
+def para_mascaras(jogos):
+    """
+    Converte um array (n x 6) de jogos em um array uint64 de máscaras.
+    """
+    jogos = np.asarray(jogos, dtype=np.uint64)
+    if jogos.size == 0:
+        return np.zeros(0, dtype=np.uint64)
+    bits = np.left_shift(np.uint64(1), jogos - np.uint64(1))
+    return np.bitwise_or.reduce(bits, axis=-1)
+
+
+def de_mascara(mascara):
+    """
+    Converte uma máscara de volta na lista ordenada de números.
+    """
+    mascara = int(mascara)
+    return [n + 1 for n in range(60) if mascara >> n & 1]
+
+
+def contar_bits(mascaras):
+    """
+    Popcount vetorizado de um array uint64.
+    """
+    mascaras = np.asarray(mascaras, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(mascaras)
+    bytes_ = mascaras.reshape(mascaras.shape + (1,)).view(np.uint8)
+    return _BITS_POR_BYTE[bytes_].sum(axis=-1, dtype=np.uint8)
+
+
+class ConjuntoMascaras():
+    """
+    Coleção de jogos aceitos guardados como máscaras de 64 bits.
+    A sobreposição entre um candidato e todos os jogos aceitos é calculada
+    em uma única operação vetorizada (AND + popcount).
+    """
+
+    def __init__(self, capacidade=64):
+        self.mascaras = np.zeros(capacidade, dtype=np.uint64)
+        self.tamanho = 0
+
+    def __len__(self):
+        return self.tamanho
+
+    def ativas(self):
+        return self.mascaras[:self.tamanho]
+
+    def adicionar(self, mascara):
+        if self.tamanho == len(self.mascaras):
+            # Dobra a capacidade para manter a inserção O(1) amortizada
+            self.mascaras = np.concatenate([self.mascaras, np.zeros(len(self.mascaras), dtype=np.uint64)])
+        self.mascaras[self.tamanho] = mascara
+        self.tamanho += 1
+
+    def sobreposicao_maxima(self, mascara):
+        """
+        Maior quantidade de números em comum entre `mascara` e os jogos aceitos.
+        """
+        if self.tamanho == 0:
+            return 0
+        return int(contar_bits(self.ativas() & np.uint64(mascara)).max())
+
+    def aceita(self, mascara, max_repeticoes):
+        return self.sobreposicao_maxima(mascara) <= max_repeticoes
+
+    def filtrar(self, mascaras, max_repeticoes, tamanho_bloco=4096):
+        """
+        Verifica vários candidatos de uma vez contra os jogos aceitos.
+        Retorna um array booleano: True para os candidatos com no máximo
+        `max_repeticoes` números em comum com todos os jogos aceitos.
+        Os candidatos não são comparados entre si.
+        """
+        mascaras = np.asarray(mascaras, dtype=np.uint64)
+        validos = np.ones(len(mascaras), dtype=bool)
+        aceitas = self.ativas()
+        if self.tamanho == 0 or len(mascaras) == 0:
+            return validos
+
+        # Blocos limitam a matriz candidatos x aceitos a ~tamanho_bloco^2 elementos
+        for i in range(0, len(mascaras), tamanho_bloco):
+            bloco = mascaras[i:i + tamanho_bloco, None]
+            for j in range(0, len(aceitas), tamanho_bloco):
+                if not validos[i:i + tamanho_bloco].any():
+                    break
+                comuns = contar_bits(bloco & aceitas[None, j:j + tamanho_bloco]).max(axis=1)
+                validos[i:i + tamanho_bloco] &= comuns <= max_repeticoes
+        return validos
@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Prefixo dos nomes das métricas no formato Prometheus
+PREFIXO_PROMETHEUS = 'mega_sena_'
+
+
+class Metricas():
+    """
+    Instrumentação de uma execução: cronômetros por etapa (tempo de parede e
+    de CPU) e contadores com rótulos (requisições HTTP por status, retentativas,
+    bytes, candidatos gerados e rejeitados...).
+
+    É segura entre threads (os clientes HTTP atualizam os contadores de várias
+    threads ao mesmo tempo) e pode ser exportada em JSON ou no formato texto
+    do Prometheus (node_exporter textfile).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.contadores = {}
+        self.etapas = {}
+
+    @staticmethod
+    def chave(nome, rotulos):
+        return nome, tuple(sorted((k, str(v)) for k, v in rotulos.items()))
+
+    def incrementar(self, nome, valor=1, **rotulos):
+        chave = self.chave(nome, rotulos)
+        with self.lock:
+            self.contadores[chave] = self.contadores.get(chave, 0) + valor
+
+    def mesclar(self, contadores):
+        """
+        Soma contadores de outra instância (o atributo `contadores` dela), por
+        exemplo os acumulados nos processos de um pool.
+        """
+        with self.lock:
+            for chave, valor in contadores.items():
+                self.contadores[chave] = self.contadores.get(chave, 0) + valor
+
+    def valor(self, nome, **rotulos):
+        return self.contadores.get(self.chave(nome, rotulos), 0)
+
+    @contextmanager
+    def etapa(self, nome):
+        """
+        Cronometra o bloco e acumula o tempo na etapa `nome`. O tempo de CPU é
+        o do processo inteiro (inclui as threads que trabalham na etapa).
+        """
+        inicio_parede = time.perf_counter()
+        inicio_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            parede = time.perf_counter() - inicio_parede
+            cpu = time.process_time() - inicio_cpu
+            with self.lock:
+                etapa = self.etapas.setdefault(nome, {'parede': 0.0, 'cpu': 0.0, 'chamadas': 0})
+                etapa['parede'] += parede
+                etapa['cpu'] += cpu
+                etapa['chamadas'] += 1
+
+    def para_dict(self):
+        with self.lock:
+            contadores = [
+                {'nome': nome, 'rotulos': dict(rotulos), 'valor': valor}
+                for (nome, rotulos), valor in sorted(self.contadores.items())
+            ]
+            etapas = {nome: dict(dados) for nome, dados in self.etapas.items()}
+        return {'etapas': etapas, 'contadores': contadores}
+
+    def para_prometheus(self):
+        dados = self.para_dict()
+        linhas = []
+
+        def rotulos_texto(rotulos):
+            if not rotulos:
+                return ''
+            pares = ','.join(f'{k}="{v}"' for k, v in sorted(rotulos.items()))
+            return '{' + pares + '}'
+
+        # Cada métrica é um grupo contínuo de linhas, precedido pela declaração do tipo
+        for nome, tipo, campo in (('etapa_segundos', 'gauge', 'parede'), ('etapa_cpu_segundos', 'gauge', 'cpu'),
+                                  ('etapa_chamadas_total', 'counter', 'chamadas')):
+            if not dados['etapas']:
+                break
+            linhas.append(f"# TYPE {PREFIXO_PROMETHEUS}{nome} {tipo}")
+            for etapa, valores in sorted(dados['etapas'].items()):
+                linhas.append(f'{PREFIXO_PROMETHEUS}{nome}{{etapa="{etapa}"}} {valores[campo]}')
+
+        tipos_declarados = set()
+        for contador in dados['contadores']:
+            nome = PREFIXO_PROMETHEUS + contador['nome']
+            if nome not in tipos_declarados:
+                linhas.append(f"# TYPE {nome} counter")
+                tipos_declarados.add(nome)
+            linhas.append(f"{nome}{rotulos_texto(contador['rotulos'])} {contador['valor']}")
+        return '\n'.join(linhas) + '\n'
+
+    def exportar(self, arquivo, formato='json'):
+        """
+        Grava as métricas em `arquivo` ('json' ou 'prometheus'), de forma
+        atômica para que um coletor nunca leia um arquivo pela metade.
+        """
+        if formato == 'prometheus':
+            conteudo = self.para_prometheus()
+        else:
+            conteudo = json.dumps(self.para_dict(), indent=2) + '\n'
+
+        arquivo_temporario = f"{arquivo}.{os.getpid()}.tmp"
+        with open(arquivo_temporario, 'w') as f:
+            f.write(conteudo)
+        os.replace(arquivo_temporario, arquivo)
@@ -0,0 +1,189 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Memória aproximada (bytes) de um lote de históricos simulados
+MEMORIA_LOTE = 64 << 20
+
+# Bytes por sorteio simulado: matriz indicadora (n x 60) e a sua cópia ponderada
+_BYTES_POR_SORTEIO = 60 * 8 * 2
+
+# Posições (a < b) dos 1770 pares na matriz 60 x 60 de co-ocorrências
+_PARES_A, _PARES_B = np.triu_indices(60, 1)
+
+# Folga nas comparações: somas de pesos em ordem diferente não dão o mesmo float
+_TOLERANCIA = 1e-9
+
+
+def sortear(rng, quantidade):
+    """
+    Sorteia `quantidade` jogos de 6 números distintos de 0 a 59 (array
+    quantidade x 6, sem ordem) com o algoritmo de Floyd vetorizado: 6 inteiros
+    aleatórios por jogo em vez de embaralhar os 60 números.
+    """
+    escolhidos = np.empty((quantidade, 6), dtype=np.uint8)
+    for i, j in enumerate(range(54, 60)):
+        t = rng.integers(0, j + 1, size=quantidade, dtype=np.uint8)
+        repetido = (escolhidos[:, :i] == t[:, None]).any(axis=1)
+        escolhidos[:, i] = np.where(repetido, j, t)
+    return escolhidos
+
+
+def contar_historicos(dezenas, historicos, pesos=None):
+    """
+    Contagens de números e de pares de `historicos` históricos empilhados em
+    `dezenas` (historicos * n x 6, números de 0 a 59). Cada histórico vira uma
+    matriz indicadora X (n x 60) e as contagens de pares saem de um único
+    produto de matrizes em lote (X^T X).
+    Retorna (historicos x 60, historicos x 1770 pares a < b).
+    """
+    # float32 é exato para contagens inteiras; com pesos usa float64
+    tipo = np.float32 if pesos is None else np.float64
+    indicadores = np.zeros((len(dezenas), 60), dtype=tipo)
+    indicadores[np.arange(len(dezenas))[:, None], dezenas] = 1
+    indicadores = indicadores.reshape(historicos, -1, 60)
+    ponderados = indicadores if pesos is None else indicadores * pesos[:, None]
+
+    pares = np.matmul(ponderados.transpose(0, 2, 1), indicadores)
+    return ponderados.sum(axis=1), pares[:, _PARES_A, _PARES_B]
+
+
+class SimuladorMonteCarlo():
+    """
+    Testes de significância por simulação de Monte Carlo.
+
+    Simula históricos completos de sorteios (6 números distintos entre 60) sob
+    a hipótese de sorteio uniforme e compara com o histórico observado:
+    - qui-quadrado de uniformidade (p-value empírico, sem aproximação assintótica);
+    - extremos por número: o p-value de cada número vem do máximo (ou mínimo)
+      das 60 contagens em cada simulação, já corrigido para as 60 comparações;
+    - pares: a maior contagem de um par em cada simulação, da mesma forma.
+
+    Os históricos são simulados em lotes de tamanho limitado por memória e
+    cada lote só devolve quantas simulações passaram dos valores observados,
+    então a memória não cresce com o número de simulações. Cada lote tem a
+    sua semente (SeedSequence.spawn), e o resultado é o mesmo com qualquer
+    número de processos.
+    """
+
+    def __init__(self, dezenas, pesos=None, simulacoes=10000, processos=1, semente=None,
+                 pares_destacados=10, memoria_lote=MEMORIA_LOTE):
+        """
+        Args:
+            dezenas: Array (n x 6) com as dezenas observadas (1 a 60)
+            pesos: Peso de cada sorteio (decaimento exponencial); None = peso 1
+            simulacoes: Quantidade de históricos simulados
+            processos: Processos usados na simulação
+            semente: Semente do gerador aleatório (None = aleatória, registrada no resultado)
+            pares_destacados: Quantidade de pares mais frequentes testados
+            memoria_lote: Memória aproximada de cada lote de simulações, em bytes
+        """
+        self.dezenas = np.asarray(dezenas, dtype=np.uint8) - 1
+        self.total_sorteios = len(self.dezenas)
+        self.pesos = None if pesos is None else np.asarray(pesos, dtype=np.float64)
+        self.simulacoes = simulacoes
+        self.processos = processos
+        self.sementes = np.random.SeedSequence(semente)
+        self.tamanho_lote = max(1, memoria_lote // (_BYTES_POR_SORTEIO * max(1, self.total_sorteios)))
+
+        total = self.total_sorteios if self.pesos is None else self.pesos.sum()
+        self.freq_esperada = 6 * total / 60
+
+        numeros, pares = contar_historicos(self.dezenas, 1, self.pesos)
+        self.numeros = numeros[0]
+        self.qui_quadrado = self.estatistica_qui_quadrado(numeros)[0]
+        ordem_pares = np.argsort(-pares[0], kind='stable')[:pares_destacados]
+        self.pares = ordem_pares
+        self.contagens_pares = pares[0][ordem_pares]
+
+    def estatistica_qui_quadrado(self, numeros):
+        return ((numeros - self.freq_esperada) ** 2 / self.freq_esperada).sum(axis=1)
+
+    def lotes(self):
+        """
+        Divide as simulações em lotes: (semente do lote, quantidade de históricos).
+        """
+        quantidade = -(-self.simulacoes // self.tamanho_lote)
+        sementes = self.sementes.spawn(quantidade)
+        return [
+            (semente, min(self.tamanho_lote, self.simulacoes - i * self.tamanho_lote))
+            for i, semente in enumerate(sementes)
+        ]
+
+    def simular_lote(self, semente, historicos):
+        """
+        Simula um lote e retorna quantos históricos igualaram ou passaram os
+        valores observados: (qui-quadrado, acima por número, abaixo por número,
+        por par destacado).
+        """
+        rng = np.random.default_rng(semente)
+        dezenas = sortear(rng, historicos * self.total_sorteios)
+        numeros, pares = contar_historicos(dezenas, historicos, self.pesos)
+
+        qui_quadrado = self.estatistica_qui_quadrado(numeros)
+        maximos = numeros.max(axis=1)
+        minimos = numeros.min(axis=1)
+        maximos_pares = pares.max(axis=1)
+        return (
+            int((qui_quadrado >= self.qui_quadrado - _TOLERANCIA).sum()),
+            (maximos[:, None] >= self.numeros - _TOLERANCIA).sum(axis=0),
+            (minimos[:, None] <= self.numeros + _TOLERANCIA).sum(axis=0),
+            (maximos_pares[:, None] >= self.contagens_pares - _TOLERANCIA).sum(axis=0),
+        )
+
+    def executar(self):
+        """
+        Roda as simulações e retorna um dicionário com os p-values empíricos
+        ((1 + excedentes) / (1 + simulações)):
+            qui_quadrado, p_qui_quadrado: estatística observada e p-value
+            p_acima, p_abaixo: p-value de cada número (1 a 60) ser alto / baixo demais
+            pares: lista (a, b, contagem, p-value) dos pares mais frequentes
+        """
+        lotes = self.lotes()
+        qui_quadrado = 0
+        acima = np.zeros(60, dtype=np.int64)
+        abaixo = np.zeros(60, dtype=np.int64)
+        pares = np.zeros(len(self.pares), dtype=np.int64)
+
+        if self.processos > 1 and len(lotes) > 1:
+            with ProcessPoolExecutor(max_workers=self.processos, initializer=_iniciar_processo,
+                                     initargs=(self,)) as executor:
+                resultados = list(executor.map(_simular_lote, lotes))
+        else:
+            resultados = (self.simular_lote(semente, historicos) for semente, historicos in lotes)
+
+        for parcial_qui, parcial_acima, parcial_abaixo, parcial_pares in resultados:
+            qui_quadrado += parcial_qui
+            acima += parcial_acima
+            abaixo += parcial_abaixo
+            pares += parcial_pares
+
+        def p_value(excedentes):
+            return (1 + excedentes) / (1 + self.simulacoes)
+
+        return {
+            'simulacoes': self.simulacoes,
+            'semente': self.sementes.entropy,
+            'qui_quadrado': float(self.qui_quadrado),
+            'p_qui_quadrado': float(p_value(qui_quadrado)),
+            'p_acima': p_value(acima).tolist(),
+            'p_abaixo': p_value(abaixo).tolist(),
+            'pares': [
+                (int(_PARES_A[par]) + 1, int(_PARES_B[par]) + 1,
+                 int(contagem) if self.pesos is None else float(contagem), float(p))
+                for par, contagem, p in zip(self.pares, self.contagens_pares, p_value(pares))
+            ],
+        }
+
+
+# Simulador de cada processo do pool (preenchido por _iniciar_processo)
+_processo = {}
+
+
+def _iniciar_processo(simulador):
+    _processo['simulador'] = simulador
+
+
+def _simular_lote(argumentos):
+    semente, historicos = argumentos
+    return _processo['simulador'].simular_lote(semente, historicos)
@@ -0,0 +1,62 @@
+import csv
+import json
+import sys
+
+FORMATOS_STREAMING = ('jsonl', 'csv')
+
+
+class EscritorJogos():
+    """
+    Escreve os jogos um a um, à medida que são aceitos, em JSONL ou CSV.
+    Cada linha é enviada ao destino imediatamente (flush), para que outras
+    ferramentas possam consumir a saída de forma incremental.
+    """
+
+    def __init__(self, formato, destino=None):
+        """
+        Args:
+            formato: 'jsonl' ou 'csv'
+            destino: Caminho do arquivo, objeto de arquivo já aberto ou None/'-'
+                para a saída padrão
+        """
+        if formato not in FORMATOS_STREAMING:
+            raise ValueError(f"Formato de saída inválido: {formato}")
+
+        self.formato = formato
+        self.fechar_arquivo = isinstance(destino, str) and destino != '-'
+        if self.fechar_arquivo:
+            self.arquivo = open(destino, 'w', newline='')
+        elif destino is None or destino == '-':
+            self.arquivo = sys.stdout
+        else:
+            self.arquivo = destino
+        self.total = 0
+
+        if formato == 'csv':
+            self.csv = csv.writer(self.arquivo, lineterminator='\n')
+            self.csv.writerow(['jogo', 'n1', 'n2', 'n3', 'n4', 'n5', 'n6', 'score', 'percentual_ideal'])
+
+    def escrever(self, jogo, score, score_ideal):
+        self.total += 1
+        percentual_ideal = round(score / score_ideal * 100, 2) if score_ideal > 0 else 0
+        numeros = sorted(int(n) for n in jogo)
+        if isinstance(score, float):
+            score = round(score, 2)
+        if self.formato == 'jsonl':
+            registro = {'jogo': self.total, 'numeros': numeros, 'score': score, 'percentual_ideal': percentual_ideal}
+            self.arquivo.write(json.dumps(registro) + '\n')
+        else:
+            self.csv.writerow([self.total, *numeros, score, percentual_ideal])
+        self.arquivo.flush()
+
+    def close(self):
+        if self.fechar_arquivo:
+            self.arquivo.close()
+        else:
+            self.arquivo.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
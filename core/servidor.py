@@ -0,0 +1,348 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from core.armazenamento import ARQUIVO_SORTEIOS, carregar_sorteios
+from core.coocorrencia import IndiceCoocorrencia
+from core.estatisticas import HistoricoFrequencias
+
+ESTRATEGIAS = ('exaustiva', 'heuristica', 'afinidade')
+
+# Maior quantidade de jogos aceita por requisição
+LIMITE_JOGOS_SERVIDOR = 1000
+
+# Menor max_repeticoes aceito na estratégia exaustiva: com menos repetições
+# quase todas as combinações conflitam com os jogos aceitos e a busca
+# percorre milhões delas antes de desistir, ocupando a thread da requisição
+MIN_REPETICOES_EXAUSTIVA = 3
+
+# Resultados memorizados por versão dos dados (estatísticas e listas de jogos)
+MAX_RESULTADOS_MEMORIZADOS = 256
+
+
+class ErroParametro(ValueError):
+    """
+    Parâmetro de consulta inválido (resposta 400).
+    """
+
+
+def ler_inteiro(consulta, nome, padrao=None, minimo=1, maximo=None):
+    valores = consulta.get(nome)
+    if not valores:
+        return padrao
+    try:
+        valor = int(valores[-1])
+    except ValueError:
+        raise ErroParametro(f"'{nome}' deve ser um número inteiro")
+    if valor < minimo or (maximo is not None and valor > maximo):
+        limite = f"entre {minimo} e {maximo}" if maximo is not None else f">= {minimo}"
+        raise ErroParametro(f"'{nome}' deve estar {limite}")
+    return valor
+
+
+def ler_decimal(consulta, nome, padrao=None):
+    valores = consulta.get(nome)
+    if not valores:
+        return padrao
+    try:
+        valor = float(valores[-1])
+    except ValueError:
+        raise ErroParametro(f"'{nome}' deve ser um número")
+    if not valor > 0:
+        raise ErroParametro(f"'{nome}' deve ser maior que zero")
+    return valor
+
+
+def ler_periodo(consulta):
+    """
+    Lê os parâmetros `janela` e `meia_vida` (mutuamente exclusivos).
+    """
+    janela = ler_inteiro(consulta, 'janela')
+    meia_vida = ler_decimal(consulta, 'meia_vida')
+    if janela is not None and meia_vida is not None:
+        raise ErroParametro("use 'janela' ou 'meia_vida', não os dois")
+    return janela, meia_vida
+
+
+class EstadoServidor():
+    """
+    Dados residentes de uma versão do armazenamento: sorteios em memória,
+    contagens acumuladas (HistoricoFrequencias) e índice de co-ocorrência.
+    Não muda depois de criado; uma atualização cria um estado novo e o troca
+    de uma vez, então as requisições em andamento nunca veem dados pela metade.
+    Os resultados calculados (estatísticas, jogos) ficam memorizados no estado.
+    """
+
+    def __init__(self, sorteios, assinatura=None):
+        self.sorteios = np.array(sorteios)
+        self.dezenas = self.sorteios['dezenas']
+        self.assinatura = assinatura
+        self.total_sorteios = len(self.sorteios)
+        self.ultimo_concurso = int(self.sorteios['concurso'].max()) if self.total_sorteios else 0
+        self.historico = HistoricoFrequencias(self.dezenas)
+        self.coocorrencia = IndiceCoocorrencia(self.dezenas)
+        self.carregado_em = time.time()
+
+        self.lock = threading.Lock()
+        self.resultados = {}
+
+    def memorizar(self, chave, calcular):
+        """
+        Retorna o resultado memorizado para a chave ou o calcula (fora do lock:
+        duas requisições iguais simultâneas podem calcular em dobro, mas não se
+        bloqueiam) e o guarda.
+        """
+        with self.lock:
+            if chave in self.resultados:
+                return self.resultados[chave]
+        resultado = calcular()
+        with self.lock:
+            if len(self.resultados) >= MAX_RESULTADOS_MEMORIZADOS:
+                # Descarta o mais antigo (dicionários mantêm a ordem de inserção)
+                self.resultados.pop(next(iter(self.resultados)))
+            self.resultados[chave] = resultado
+        return resultado
+
+    def estatisticas(self, janela=None, meia_vida=None):
+        def calcular():
+            if meia_vida is not None:
+                return HistoricoFrequencias(self.dezenas, meia_vida=meia_vida).estatisticas(decaimento=True)
+            return self.historico.estatisticas(janela=janela)
+        return self.memorizar(('estatisticas', janela, meia_vida), calcular)
+
+    def coocorrencia_janela(self, janela=None):
+        """
+        Índice de co-ocorrência dos últimos `janela` sorteios (o mesmo que
+        Gerador.carregar_coocorrencia usa na linha de comando).
+        """
+        if janela is None:
+            return self.coocorrencia
+        return self.memorizar(('coocorrencia', janela), lambda: IndiceCoocorrencia(self.dezenas[-janela:]))
+
+
+class ServidorGerador():
+    """
+    Modo servidor: mantém os sorteios e as estatísticas residentes e atende
+    requisições concorrentes (uma thread por conexão) em uma API HTTP local:
+
+        GET /saude          situação e versão dos dados
+        GET /frequencias    frequências, números de ouro/comuns/ruins
+        GET /qui-quadrado   teste de uniformidade
+        GET /jogos          jogos gerados (quantidade, estrategia, max_repeticoes)
+        GET /metricas       métricas do processo no formato Prometheus
+
+    /frequencias, /qui-quadrado e /jogos aceitam `janela` ou `meia_vida`.
+    Uma thread em segundo plano verifica periodicamente se a API tem um
+    concurso novo (ou se o sorteios.npy mudou) e recarrega o estado.
+    """
+
+    def __init__(self, gerador, host='127.0.0.1', porta=8080, intervalo_atualizacao=600.0, verificar_api=True):
+        """
+        Args:
+            gerador: Gerador usado para sincronizar os dados e gerar os jogos
+            host: Endereço em que o servidor escuta
+            porta: Porta do servidor (0 escolhe uma porta livre)
+            intervalo_atualizacao: Segundos entre as verificações de concurso novo (0 desativa)
+            verificar_api: Se False, só recarrega quando o sorteios.npy mudar no disco
+        """
+        self.gerador = gerador
+        self.intervalo_atualizacao = intervalo_atualizacao
+        self.verificar_api = verificar_api
+        self.estado = None
+        self.lock_atualizacao = threading.Lock()
+        self.parar = threading.Event()
+        self.thread_atualizacao = None
+
+        self.carregar()
+        self.servidor = ThreadingHTTPServer((host, porta), self.criar_handler())
+        self.servidor.daemon_threads = True
+        self.endereco = self.servidor.server_address
+
+    @staticmethod
+    def assinatura_arquivo():
+        informacoes = os.stat(ARQUIVO_SORTEIOS)
+        return informacoes.st_mtime_ns, informacoes.st_size
+
+    def carregar(self):
+        assinatura = self.assinatura_arquivo()
+        self.estado = EstadoServidor(carregar_sorteios(ARQUIVO_SORTEIOS), assinatura)
+
+    def atualizar(self):
+        """
+        Sincroniza com a API se houver concurso novo e recarrega o estado se o
+        armazenamento mudou. Retorna True se o estado foi trocado.
+        """
+        with self.lock_atualizacao:
+            if self.verificar_api:
+                cliente = self.gerador.criar_cliente()
+                try:
+                    data = cliente.get_json('', max_retries=3)
+                finally:
+                    cliente.close()
+                if data is not None and int(data['numero']) > self.estado.ultimo_concurso:
+                    print(f"Concurso novo na API ({data['numero']}): sincronizando...")
+                    self.gerador.sincronizar(forcar=True)
+
+            if self.assinatura_arquivo() == self.estado.assinatura:
+                return False
+            self.carregar()
+            self.gerador.metricas.incrementar('servidor_recargas_total')
+            print(f"Dados recarregados: {self.estado.total_sorteios} sorteios "
+                  f"(último concurso {self.estado.ultimo_concurso}).")
+            return True
+
+    def laco_atualizacao(self):
+        while not self.parar.wait(self.intervalo_atualizacao):
+            try:
+                self.atualizar()
+            except Exception as e:
+                # Falhas de rede não derrubam o servidor: os dados atuais continuam valendo
+                print(f"Erro ao atualizar os dados: {e}")
+
+    def saude(self, consulta):
+        estado = self.estado
+        return {
+            'status': 'ok',
+            'sorteios': estado.total_sorteios,
+            'ultimo_concurso': estado.ultimo_concurso,
+            'carregado_em': estado.carregado_em,
+        }
+
+    def frequencias(self, consulta):
+        janela, meia_vida = ler_periodo(consulta)
+        estatisticas = self.estado.estatisticas(janela, meia_vida)
+
+        def numeros(lista):
+            return [num for num, _, _, _ in lista]
+
+        return {
+            'total_sorteios': estatisticas.total_sorteios,
+            'freq_esperada': estatisticas.freq_esperada,
+            # Posição 0 = número 1
+            'frequencias': estatisticas.frequencias.tolist(),
+            'numeros_ouro': numeros(estatisticas.numeros_ouro()),
+            'numeros_comuns': numeros(estatisticas.numeros_comuns()),
+            'numeros_ruins': numeros(estatisticas.numeros_ruins()),
+        }
+
+    def qui_quadrado(self, consulta):
+        janela, meia_vida = ler_periodo(consulta)
+        estatisticas = self.estado.estatisticas(janela, meia_vida)
+        chi2_stat, p_value, df, conclusao, interpretacao, freq_esperada = \
+            self.gerador.teste_uniformidade_qui_quadrado(estatisticas)
+        return {
+            'estatistica': chi2_stat,
+            'p_value': p_value,
+            'graus_liberdade': df,
+            'conclusao': conclusao,
+            'freq_esperada': freq_esperada,
+        }
+
+    def jogos(self, consulta):
+        quantidade = ler_inteiro(consulta, 'quantidade', self.gerador.quantidade_jogos, maximo=LIMITE_JOGOS_SERVIDOR)
+        max_repeticoes = ler_inteiro(consulta, 'max_repeticoes', self.gerador.max_repeticoes, minimo=0, maximo=6)
+        estrategia = consulta.get('estrategia', [self.gerador.estrategia])[-1]
+        if estrategia not in ESTRATEGIAS:
+            raise ErroParametro(f"'estrategia' deve ser uma de: {', '.join(ESTRATEGIAS)}")
+        janela, meia_vida = ler_periodo(consulta)
+        if estrategia == 'exaustiva' and max_repeticoes < MIN_REPETICOES_EXAUSTIVA:
+            raise ErroParametro(f"'max_repeticoes' deve ser >= {MIN_REPETICOES_EXAUSTIVA} na estratégia exaustiva")
+
+        estado = self.estado
+        estatisticas = estado.estatisticas(janela, meia_vida)
+        score_ideal = estatisticas.score_ideal().item()
+        score_minimo = estatisticas.score_minimo(0.90)
+
+        def gerar():
+            if estrategia == 'exaustiva':
+                return self.gerador.gerar_jogos_exaustiva(
+                    estatisticas, quantidade, score_minimo, max_repeticoes, self.gerador.processos
+                )
+            coocorrencia = estado.coocorrencia_janela(janela) if estrategia == 'afinidade' else None
+            return self.gerador.gerar_jogos_heuristica(
+                estatisticas, estatisticas.numeros_ouro(), quantidade, score_minimo, max_repeticoes,
+                coocorrencia=coocorrencia
+            )[:quantidade]
+
+        jogos = estado.memorizar(('jogos', quantidade, estrategia, max_repeticoes, janela, meia_vida), gerar)
+        return {
+            'score_ideal': score_ideal,
+            'score_minimo': score_minimo,
+            'jogos': [
+                {
+                    'numeros': sorted(int(n) for n in jogo),
+                    'score': score,
+                    'percentual_ideal': round(score / score_ideal * 100, 2) if score_ideal > 0 else 0,
+                }
+                for jogo, score in jogos
+            ],
+        }
+
+    def criar_handler(self):
+        servidor = self
+        rotas = {
+            '/saude': self.saude,
+            '/frequencias': self.frequencias,
+            '/qui-quadrado': self.qui_quadrado,
+            '/jogos': self.jogos,
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def responder(self, status, corpo, tipo='application/json'):
+                if not isinstance(corpo, bytes):
+                    corpo = json.dumps(corpo, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', f'{tipo}; charset=utf-8')
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                rota = url.path.rstrip('/') or '/'
+                if rota == '/metricas':
+                    status, corpo, tipo = 200, servidor.gerador.metricas.para_prometheus().encode(), 'text/plain'
+                elif rota in rotas:
+                    tipo = 'application/json'
+                    try:
+                        status, corpo = 200, rotas[rota](parse_qs(url.query))
+                    except ErroParametro as e:
+                        status, corpo = 400, {'erro': str(e)}
+                    except Exception as e:
+                        status, corpo = 500, {'erro': f"{e.__class__.__name__}: {e}"}
+                else:
+                    status, corpo, tipo = 404, {'erro': f"rota desconhecida: {url.path}"}, 'application/json'
+                    # Rótulo fixo: caminhos arbitrários (varreduras) não criam novos contadores
+                    rota = 'desconhecida'
+
+                servidor.gerador.metricas.incrementar('servidor_requisicoes_total', rota=rota, status=status)
+                self.responder(status, corpo, tipo)
+
+        return Handler
+
+    def servir(self):
+        """
+        Atende requisições até encerrar() (ou Ctrl+C).
+        """
+        if self.intervalo_atualizacao > 0:
+            self.thread_atualizacao = threading.Thread(target=self.laco_atualizacao, daemon=True)
+            self.thread_atualizacao.start()
+        try:
+            self.servidor.serve_forever()
+        finally:
+            self.parar.set()
+            self.servidor.server_close()
+
+    def encerrar(self):
+        self.parar.set()
+        self.servidor.shutdown()
@@ -12,6 +12,22 @@ Este programa apenas oferece estratégias baseadas em padrões observados.
 import argparse
 import sys
 from core.gerador import Gerador
+from core.grafico import FORMATOS_GRAFICO
+
+
+def inteiro_positivo(texto):
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"deve ser um inteiro >= 1 (recebeu {texto})")
+    return valor
+
+
+def decimal_positivo(texto):
+    valor = float(texto)
+    if not valor > 0:
+        raise argparse.ArgumentTypeError(f"deve ser maior que zero (recebeu {texto})")
+    return valor
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -20,7 +36,46 @@ if __name__ == "__main__":
     parser.add_argument(
         "--force-update",
         action="store_true",
-        help="Força a atualização dos dados dos sorteios (baixa novamente da API)"
+        help="Força a atualização dos dados dos sorteios (baixa apenas os concursos faltantes)"
+    )
+    parser.add_argument(
+        "--atualizacao-completa",
+        action="store_true",
+        help="Baixa novamente todo o histórico de sorteios da API, ignorando os dados salvos"
+    )
+    parser.add_argument(
+        "--url-api",
+        default=None,
+        help="URL base da API de resultados (padrão: API da Caixa; útil para testes com um servidor local)"
+    )
+    parser.add_argument(
+        "--concorrencia",
+        type=int,
+        default=8,
+        help="Número máximo de requisições simultâneas à API (padrão: 8)"
+    )
+    parser.add_argument(
+        "--requisicoes-por-segundo",
+        type=float,
+        default=10.0,
+        help="Taxa máxima de requisições à API; 0 desativa o limite (padrão: 10)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="Timeout de leitura de cada requisição, em segundos (padrão: 30)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "async"],
+        default="threads",
+        help="Motor de download do histórico: pool de threads ou asyncio (padrão: threads)"
+    )
+    parser.add_argument(
+        "--manter-json",
+        action="store_true",
+        help="Arquiva também as respostas completas da API em output.json"
     )
     parser.add_argument(
         "--quantidade-jogos",
@@ -29,22 +84,241 @@ if __name__ == "__main__":
         help="Quantidade de jogos a serem gerados (padrão: 10)"
     )
 
+    parser.add_argument(
+        "--estrategia",
+        choices=["exaustiva", "heuristica", "afinidade"],
+        default="exaustiva",
+        help="Estratégia de geração: melhores jogos entre todas as combinações (exaustiva) "
+             "combinações heurísticas a partir dos números mais frequentes (heuristica) ou "
+             "combinações dos pares que mais saíram juntos (afinidade) (padrão: exaustiva)"
+    )
+    parser.add_argument(
+        "--max-repeticoes",
+        type=int,
+        default=3,
+        help="Máximo de números em comum entre dois jogos gerados (padrão: 3). "
+             "Para lotes com dezenas de milhares de jogos use 4"
+    )
+    parser.add_argument(
+        "--processos",
+        type=int,
+        default=1,
+        help="Processos usados para gerar os jogos em lote (padrão: 1)"
+    )
+    parser.add_argument(
+        "--formato-saida",
+        choices=["relatorio", "jsonl", "csv"],
+        default="relatorio",
+        help="Formato dos jogos: relatório legível ao final ou JSONL/CSV escrito "
+             "à medida que cada jogo é aceito (padrão: relatorio)"
+    )
+    parser.add_argument(
+        "--arquivo-saida",
+        default="-",
+        help="Arquivo para a saída JSONL/CSV; '-' usa a saída padrão (padrão: -)"
+    )
+    parser.add_argument(
+        "--grafico",
+        choices=["agora", "depois", "nunca"],
+        default="agora",
+        help="Gráfico de frequências: gerar ao final, gerar em segundo plano "
+             "após exibir os jogos, ou não gerar (padrão: agora)"
+    )
+    parser.add_argument(
+        "--sem-cache",
+        action="store_true",
+        help="Ignora o cache de análises e recalcula tudo"
+    )
+    periodo = parser.add_mutually_exclusive_group()
+    periodo.add_argument(
+        "--janela",
+        type=inteiro_positivo,
+        default=None,
+        help="Analisa apenas os últimos N sorteios (padrão: histórico inteiro)"
+    )
+    periodo.add_argument(
+        "--meia-vida",
+        type=decimal_positivo,
+        default=None,
+        help="Pondera os sorteios por decaimento exponencial com meia-vida de N sorteios"
+    )
+    parser.add_argument(
+        "--monte-carlo",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Calcula p-values empíricos com N históricos simulados (padrão: 0, desativado)"
+    )
+    parser.add_argument(
+        "--semente",
+        type=int,
+        default=None,
+        help="Semente da simulação de Monte Carlo, para resultados reproduzíveis"
+    )
+    parser.add_argument(
+        "--backtest",
+        nargs="*",
+        choices=["exaustiva", "heuristica", "afinidade"],
+        default=None,
+        metavar="ESTRATEGIA",
+        help="Avalia as estratégias nos concursos passados em vez de gerar jogos "
+             "(sem nomes: avalia a estratégia de --estrategia)"
+    )
+    parser.add_argument(
+        "--backtest-inicio",
+        type=int,
+        default=100,
+        help="Primeiro concurso avaliado no backtest, em sorteios já conhecidos (padrão: 100)"
+    )
+    parser.add_argument(
+        "--desdobramento",
+        type=int,
+        default=None,
+        metavar="K",
+        help="Gera um desdobramento dos K números mais frequentes (7 a 30) em vez dos jogos por score"
+    )
+    parser.add_argument(
+        "--garantia",
+        type=int,
+        choices=[4, 5],
+        default=4,
+        help="Acertos garantidos pelo desdobramento se essa quantidade de dezenas sorteadas "
+             "estiver no grupo: 4 (quadra) ou 5 (quina) (padrão: 4)"
+    )
+    parser.add_argument(
+        "--desdobramento-tentativas",
+        type=int,
+        default=8,
+        help="Tentativas independentes do desdobramento, divididas entre os --processos (padrão: 8)"
+    )
+    parser.add_argument(
+        "--desdobramento-iteracoes",
+        type=int,
+        default=20000,
+        help="Trocas da busca local em cada tentativa do desdobramento (padrão: 20000)"
+    )
+    parser.add_argument(
+        "--metricas",
+        default=None,
+        metavar="ARQUIVO",
+        help="Grava tempos por etapa e contadores (requisições, retentativas, candidatos) neste arquivo"
+    )
+    parser.add_argument(
+        "--formato-metricas",
+        choices=["json", "prometheus"],
+        default="json",
+        help="Formato do arquivo de métricas (padrão: json)"
+    )
+    parser.add_argument(
+        "--servidor",
+        action="store_true",
+        help="Mantém os dados em memória e atende /jogos, /frequencias, /qui-quadrado e /saude via HTTP"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Endereço do modo servidor (padrão: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--porta",
+        type=int,
+        default=8080,
+        help="Porta do modo servidor (padrão: 8080)"
+    )
+    parser.add_argument(
+        "--intervalo-atualizacao",
+        type=float,
+        default=600,
+        help="Segundos entre as verificações de concurso novo no modo servidor (0 desativa; padrão: 600)"
+    )
+    parser.add_argument(
+        "--formato-grafico",
+        choices=FORMATOS_GRAFICO,
+        default="png",
+        help="Formato do gráfico de frequências (padrão: png)"
+    )
+    parser.add_argument(
+        "--dpi-grafico",
+        type=int,
+        default=300,
+        help="Resolução do gráfico em formatos rasterizados (padrão: 300)"
+    )
+    parser.add_argument(
+        "--graficos-janelas",
+        type=inteiro_positivo,
+        nargs="+",
+        default=None,
+        metavar="N",
+        help="Gera também um gráfico para cada janela dos últimos N sorteios"
+    )
+
     args = parser.parse_args()
 
+    saida_jogos = args.arquivo_saida
+    if args.formato_saida != "relatorio" and args.arquivo_saida == "-":
+        # Os jogos ocupam a saída padrão; as mensagens do relatório vão para stderr
+        saida_jogos = sys.stdout
+        sys.stdout = sys.stderr
+
     print("="*60)
     print("GERADOR DE NÚMEROS PARA MEGA SENA")
     print("="*60)
     print("\nIniciando análise dos sorteios históricos...")
-    if args.force_update:
-        print("⚠️  Modo: Forçando atualização dos dados (pode levar alguns minutos)\n")
+    if args.atualizacao_completa:
+        print("⚠️  Modo: Baixando novamente todo o histórico (pode levar alguns minutos)\n")
+    elif args.force_update:
+        print("⚠️  Modo: Sincronizando apenas os concursos faltantes\n")
     else:
         print("(Isso pode levar alguns minutos na primeira execução)\n")
 
     try:
         gerador = Gerador(
             force_get_data=args.force_update,
-            quantidade_jogos=args.quantidade_jogos
+            quantidade_jogos=args.quantidade_jogos,
+            atualizacao_completa=args.atualizacao_completa,
+            url_api=args.url_api,
+            concorrencia=args.concorrencia,
+            requisicoes_por_segundo=args.requisicoes_por_segundo,
+            timeout=args.timeout,
+            engine=args.engine,
+            manter_json=args.manter_json,
+            estrategia=args.estrategia,
+            max_repeticoes=args.max_repeticoes,
+            processos=args.processos,
+            formato_saida=args.formato_saida,
+            arquivo_saida=saida_jogos,
+            grafico=args.grafico,
+            usar_cache=not args.sem_cache,
+            janela=args.janela,
+            meia_vida=args.meia_vida,
+            monte_carlo=args.monte_carlo,
+            semente=args.semente,
+            dpi_grafico=args.dpi_grafico,
+            formato_grafico=args.formato_grafico,
+            graficos_janelas=args.graficos_janelas,
+            executar=False
         )
+        if args.servidor:
+            # Importado só aqui: o modo servidor não é usado nas execuções comuns
+            from core.servidor import ServidorGerador
+
+            gerador.sincronizar()
+            servidor = ServidorGerador(gerador, args.host, args.porta, args.intervalo_atualizacao)
+            host, porta = servidor.endereco[:2]
+            print(f"Servidor ouvindo em http://{host}:{porta}/ (Ctrl+C para encerrar)")
+            servidor.servir()
+        elif args.desdobramento is not None:
+            gerador.sincronizar()
+            gerador.executar_desdobramento(
+                args.desdobramento, args.garantia, args.desdobramento_tentativas, args.desdobramento_iteracoes
+            )
+        elif args.backtest is not None:
+            gerador.sincronizar()
+            gerador.executar_backtest(args.backtest, args.backtest_inicio)
+        else:
+            gerador.executar()
+        if args.metricas:
+            gerador.exportar_metricas(args.metricas, args.formato_metricas)
 
         print("\n" + "="*60)
         print("Análise concluída!")
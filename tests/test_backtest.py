@@ -0,0 +1,61 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from benchmarks.benchmark import gerar_historico
+from core.backtest import Backtest
+from core.coocorrencia import IndiceCoocorrencia
+from core.gerador import Gerador
+
+
+@pytest.fixture
+def spawn():
+    """
+    Processos iniciados por spawn (padrão no Windows e no macOS): tudo o que
+    vai para o pool precisa ser serializável.
+    """
+    anterior = multiprocessing.get_start_method()
+    multiprocessing.set_start_method('spawn', force=True)
+    yield
+    multiprocessing.set_start_method(anterior, force=True)
+
+
+def executar(dezenas, processos, **opcoes):
+    gerador = Gerador(usar_cache=False, executar=False)
+    backtest = Backtest(gerador, dezenas, estrategias=('exaustiva',), quantidade_jogos=3, inicio=50,
+                        processos=processos, **opcoes)
+    return backtest.executar(), gerador.metricas
+
+
+def test_processos_por_spawn_iguais_ao_serial(spawn):
+    dezenas = gerar_historico(62)['dezenas']
+    serial, metricas_serial = executar(dezenas, processos=1)
+    paralelo, metricas_paralelo = executar(dezenas, processos=2)
+
+    assert paralelo['concursos'] == serial['concursos'] == 12
+    assert paralelo['estrategias'] == serial['estrategias']
+    # Os contadores dos processos do pool são somados às métricas do principal
+    assert metricas_paralelo.contadores == metricas_serial.contadores
+    assert metricas_serial.valor('candidatos_gerados_total', estrategia='exaustiva') > 0
+
+
+@pytest.mark.parametrize('janela', [None, 20])
+def test_afinidade_usa_a_janela_da_analise(janela):
+    dezenas = gerar_historico(80)['dezenas']
+    backtest = Backtest(Gerador(usar_cache=False, executar=False), dezenas, estrategias=('afinidade',),
+                        inicio=50, janela=janela)
+    indices = []
+
+    def gerar_jogos(estrategia, estatisticas, coocorrencia):
+        indices.append(coocorrencia.pares.copy())
+        return []
+
+    backtest.gerar_jogos = gerar_jogos
+
+    backtest.executar()
+
+    assert len(indices) == 30
+    for t, pares in zip(range(50, 80), indices):
+        inicio = 0 if janela is None else t - janela
+        np.testing.assert_array_equal(pares, IndiceCoocorrencia(dezenas[inicio:t]).pares)
@@ -0,0 +1,88 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from core.busca import BuscaExaustiva
+
+# Corte de score acima do qual só há combinações dos 15 números "fortes"
+SCORE_MINIMO = 599.5
+
+
+def frequencias_reduzidas(semente=0):
+    """
+    15 números espalhados com frequência entre 100 e 110 (com empates) e os
+    demais entre 0 e 10: qualquer combinação com um número fraco soma no
+    máximo 5 * 110 + 10 = 560, então acima do corte só sobram as C(15, 6)
+    combinações dos fortes.
+    """
+    rng = np.random.default_rng(semente)
+    frequencias = rng.integers(0, 11, 60)
+    fortes = rng.choice(60, 15, replace=False)
+    frequencias[fortes] = rng.integers(100, 111, 15)
+    return frequencias, np.sort(fortes) + 1
+
+
+def gulosa_forca_bruta(frequencias, fortes, max_repeticoes):
+    """
+    Seleção de referência: todas as combinações acima do corte em ordem de
+    score (empates pela menor combinação), aceitas se tiverem no máximo
+    `max_repeticoes` números em comum com cada jogo já aceito.
+    """
+    candidatos = sorted(
+        ((-int(frequencias[np.array(jogo) - 1].sum()), jogo) for jogo in combinations(fortes.tolist(), 6))
+    )
+    aceitos = []
+    for score, jogo in candidatos:
+        if all(len(set(jogo) & set(outro)) <= max_repeticoes for outro, _ in aceitos):
+            aceitos.append((jogo, -score))
+    return aceitos
+
+
+@pytest.mark.parametrize('processos', [1, 3])
+@pytest.mark.parametrize('max_repeticoes', [1, 2, 3])
+def test_busca_igual_a_gulosa_forca_bruta(max_repeticoes, processos):
+    frequencias, fortes = frequencias_reduzidas()
+    esperado = gulosa_forca_bruta(frequencias, fortes, max_repeticoes)
+
+    busca = BuscaExaustiva(frequencias, max_repeticoes=max_repeticoes, tamanho_faixa=200, processos=processos)
+    jogos = busca.buscar(10000, score_minimo=SCORE_MINIMO)
+
+    assert [(tuple(jogo), int(score)) for jogo, score in jogos] == esperado
+    assert not busca.interrompida
+
+
+def test_sem_repeticoes_para_quando_acabam_os_numeros():
+    frequencias = np.random.default_rng(1).integers(250, 330, 60)
+    busca = BuscaExaustiva(frequencias, max_repeticoes=0)
+
+    jogos = busca.buscar(20)
+
+    # Sem números em comum cabem no máximo 10 jogos; a busca para sem varrer
+    # as 50 milhões de combinações
+    assert len(jogos) == 10
+    assert len({n for jogo, _ in jogos for n in jogo}) == 60
+    assert busca.enumeradas < busca.limite_combinacoes
+    assert not busca.interrompida
+
+
+def test_limite_de_combinacoes_interrompe_a_busca():
+    frequencias, _ = frequencias_reduzidas(semente=2)
+    busca = BuscaExaustiva(frequencias, max_repeticoes=1, tamanho_faixa=1000, limite_combinacoes=5000)
+
+    busca.buscar(1000)
+
+    assert busca.interrompida
+
+
+@pytest.mark.parametrize('processos', [1, 3])
+def test_contagens_de_candidatos_fecham(processos):
+    frequencias = np.random.default_rng(3).integers(250, 330, 60)
+    busca = BuscaExaustiva(frequencias, max_repeticoes=2, processos=processos)
+
+    jogos = busca.buscar(3)
+
+    # Gerados = aceitos + rejeitados, mesmo parando no meio de uma faixa
+    assert len(jogos) == 3
+    assert busca.rejeitados_repeticao > 0
+    assert busca.candidatos == len(jogos) + busca.rejeitados_repeticao
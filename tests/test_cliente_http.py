@@ -0,0 +1,67 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.cliente_http import RETRY_AFTER_MAXIMO, ClienteHTTP, calcular_espera, ler_retry_after
+
+
+@pytest.fixture
+def servidor_manutencao():
+    """
+    Servidor que responde 200 com uma página HTML (manutenção) nas duas
+    primeiras requisições e depois o JSON do concurso.
+    """
+    requisicoes = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            requisicoes.append(self.path)
+            if len(requisicoes) <= 2:
+                corpo, tipo = b'<html>Em manutencao</html>', 'text/html'
+            else:
+                corpo, tipo = json.dumps({'numero': 1}).encode(), 'application/json'
+            self.send_response(200)
+            self.send_header('Content-Type', tipo)
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}/", requisicoes
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_retry_after_nao_e_limitado_pelo_teto_do_backoff():
+    assert calcular_espera(0, base=0.5, maximo=30.0, retry_after=120) == 120
+    assert calcular_espera(0, retry_after=10 * RETRY_AFTER_MAXIMO) == RETRY_AFTER_MAXIMO
+    assert ler_retry_after('120') == 120
+    assert ler_retry_after('invalido') is None
+
+
+def test_resposta_nao_json_e_repetida(servidor_manutencao):
+    url, requisicoes = servidor_manutencao
+    cliente = ClienteHTTP(url_base=url, requisicoes_por_segundo=0, backoff_base=0)
+    try:
+        assert cliente.get_json(1) == {'numero': 1}
+    finally:
+        cliente.close()
+    assert len(requisicoes) == 3
+    assert cliente.metricas.valor('http_respostas_invalidas_total') == 2
+
+
+def test_resposta_nao_json_e_repetida_no_cliente_async(servidor_manutencao):
+    pytest.importorskip('aiohttp')
+    from core.cliente_async import ClienteHTTPAsync
+
+    url, requisicoes = servidor_manutencao
+    cliente = ClienteHTTPAsync(url_base=url, requisicoes_por_segundo=0, backoff_base=0)
+    assert cliente.baixar([1]) == {1: {'numero': 1}}
+    assert len(requisicoes) == 3
+    assert cliente.metricas.valor('http_respostas_invalidas_total') == 2
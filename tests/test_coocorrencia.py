@@ -0,0 +1,64 @@
+from itertools import combinations
+
+import numpy as np
+
+from core.coocorrencia import IndiceCoocorrencia
+from core.monte_carlo import sortear
+
+
+def historico(tamanho, semente=0):
+    return np.sort(sortear(np.random.default_rng(semente), tamanho), axis=1).astype(np.uint8) + 1
+
+
+def test_adicionar_igual_a_reconstruir():
+    dezenas = historico(300)
+    incremental = IndiceCoocorrencia(dezenas[:100])
+    for sorteio in dezenas[100:]:
+        incremental.adicionar(sorteio)
+    completo = IndiceCoocorrencia(dezenas)
+
+    assert incremental.total_sorteios == completo.total_sorteios == 300
+    np.testing.assert_array_equal(incremental.pares, completo.pares)
+    np.testing.assert_array_equal(incremental.trios, completo.trios)
+    np.testing.assert_array_equal(incremental.contagens_trios, completo.contagens_trios)
+
+
+def test_adicionar_a_partir_de_indice_vazio():
+    dezenas = historico(50, semente=1)
+    incremental = IndiceCoocorrencia()
+    for sorteio in dezenas:
+        incremental.adicionar(sorteio)
+    completo = IndiceCoocorrencia(dezenas)
+
+    np.testing.assert_array_equal(incremental.pares, completo.pares)
+    np.testing.assert_array_equal(incremental.trios, completo.trios)
+    np.testing.assert_array_equal(incremental.contagens_trios, completo.contagens_trios)
+
+
+def test_contagens_iguais_a_forca_bruta():
+    dezenas = historico(200, semente=2)
+    indice = IndiceCoocorrencia(dezenas)
+    sorteios = [set(sorteio) for sorteio in dezenas.tolist()]
+
+    for a, b in [(1, 2), (7, 33), (59, 60)]:
+        assert indice.par(a, b) == indice.par(b, a) == sum(a in s and b in s for s in sorteios)
+    assert indice.par(10, 10) == sum(10 in s for s in sorteios)
+
+    for trio in list(combinations(dezenas[0].tolist(), 3))[:5] + [(1, 2, 3)]:
+        esperado = sum(set(trio) <= s for s in sorteios)
+        assert indice.trio(*trio) == indice.trio(*reversed(trio)) == esperado
+
+
+def test_janela_deslizante_igual_a_reconstruir():
+    dezenas = historico(300, semente=3)
+    janela = 40
+    indice = IndiceCoocorrencia(dezenas[:janela])
+    for t in range(janela, len(dezenas)):
+        indice.adicionar(dezenas[t])
+        indice.remover(dezenas[t - janela])
+        completo = IndiceCoocorrencia(dezenas[t + 1 - janela:t + 1])
+
+        assert indice.total_sorteios == completo.total_sorteios == janela
+        np.testing.assert_array_equal(indice.pares, completo.pares)
+        np.testing.assert_array_equal(indice.trios, completo.trios)
+        np.testing.assert_array_equal(indice.contagens_trios, completo.contagens_trios)
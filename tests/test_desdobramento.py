@@ -0,0 +1,50 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from core.desdobramento import Desdobramento, limite_schonheim
+
+NUMEROS = [3, 8, 15, 21, 27, 34, 40, 46, 52, 59]
+
+
+def cobre_forca_bruta(numeros, jogos, garantia):
+    conjuntos = [set(jogo) for jogo in jogos]
+    return all(any(set(alvo) <= jogo for jogo in conjuntos) for alvo in combinations(numeros, garantia))
+
+
+def test_limite_schonheim():
+    assert limite_schonheim(10, 4) == 19
+    assert limite_schonheim(7, 5) == 6
+    assert limite_schonheim(12, 3) == 14
+
+
+@pytest.mark.parametrize('garantia', [3, 4, 5])
+def test_resultado_cobre_todos_os_alvos(garantia):
+    desdobramento = Desdobramento(NUMEROS, garantia=garantia, tentativas=2, iteracoes=200, semente=7)
+    resultado = desdobramento.executar()
+
+    assert resultado['garantia_verificada']
+    assert cobre_forca_bruta(NUMEROS, resultado['jogos'], garantia)
+    assert len(resultado['jogos']) >= resultado['limite_inferior']
+    assert all(len(set(jogo)) == 6 and set(jogo) <= set(NUMEROS) for jogo in resultado['jogos'])
+
+
+def test_verificar_detecta_alvo_descoberto():
+    desdobramento = Desdobramento(NUMEROS, garantia=4, tentativas=1, iteracoes=200, semente=1)
+    posicoes = desdobramento.resolver(desdobramento.sementes.spawn(1)[0])
+    assert desdobramento.verificar(posicoes)
+
+    # A cobertura sai podada: sem qualquer um dos jogos algum alvo fica descoberto
+    for i in range(len(posicoes)):
+        restantes = np.delete(posicoes, i, axis=0)
+        assert not desdobramento.verificar(restantes)
+        numeros = np.array(NUMEROS)
+        assert not cobre_forca_bruta(NUMEROS, numeros[restantes].tolist(), 4)
+
+
+def test_grupo_de_sete_atinge_o_limite():
+    resultado = Desdobramento(NUMEROS[:7], garantia=5, tentativas=2, semente=3).executar()
+
+    assert len(resultado['jogos']) == resultado['limite_inferior'] == 6
+    assert resultado['garantia_verificada']
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from core.estatisticas import HistoricoFrequencias, pesos_decaimento
+from core.monte_carlo import sortear
+
+
+def historico(tamanho, semente=0):
+    return np.sort(sortear(np.random.default_rng(semente), tamanho), axis=1).astype(np.uint8) + 1
+
+
+def contar(dezenas):
+    return np.bincount(dezenas.ravel().astype(np.intp) - 1, minlength=60)
+
+
+def test_adicionar_igual_a_reconstruir():
+    dezenas = historico(500)
+    # Parte de um histórico pequeno para forçar o crescimento das acumuladas
+    incremental = HistoricoFrequencias(dezenas[:10], meia_vida=25)
+    for sorteio in dezenas[10:]:
+        incremental.adicionar(sorteio)
+    completo = HistoricoFrequencias(dezenas, meia_vida=25)
+
+    assert incremental.total_sorteios == completo.total_sorteios == 500
+    np.testing.assert_array_equal(incremental.janela(), completo.janela())
+    np.testing.assert_array_equal(incremental.janelas([1, 50, 1000]), completo.janelas([1, 50, 1000]))
+    np.testing.assert_allclose(incremental.decaidas, completo.decaidas)
+
+
+def test_janelas_iguais_a_contagem_direta():
+    dezenas = historico(300, semente=1)
+    frequencias = HistoricoFrequencias(dezenas)
+
+    np.testing.assert_array_equal(frequencias.janela(), contar(dezenas))
+    np.testing.assert_array_equal(frequencias.janela(40), contar(dezenas[-40:]))
+    np.testing.assert_array_equal(frequencias.janela(40, fim=100), contar(dezenas[60:100]))
+    np.testing.assert_array_equal(frequencias.janelas([40, 300]), [contar(dezenas[-40:]), contar(dezenas)])
+
+
+def test_decaimento_igual_a_soma_ponderada():
+    dezenas = historico(200, semente=2)
+    frequencias = HistoricoFrequencias(dezenas, meia_vida=30)
+
+    pesos = pesos_decaimento(len(dezenas), 30)
+    esperado = sum(peso * contar(sorteio) for peso, sorteio in zip(pesos, dezenas))
+    np.testing.assert_allclose(frequencias.decaidas, esperado)
+    assert pesos[-1] == 1 and pesos[-31] == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize('meia_vida', [0, -1, float('nan')])
+def test_meia_vida_invalida(meia_vida):
+    with pytest.raises(ValueError):
+        pesos_decaimento(10, meia_vida)
+    with pytest.raises(ValueError):
+        HistoricoFrequencias(historico(10), meia_vida=meia_vida)
+
+
+def test_janela_invalida():
+    frequencias = HistoricoFrequencias(historico(10))
+    with pytest.raises(ValueError):
+        frequencias.janela(0)
+    with pytest.raises(ValueError):
+        frequencias.janelas([5, -1])
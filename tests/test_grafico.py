@@ -0,0 +1,19 @@
+import numpy as np
+
+from core.estatisticas import EstatisticasFrequencia
+from core.grafico import grafico_atualizado, impressao_digital, obter_modelo
+
+
+def test_grafico_atualizado_confere_a_impressao_digital(tmp_path):
+    arquivo = str(tmp_path / 'grafico.png')
+    estatisticas = EstatisticasFrequencia(np.arange(60) + 100, 1000)
+    numeros_ouro = estatisticas.numeros_ouro()
+    digital = impressao_digital(estatisticas, numeros_ouro, None, 50, 'png')
+    assert not grafico_atualizado(arquivo, digital)
+
+    obter_modelo().renderizar(estatisticas, numeros_ouro, arquivo, dpi=50, formato='png')
+    assert grafico_atualizado(arquivo, digital)
+
+    outras = EstatisticasFrequencia(np.arange(60)[::-1] + 100, 1000)
+    assert not grafico_atualizado(arquivo, impressao_digital(outras, numeros_ouro, None, 50, 'png'))
+    assert not grafico_atualizado(arquivo, impressao_digital(estatisticas, numeros_ouro, None, 100, 'png'))
@@ -0,0 +1,48 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks.benchmark import gerar_historico
+from core.armazenamento import ARQUIVO_SORTEIOS, salvar_sorteios
+from core.gerador import Gerador
+from core.servidor import ServidorGerador
+
+
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    salvar_sorteios(gerar_historico(300), ARQUIVO_SORTEIOS)
+    servidor = ServidorGerador(Gerador(usar_cache=False, executar=False), porta=0, intervalo_atualizacao=0,
+                               verificar_api=False)
+    threading.Thread(target=servidor.servir, daemon=True).start()
+    yield servidor
+    servidor.encerrar()
+
+
+def get(servidor, caminho):
+    host, porta = servidor.endereco[:2]
+    try:
+        with urllib.request.urlopen(f"http://{host}:{porta}{caminho}", timeout=30) as resposta:
+            return resposta.status, json.load(resposta)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_rotas_desconhecidas_usam_rotulo_fixo(servidor):
+    for caminho in ('/wp-login.php', '/.env', '/admin/"x"'):
+        status, _ = get(servidor, caminho)
+        assert status == 404
+
+    metricas = servidor.gerador.metricas
+    assert metricas.valor('servidor_requisicoes_total', rota='desconhecida', status=404) == 3
+    rotas = {dict(rotulos)['rota'] for nome, rotulos in metricas.contadores if nome == 'servidor_requisicoes_total'}
+    assert rotas == {'desconhecida'}
+
+
+def test_exaustiva_exige_repeticoes_minimas(servidor):
+    status, corpo = get(servidor, '/jogos?estrategia=exaustiva&max_repeticoes=1')
+    assert status == 400
+    assert 'max_repeticoes' in corpo['erro']
@@ -0,0 +1,42 @@
+import numpy as np
+
+from benchmarks.api_local import ServidorAPILocal
+from benchmarks.benchmark import gerar_historico
+from core.armazenamento import ARQUIVO_SORTEIOS, carregar_sorteios, salvar_sorteios
+from core.gerador import Gerador
+
+
+def sincronizar(servidor, **opcoes):
+    Gerador(url_api=servidor.url, requisicoes_por_segundo=0, usar_cache=False, executar=False, **opcoes).sincronizar()
+
+
+def assert_sorteios_iguais(obtidos, esperados):
+    np.testing.assert_array_equal(obtidos['concurso'], esperados['concurso'])
+    np.testing.assert_array_equal(obtidos['data'], esperados['data'])
+    np.testing.assert_array_equal(obtidos['dezenas'], esperados['dezenas'])
+
+
+def test_sincronizacao_completa_e_incremental(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    historico = gerar_historico(120)
+
+    with ServidorAPILocal(historico[:80]) as servidor:
+        sincronizar(servidor)
+    assert_sorteios_iguais(carregar_sorteios(ARQUIVO_SORTEIOS), historico[:80])
+
+    # Concursos novos: uma requisição pelo último (120) e uma por concurso de 81 a 119
+    with ServidorAPILocal(historico) as servidor:
+        sincronizar(servidor, force_get_data=True)
+        assert servidor.requisicoes == 1 + 39
+    assert_sorteios_iguais(carregar_sorteios(ARQUIVO_SORTEIOS), historico)
+
+
+def test_sincronizacao_preenche_lacunas_e_repete_falhas(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    historico = gerar_historico(60, semente=1)
+    # Armazenamento com lacunas deixadas por uma sincronização anterior incompleta
+    salvar_sorteios(np.delete(historico, [4, 17, 18, 30]), ARQUIVO_SORTEIOS)
+
+    with ServidorAPILocal(historico, falhas_a_cada=5, falhas_por_concurso=1) as servidor:
+        sincronizar(servidor, force_get_data=True)
+    assert_sorteios_iguais(carregar_sorteios(ARQUIVO_SORTEIOS), historico)